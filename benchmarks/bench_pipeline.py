@@ -0,0 +1,49 @@
+"""
+Offline pipeline load test on synthetic weather.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--sites 20] [--years 1] [--seed 42] [--models lr xgb]
+
+Generates weather in memory, then times signal simulation (ITU engine),
+feature engineering and model evaluation. No network access is needed.
+"""
+import os
+import sys
+import time
+import argparse
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{label:<12} {time.perf_counter() - start:8.2f} s")
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--models", nargs="+", default=["lr", "xgb"])
+    args = parser.parse_args()
+
+    import pandas as pd
+    from src.synthetic_weather import synthetic_weather
+    from src.signal_simulation import simulate_itu_signal_strength
+    from src.preprocessing import preprocess
+    from src.evaluation import evaluate_models
+
+    end = (pd.Timestamp("2023-01-01") + pd.DateOffset(years=args.years) - pd.Timedelta(days=1)).date()
+    weather = timed("generate", synthetic_weather, n_sites=args.sites, start="2023-01-01", end=str(end),
+                    seed=args.seed)
+    print(f"{'rows':<12} {len(weather):8d}")
+    signal = timed("simulate", simulate_itu_signal_strength, weather)
+    timed("features", preprocess, signal.copy(), save=False)
+    results = timed("evaluate", evaluate_models, signal, args.models)
+    for model_name, (metrics, _) in results.items():
+        print(f"  {model_name:<10} RMSE {metrics['RMSE']:.3f}")
+
+if __name__ == "__main__":
+    main()
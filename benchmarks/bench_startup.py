@@ -0,0 +1,56 @@
+"""
+Measures CLI startup time.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 10] [--budget 1.0]
+
+Runs each command in a fresh interpreter and reports the median wall time.
+Exits with status 1 if any median exceeds the budget.
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+COMMANDS = [
+    ["main.py", "--help"],
+    ["main.py", "collect", "--help"],
+    ["main.py", "simulate", "--help"],
+    ["main.py", "evaluate", "--help"],
+    ["main.py", "report", "--help"],
+]
+
+def time_command(command, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *command], cwd=PROJECT_ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--budget", type=float, default=1.0, help="Maximum median startup time (s)")
+    args = parser.parse_args()
+
+    baseline = time_command(["-c", "pass"], args.runs)
+    print(f"{'python -c pass':<32} {baseline * 1000:8.1f} ms")
+
+    over_budget = False
+    for command in COMMANDS:
+        median = time_command(command, args.runs)
+        over_budget |= median > args.budget
+        print(f"{' '.join(command):<32} {median * 1000:8.1f} ms")
+
+    if over_budget:
+        print(f"Startup exceeded the {args.budget:.2f}s budget")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -1,82 +1,555 @@
 import os
 import argparse
-import pandas as pd
-from datetime import datetime, UTC
-
-from src.utils.config_loader import load_project_root
-from src.utils.utils import get_latest_historical_file
-from src.open_meteo_historical import collect_all
-from src.signal_simulation import simulate_from_csv
-from src.preprocessing import preprocess
-from src.evaluation import evaluate
-from src.reporting.plots import plot_predictions, plot_residuals, plot_feature_importance
-from src.reporting.report_writer import generate_markdown_report
-from src.models import get_model
-
-def parse_args():
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--refresh", action="store_true", help="Force refresh of historical weather data")
-    return parser.parse_args()
+from contextlib import closing
 
-def main():
-    project_root = load_project_root()
-    args = parse_args()
+# Heavy dependencies (pandas, sklearn, xgboost, matplotlib) and config.yaml
+# are only loaded inside the subcommand that needs them, so `--help` and
+# light subcommands start quickly.
 
-    # Step 1: Collect historical weather data
-    processed_dir = os.path.join(project_root, "data", "processed")
-    historical_files = [f for f in os.listdir(processed_dir) if f.startswith("weather_historical_")]
-    if args.refresh or not historical_files:
-        collect_all()
+# CLI option → setting it overrides (see src/utils/settings.py); options left
+# unset fall back to config.yaml and SIGNAL_* environment variables
+CLI_SETTINGS = {
+    "models": "models",
+    "workers": "workers",
+    "executor": "executor",
+    "seed": "seed",
+    "start": "start_date",
+    "end": "end_date",
+    "engine": "simulation_engine",
+    "chunk_size": "incremental_chunk_size",
+    "batch_size": "monitor_batch_size",
+}
 
-    historical_path = get_latest_historical_file(project_root)
+def _settings():
+    from src.utils.settings import get_settings
+    return get_settings()
 
-    # Step 2: Simulate signal from historical weather
-    df, signal_path = simulate_from_csv(historical_path)
+def _predictions_dir(settings):
+    return settings.path(settings.predictions_dir)
 
-    # Step 3: Preprocess and engineer features
-    # df = preprocess(signal_path, save=True)
+def cmd_collect(args):
+    from src.open_meteo_historical import collect_all
+    from src.utils.utils import get_latest_historical_file
 
-    # Step 4: Evaluate models
-    model_list = ["lr", "rf", "xgb", "poly", "stack"]
-    manifest_path = os.path.join(project_root, "run_log.csv")
+    if not args.refresh:
+        try:
+            get_latest_historical_file(_settings().project_root)
+            return
+        except FileNotFoundError:
+            pass
+    collect_all()
 
-    for model_name in model_list:
-        print(f"\nEvaluating model: {model_name.upper()}")
-        metrics, y_true, y_pred = evaluate(df.copy(), model_name)
+def cmd_generate(args):
+    import tempfile
+    from datetime import datetime, UTC
+    from src.archive import PayloadArchive
+    from src.synthetic_weather import write_synthetic_weather
+
+    if args.output:
+        write_synthetic_weather(args.output, n_sites=args.sites, start=args.start, end=args.end, seed=args.seed)
+        print(f"Synthetic weather saved to: {args.output}")
+        return
+
+    # Archived like collected data so simulate picks it up as the latest input
+    timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M")
+    archive = PayloadArchive.for_project()
+    try:
+        with tempfile.TemporaryDirectory(dir=archive.root) as tmpdir:
+            path = os.path.join(tmpdir, f"weather_historical_synthetic_{timestamp}.csv")
+            write_synthetic_weather(path, n_sites=args.sites, start=args.start, end=args.end, seed=args.seed)
+            archive.put_file(path, kind="historical")
+        print(f"Synthetic weather archived as: {archive.latest('historical')['path']}")
+    finally:
+        archive.close()
+
+def cmd_simulate(args):
+    from src.utils.utils import get_latest_historical_file
+    from src.signal_simulation import simulate_from_csv
+    from src.signal_history import SignalHistory
+
+    historical_path = args.input or get_latest_historical_file(_settings().project_root)
+    df, signal_path = simulate_from_csv(historical_path, engine=args.engine, n_workers=args.workers)
+
+    # A new simulation supersedes the simulated history
+    history = SignalHistory.for_project()
+    try:
+        history.ingest(df, source="simulated", replace=True)
+    finally:
+        history.close()
+    return df, signal_path
+
+def cmd_interpolate(args):
+    from datetime import datetime, UTC
+    from src.spatial_index import interpolate_weather
+    from src.utils.utils import get_latest_historical_file, read_table, write_table
+
+    settings = _settings()
+    weather = read_table(args.input or get_latest_historical_file(settings.project_root))
+    sources = read_table(args.sources) if args.sources else None
+    result = interpolate_weather(weather, read_table(args.stations), locations=sources, k=args.k, power=args.power)
+
+    timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M")
+    output_path = args.output or settings.path("data", "processed", f"weather_stations_{timestamp}.csv")
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    write_table(result, output_path)
+    print(f"Station weather saved to: {output_path}")
+    print(f"Simulate it with: python main.py simulate --input {output_path}")
+
+def cmd_signals(args):
+    from src.signal_history import SignalHistory
+
+    history = SignalHistory.for_project()
+    try:
+        if args.action == "ingest":
+            if not args.input:
+                raise SystemExit("signals ingest needs --input")
+            history.ingest_file(args.input, source=args.source, replace=args.replace)
+            return
+        if args.level == "range":
+            result = history.aggregate(args.range_start, args.range_end, locations=args.locations, quantiles=args.quantiles,
+                                       source=args.source)
+        else:
+            result = history.query(args.level, args.range_start, args.range_end, locations=args.locations,
+                                   quantiles=args.quantiles, source=args.source)
+    finally:
+        history.close()
+
+    if args.output:
+        from src.utils.utils import write_table
+        write_table(result, args.output)
+        print(f"Query result saved to: {args.output}")
+    else:
+        print(result.to_string(index=False) if not result.empty else "No signal history in that range.")
+
+def cmd_sweep(args):
+    from datetime import datetime, UTC
+    from src.utils.settings import STORAGE_FORMATS
+    from src.utils.utils import get_latest_historical_file, read_table, write_table
+    from src.signal_sweep import parameter_grid, run_sweep
+
+    settings = _settings()
+    weather = read_table(args.input or get_latest_historical_file(settings.project_root))
+    grid = parameter_grid(
+        base_dbm=args.base_dbm,
+        noise_profile=args.noise_profile,
+        missing_rate=args.missing_rate if args.missing_rate is not None else settings.missing_rate,
+        outlier_rate=args.outlier_rate if args.outlier_rate is not None else settings.outlier_rate,
+        bias_scale=args.bias_scale,
+        seed=args.seeds if args.seeds is not None else settings.seed,
+    )
+    result = run_sweep(weather, grid, by=args.by, n_workers=args.workers)
+
+    timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+    output_path = args.output or settings.path("results", "sweeps",
+                                               f"sweep_{timestamp}" + STORAGE_FORMATS[settings.storage_format])
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    write_table(result, output_path)
+    print(f"{len(grid)} parameter sets, {len(result)} rows saved to: {output_path}")
+    return result
+
+def _drift_reference_path(project_root):
+    return os.path.join(project_root, "results", "drift_reference.npz")
+
+def _open_store(project_root):
+    from src import run_store
+    return run_store.connect(run_store.default_store_path(project_root))
 
+def cmd_evaluate(args, df=None, signal_path=None, store=None):
+    from src import run_store
+    from src.utils.utils import get_latest_historical_entry, read_table
+    from src.evaluation import evaluate_models, save_evaluation
+
+    settings = _settings()
+    project_root = settings.project_root
+    if signal_path is None:
+        signal_path = args.input or settings.signal_path
+    # Incremental training streams the CSV from disk instead of loading it
+    if df is None and not args.incremental:
+        df = read_table(signal_path)
+
+    # Standalone evaluations are recorded as their own run
+    if store is None:
+        with closing(_open_store(project_root)) as conn:
+            run_id = run_store.start_run(conn)
+            with run_store.stage(conn, run_id, "evaluate"):
+                df, results = cmd_evaluate(args, df=df, signal_path=signal_path, store=(conn, run_id))
+            run_store.finish_run(conn, run_id)
+        return df, results
+
+    conn, run_id = store
+    historical = get_latest_historical_entry(project_root)
+    run_store.update_run(conn, run_id, weather_file=historical["name"],
+                         signal_file=os.path.basename(signal_path))
+
+    if args.incremental:
+        from src.incremental import evaluate_incremental
+
+        checkpoint_root = settings.path(settings.checkpoint_dir)
+        results = {name: evaluate_incremental(signal_path, name, os.path.join(checkpoint_root, name),
+                                              chunk_size=args.chunk_size)
+                   for name in args.models}
+    else:
+        from src.explain import forget_explanations
+
+        export_dir = settings.path(settings.model_dir) if args.export else None
+        explain_dir = settings.path(settings.explain_dir)
+        if not args.explain:
+            forget_explanations(explain_dir, args.models)
+        results = evaluate_models(df, args.models, n_workers=args.workers, shard_by=args.shard_by,
+                                  chunk_size=settings.scoring_chunk_size, export_dir=export_dir,
+                                  explain_dir=explain_dir if args.explain else None)
+
+    for model_name in args.models:
+        metrics = results[model_name][0]
+        print(f"\nEvaluating model: {model_name.upper()}")
         print("Performance:")
         for k, v in metrics.items():
             print(f"{k}: {v:.2f}")
+        run_store.record_model(conn, run_id, model_name, metrics)
+
+    save_evaluation(results, _predictions_dir(settings))
+    if df is not None:
+        from src.drift import build_reference
+        build_reference(df).save(_drift_reference_path(project_root))
+    return df, results
+
+def cmd_predict(args):
+    from src.preprocessing import preprocess
+    from src.tree_compiler import CompiledModel
+    from src.utils.utils import read_table, write_table
+
+    settings = _settings()
+    path = args.model
+    if not os.path.exists(path):
+        path = os.path.join(settings.path(settings.model_dir), f"{args.model}.tree")
+    if not os.path.exists(path):
+        raise SystemExit(f"No compiled model at {path}; run `evaluate --export` first")
+    model = CompiledModel.load(path)
+
+    df = preprocess(read_table(args.input), save=False, preserve_nulls=True, require_target=False)
+    feature_names = model.meta["feature_names"]
+    missing = [name for name in feature_names if name not in df.columns]
+    if len(missing) == len(feature_names):
+        raise SystemExit(f"Input has none of the model features: {feature_names}")
+    if missing:
+        # Simulator-only inputs such as rain_rate are absent from weather
+        # files; the trees route them like missing readings
+        print(f"Input lacks {missing}; scoring them as missing values")
+        df = df.assign(**{name: float("nan") for name in missing})
+    df["prediction"] = model.predict(df[feature_names])
+    if args.output:
+        write_table(df, args.output)
+        print(f"Predictions saved to: {args.output}")
+    else:
+        print(df[["location", "prediction"]].head(20).to_string(index=False))
+
+def _render_run_figures(args, project_root, df=None, results=None):
+    """
+    Renders the figures of every evaluated model as one cached batch.
+
+    Returns:
+        dict: Model → {label: (relative path, content hash)}.
+    """
+    from src.evaluation import load_evaluation
+    from src.explain import load_explanation
+    from src.reporting.render import figure_job, job_hash, render_figures
+
+    settings = _settings()
+    if results is None:
+        results = load_evaluation(_predictions_dir(settings))
+
+    # Collect every figure first and render them as one batch
+    jobs, labels = [], []
+    for model_name, (metrics, scores) in results.items():
+        # Scatter from the accumulator's random sample, residuals from its sketch
+        y_true, y_pred = scores.sample()
+        jobs.append(figure_job("predictions", model_name, y_true=y_true, y_pred=y_pred))
+        labels.append((model_name, "Predictions"))
+        counts, edges = scores.residuals.histogram(bins=30)
+        jobs.append(figure_job("residual_histogram", model_name, counts=counts, edges=edges))
+        labels.append((model_name, "Residuals"))
+
+        # Importances of the fitted model, from `evaluate --explain`
+        explanation = load_explanation(settings.path(settings.explain_dir), model_name)
+        if explanation is not None:
+            jobs.append(figure_job("importances", model_name, importances=explanation["permutation_mean"],
+                                   feature_names=explanation["features"], title="Permutation Importance",
+                                   xlabel="RMSE increase when shuffled (dB)"))
+            labels.append((model_name, "Permutation Importance"))
+            if explanation["attribution_mean_abs"] is not None:
+                jobs.append(figure_job("attributions", model_name, importances=explanation["attribution_mean_abs"],
+                                       feature_names=explanation["features"]))
+                labels.append((model_name, "Attributions"))
+
+    figures = {model_name: {} for model_name in results}
+    paths = render_figures(jobs, project_root, n_workers=args.workers)
+    for (model_name, label), job, path in zip(labels, jobs, paths):
+        figures[model_name][label] = (os.path.relpath(path, project_root), job_hash(job))
+    return figures
+
+def cmd_report(args, df=None, results=None, store=None):
+    from src import run_store
+    from src.reporting.report_writer import render_run_report, write_run_report
+
+    project_root = _settings().project_root
+
+    # Reports of past runs are regenerated from the store on demand
+    if getattr(args, "run", None) is not None:
+        with closing(_open_store(project_root)) as conn:
+            report = render_run_report(run_store.run_summary(conn, args.run), project_root)
+        if args.output:
+            with open(args.output, "w") as f:
+                f.write(report)
+            print(f"Report saved to: {args.output}")
+        else:
+            print(report)
+        return None
+
+    figures = _render_run_figures(args, project_root, df=df, results=results)
+
+    # Inside a full run the report is written once the run has finished
+    if store is not None:
+        conn, run_id = store
+        run_store.record_figures(conn, run_id, figures)
+        return figures
+
+    with closing(_open_store(project_root)) as conn:
+        run_id = run_store.latest_run_id(conn)
+        if run_id is None:
+            print("No runs recorded yet; run `python main.py evaluate` first.")
+            return figures
+        run_store.record_figures(conn, run_id, figures)
+        report_path = write_run_report(run_store.run_summary(conn, run_id), project_root)
+    print(f"Report saved to: {report_path}")
+    return figures
+
+def cmd_monitor(args):
+    import pandas as pd
+    from src.drift import DriftReference, DriftMonitor, SignalAnomalyDetector
+
+    reference = DriftReference.load(_drift_reference_path(_settings().project_root))
+    monitor = DriftMonitor(reference)
+    detector = SignalAnomalyDetector()
+    flags = []
+    for batch in pd.read_csv(args.input, chunksize=args.batch_size):
+        monitor.update(batch)
+        if "signal_dbm" in batch.columns:
+            scored = detector.update(batch)
+            flags.append(scored[scored["flag"] != ""])
+
+    status = monitor.status()
+    drifted = status[status["drift"]]
+    print(drifted.to_string(index=False) if not drifted.empty else "No drift detected.")
+    if flags:
+        flagged = pd.concat(flags)
+        print(f"\n{len(flagged)} anomalous signal readings")
+        if not flagged.empty:
+            print(flagged["flag"].value_counts().to_string())
+
+def cmd_history(args):
+    from src import run_store
+
+    project_root = _settings().project_root
+    with closing(_open_store(project_root)) as conn:
+        if args.action == "import":
+            run_store.import_csv_manifests(
+                conn,
+                run_log_path=os.path.join(project_root, "run_log.csv"),
+                report_manifest_path=os.path.join(project_root, "results", "reports", "report_manifest.csv"),
+            )
+        else:
+            print(run_store.best_metric_per_model(conn, metric=args.metric, last_n_runs=args.last,
+                                                  minimize=args.metric != "r2").to_string(index=False))
+
+def cmd_run(args):
+    from src import run_store
+    from src.reporting.report_writer import write_run_report
+
+    project_root = _settings().project_root
+    with closing(_open_store(project_root)) as conn:
+        run_id = run_store.start_run(conn)
+        store = (conn, run_id)
+        timings = {}
+        try:
+            # Step 1: Collect historical weather data
+            with run_store.stage(conn, run_id, "collect", timings):
+                cmd_collect(args)
+
+            # Step 2: Simulate signal from historical weather
+            args.input = None
+            with run_store.stage(conn, run_id, "simulate", timings):
+                df, signal_path = cmd_simulate(args)
+
+            # Step 3: Evaluate models
+            with run_store.stage(conn, run_id, "evaluate", timings):
+                df, results = cmd_evaluate(args, df=df, signal_path=signal_path, store=store)
+
+            # Step 4: Plots
+            with run_store.stage(conn, run_id, "report", timings):
+                figures = cmd_report(args, df=df, results=results, store=store)
+        except BaseException:
+            run_store.finish_run(conn, run_id, status="failed")
+            raise
+        run_store.finish_run(conn, run_id)
+
+        # One comparison report for the whole run, rendered from memory
+        summary = run_store.run_info(conn, run_id)
+    summary.update(metrics={name: metrics for name, (metrics, _) in results.items()},
+                   stages=timings, figures=figures)
+    print(f"Report saved to: {write_run_report(summary, project_root)}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Satellite signal strength pipeline")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", dest="settings",
+                        help="Override a setting from config.yaml (repeatable), e.g. --set workers=4")
+    parser.add_argument("--refresh", action="store_true", help="Force refresh of historical weather data")
+    parser.add_argument("--workers", type=int, help="Worker processes for model evaluation")
+    parser.add_argument("--executor", choices=["inline", "thread", "process", "dask"],
+                        help="Backend that runs parallel work (default: executor setting)")
+    parser.add_argument("--shard-by", choices=["location", "cluster"], help="Train one model per location or climate cluster")
+    parser.add_argument("--explain", action="store_true", help="Compute cached permutation importance and attributions")
+    parser.set_defaults(func=cmd_run, incremental=False, export=False)
+    subparsers = parser.add_subparsers(dest="command")
+
+    collect = subparsers.add_parser("collect", help="Collect historical weather data")
+    collect.add_argument("--refresh", action="store_true", help="Force refresh of historical weather data")
+    collect.set_defaults(func=cmd_collect)
+
+    generate = subparsers.add_parser("generate", help="Write synthetic weather data for offline runs")
+    generate.add_argument("--sites", type=int, default=20, help="Number of sites (default cities first)")
+    generate.add_argument("--start", help="First day (default: start_date setting)")
+    generate.add_argument("--end", help="Last day (default: end_date setting)")
+    generate.add_argument("--seed", type=int, help="Random seed (default: seed setting)")
+    generate.add_argument("--output", help="Write a plain CSV here instead of archiving it as the latest weather input")
+    generate.set_defaults(func=cmd_generate)
+
+    simulate = subparsers.add_parser("simulate", help="Simulate signal strength from weather data")
+    simulate.add_argument("--input", help="Weather CSV (defaults to the latest historical file)")
+    simulate.add_argument("--engine", choices=["legacy", "itu"], help="Simulation engine (default: simulation_engine setting)")
+    simulate.add_argument("--workers", type=int, help="Workers for the per-location legacy simulation")
+    simulate.set_defaults(func=cmd_simulate)
+
+    interpolate = subparsers.add_parser("interpolate", help="Interpolate weather to stations from the nearest sources")
+    interpolate.add_argument("--stations", required=True, help="CSV of stations: name, latitude, longitude")
+    interpolate.add_argument("--input", help="Weather CSV (defaults to the latest historical file)")
+    interpolate.add_argument("--sources", help="CSV of source coordinates (default: the built-in locations)")
+    interpolate.add_argument("--k", type=int, default=4, help="Nearest sources blended per station")
+    interpolate.add_argument("--power", type=float, default=2.0, help="Inverse-distance weighting power")
+    interpolate.add_argument("--output", help="Output file (defaults to data/processed/weather_stations_<ts>.csv)")
+    interpolate.set_defaults(func=cmd_interpolate)
+
+    sweep = subparsers.add_parser("sweep", help="Sweep simulation parameters over one cached attenuation pass")
+    sweep.add_argument("--input", help="Weather CSV (defaults to the latest historical file)")
+    sweep.add_argument("--base-dbm", type=float, nargs="+", default=[-70.0], help="Clear-sky signal levels")
+    sweep.add_argument("--noise-profile", nargs="+", default=["nominal"], choices=["quiet", "nominal", "harsh"],
+                       help="Measurement noise profiles")
+    sweep.add_argument("--missing-rate", type=float, nargs="+", help="Sensor dropout rates (default: setting)")
+    sweep.add_argument("--outlier-rate", type=float, nargs="+", help="Sensor outlier rates (default: setting)")
+    sweep.add_argument("--bias-scale", type=float, nargs="+", default=[1.0], help="Multipliers on the location biases")
+    sweep.add_argument("--seeds", type=int, nargs="+", help="Noise seeds (default: seed setting)")
+    sweep.add_argument("--by", nargs="*", default=["location"], help="Summary grouping columns (none for overall)")
+    sweep.add_argument("--workers", type=int, help="Worker processes for parameter sets")
+    sweep.add_argument("--output", help="Output table (defaults to results/sweeps/sweep_<ts>)")
+    sweep.set_defaults(func=cmd_sweep)
+
+    evaluate = subparsers.add_parser("evaluate", help="Train and evaluate models on simulated signal data")
+    evaluate.add_argument("--input", help="Simulated signal file (defaults to data/simulated/signal_latest.*)")
+    evaluate.add_argument("--models", nargs="+", help="Models to evaluate (default: models setting)")
+    evaluate.add_argument("--workers", type=int, help="Worker processes for model evaluation")
+    evaluate.add_argument("--shard-by", choices=["location", "cluster"], help="Train one model per location or climate cluster")
+    evaluate.add_argument("--incremental", action="store_true",
+                          help="Stream the CSV in chunks and train out of core (models: sgd, xgb)")
+    evaluate.add_argument("--chunk-size", type=int, help="Rows per chunk with --incremental")
+    evaluate.add_argument("--export", action="store_true",
+                          help="Also write rf, xgb and stack as compiled array models to the model_dir setting")
+    evaluate.add_argument("--explain", action="store_true",
+                          help="Compute cached permutation importance and attributions for the report")
+    evaluate.set_defaults(func=cmd_evaluate)
+
+    predict = subparsers.add_parser("predict", help="Score a file with a compiled model from `evaluate --export`")
+    predict.add_argument("--model", required=True, help="Model key (rf, xgb, stack) or path to a .tree file")
+    predict.add_argument("--input", required=True, help="Simulated signal or weather file")
+    predict.add_argument("--output", help="Write the input with a prediction column here")
+    predict.set_defaults(func=cmd_predict)
+
+    signals = subparsers.add_parser("signals", help="Ingest into or query the hour/day/month signal rollups")
+    signals.add_argument("action", choices=["query", "ingest"], help="'query' rollups or 'ingest' a signal file")
+    signals.add_argument("--input", help="Signal file to ingest (time, location, signal_dbm)")
+    signals.add_argument("--source", default="simulated", help="History to read or add to, e.g. measured")
+    signals.add_argument("--replace", action="store_true", help="Drop the source's history before ingesting")
+    signals.add_argument("--level", choices=["hour", "day", "month", "range"], default="day",
+                         help="Rollup per period, or 'range' for one row per location over the whole range")
+    # Own dests: start / end would be filled from the start_date / end_date settings
+    signals.add_argument("--start", dest="range_start", help="Range start, inclusive (default: first hour stored)")
+    signals.add_argument("--end", dest="range_end", help="Range end, exclusive (default: end of the last hour stored)")
+    signals.add_argument("--locations", nargs="+", help="Locations to include (default: all)")
+    signals.add_argument("--quantiles", type=float, nargs="*", default=[0.05, 0.5, 0.95], help="Quantiles to report")
+    signals.add_argument("--output", help="Write the result table here instead of printing it")
+    signals.set_defaults(func=cmd_signals)
+
+    report = subparsers.add_parser("report", help="Render plots and the comparison report for the last evaluation")
+    report.add_argument("--workers", type=int, help="Worker processes for figure rendering")
+    report.add_argument("--run", type=int, help="Regenerate the report of a past run from the run history")
+    report.add_argument("--output", help="Write the regenerated report to this file instead of stdout")
+    report.set_defaults(func=cmd_report)
+
+    monitor = subparsers.add_parser("monitor", help="Check new data for drift and signal anomalies")
+    monitor.add_argument("--input", required=True, help="CSV with weather and/or signal_dbm columns")
+    monitor.add_argument("--batch-size", type=int, help="Rows per monitoring batch")
+    monitor.set_defaults(func=cmd_monitor)
+
+    history = subparsers.add_parser("history", help="Query or import the run history")
+    history.add_argument("action", choices=["best", "import"], help="'best' metric per model or one-time CSV 'import'")
+    history.add_argument("--metric", default="rmse", help="Metric to rank by")
+    history.add_argument("--last", type=int, default=10, help="Number of most recent runs to consider")
+    history.set_defaults(func=cmd_history)
+
+    args = parser.parse_args(argv)
+    # Out-of-core training has its own model set; the models setting is for in-memory training
+    if getattr(args, "incremental", False):
+        from src.incremental import INCREMENTAL_MODELS
+
+        if args.models is None:
+            args.models = list(INCREMENTAL_MODELS)
+        unsupported = [name for name in args.models if name not in INCREMENTAL_MODELS]
+        if unsupported:
+            evaluate.error(f"--incremental supports {', '.join(INCREMENTAL_MODELS)}; "
+                           f"got {', '.join(unsupported)}")
+    return args
+
+def apply_settings(args):
+    """
+    Folds --set values and explicit CLI options into the process-wide
+    settings, then fills unset options from the resolved settings.
+
+    Returns:
+        Settings: Resolved settings.
+    """
+    from src.utils.settings import configure
+
+    overrides = {}
+    for item in args.settings:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"--set expects KEY=VALUE, got {item!r}")
+        overrides[key.strip().replace("-", "_")] = value.strip()
+    for option, name in CLI_SETTINGS.items():
+        if getattr(args, option, None) is not None:
+            overrides[name] = getattr(args, option)
+
+    try:
+        settings = configure(**overrides)
+    except (KeyError, ValueError) as e:
+        raise SystemExit(f"Invalid setting: {e}")
+    for option, name in CLI_SETTINGS.items():
+        setattr(args, option, getattr(settings, name))
+    args.models = list(args.models)
+    return settings
 
-        # Log run
-        log_entry = {
-            "timestamp": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S"),
-            "weather_file": os.path.basename(historical_path),
-            "signal_file": os.path.basename(signal_path),
-            "model": model_name,
-            **{k.lower(): round(v, 2) for k, v in metrics.items()}
-        }
-        df_log = pd.DataFrame([log_entry])
-        df_log.to_csv(manifest_path, mode="a" if os.path.exists(manifest_path) else "w",
-                      header=not os.path.exists(manifest_path), index=False)
-
-        # Generate plots
-        plot_paths = {
-            "Predictions": plot_predictions(y_true, y_pred, model_name, project_root),
-            "Residuals": plot_residuals(y_true, y_pred, model_name, project_root)
-        }
-
-        # Feature importance
-        if model_name in ["rf", "xgb"]:
-            model = get_model(model_name)
-            feature_names = df.drop(columns=["signal_dbm", "location", "timestamp"], errors="ignore").columns.tolist()
-            importance_path = plot_feature_importance(model, model_name, feature_names, project_root)
-            if importance_path:
-                plot_paths["Feature Importance"] = importance_path
-
-        # Generate report
-        report_path = generate_markdown_report(model_name, metrics, plot_paths, project_root)
-        print(f"Report saved to: {report_path}")
+def main(argv=None):
+    args = parse_args(argv)
+    apply_settings(args)
+    args.func(args)
 
 if __name__ == "__main__":
     main()
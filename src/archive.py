@@ -0,0 +1,219 @@
+import os
+import json
+import gzip
+import shutil
+import hashlib
+import tempfile
+from datetime import datetime, UTC
+
+from src.utils.db import connect_sqlite, write_transaction
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INDEX_FILENAME = "index.sqlite"
+
+# Bytes hashed and compressed per read when archiving files
+BLOCK_SIZE = 1 << 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS payloads (
+    hash TEXT PRIMARY KEY,
+    suffix TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    location TEXT,
+    fetched_at TEXT NOT NULL,
+    hash TEXT NOT NULL REFERENCES payloads(hash),
+    name TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_latest ON entries (kind, location, fetched_at);
+"""
+
+def _now():
+    # Microseconds keep polls within the same second ordered
+    return datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S.%f")
+
+def canonical_json(data):
+    """
+    Serializes JSON deterministically so equal payloads hash equally.
+    """
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+class PayloadArchive:
+    """
+    Content-addressed store of raw payloads.
+
+    Each unique payload is stored once, gzip-compressed, under
+    objects/<hash[:2]>/<hash><suffix>.gz where hash is the SHA-256 of the
+    uncompressed bytes. Every fetch is logged in a SQLite index as
+    (kind, location, fetched_at, hash), so "latest" lookups are an indexed
+    query rather than a directory scan.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.conn = connect_sqlite(os.path.join(root, INDEX_FILENAME))
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def for_project(cls, project_root=None):
+        """
+        Archive in the archive_dir setting, relative to ``project_root``
+        (defaults to the configured project root).
+        """
+        from src.utils.settings import get_settings
+
+        settings = get_settings()
+        return cls(os.path.join(project_root or settings.project_root, settings.archive_dir))
+
+    def object_path(self, content_hash, suffix=""):
+        return os.path.join(self.root, "objects", content_hash[:2], f"{content_hash}{suffix}.gz")
+
+    def _store(self, content_hash, suffix, size, write):
+        """
+        Writes a payload object unless it already exists, then logs it in
+        the payloads table. ``write`` fills an open gzip file.
+        """
+        row = self.conn.execute("SELECT suffix FROM payloads WHERE hash = ?", (content_hash,)).fetchone()
+        path = self.object_path(content_hash, row[0] if row else suffix)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+                    write(f)
+                os.chmod(tmp_path, 0o644)
+                os.replace(tmp_path, path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        with write_transaction(self.conn):
+            self.conn.execute(
+                "INSERT OR IGNORE INTO payloads (hash, suffix, size, stored_size, created_at) VALUES (?, ?, ?, ?, ?)",
+                (content_hash, suffix, size, os.path.getsize(path), _now()),
+            )
+        return path
+
+    def _log(self, kind, location, content_hash, name, fetched_at):
+        with write_transaction(self.conn):
+            self.conn.execute(
+                "INSERT INTO entries (kind, location, fetched_at, hash, name) VALUES (?, ?, ?, ?, ?)",
+                (kind, location, fetched_at or _now(), content_hash, name),
+            )
+
+    def put(self, data, kind, location=None, suffix="", name=None, fetched_at=None):
+        """
+        Archives a payload and logs the fetch.
+
+        Args:
+            data: Payload bytes.
+            kind: Payload family, e.g. "current" or "historical".
+            location: Location the payload belongs to (None for multi-site payloads).
+            suffix: File extension of the uncompressed payload, e.g. ".json".
+            name: Optional human-readable name kept in the index.
+            fetched_at: UTC timestamp string; defaults to now.
+
+        Returns:
+            str: SHA-256 of the payload.
+        """
+        content_hash = hashlib.sha256(data).hexdigest()
+        self._store(content_hash, suffix, len(data), lambda f: f.write(data))
+        self._log(kind, location, content_hash, name, fetched_at)
+        return content_hash
+
+    def put_json(self, data, kind, location=None, name=None, fetched_at=None):
+        return self.put(canonical_json(data), kind, location, ".json", name, fetched_at)
+
+    def put_file(self, path, kind, location=None, name=None, fetched_at=None):
+        """
+        Archives a file without reading it into memory. The suffix is taken
+        from the file name.
+
+        Returns:
+            str: SHA-256 of the file contents.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+                digest.update(block)
+                size += len(block)
+        content_hash = digest.hexdigest()
+
+        def write(out):
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, out, BLOCK_SIZE)
+
+        self._store(content_hash, os.path.splitext(path)[1], size, write)
+        self._log(kind, location, content_hash, name or os.path.basename(path), fetched_at)
+        return content_hash
+
+    def get(self, content_hash):
+        """
+        Returns:
+            bytes: Uncompressed payload.
+        """
+        row = self.conn.execute("SELECT suffix FROM payloads WHERE hash = ?", (content_hash,)).fetchone()
+        if row is None:
+            raise KeyError(f"Unknown payload: {content_hash}")
+        with gzip.open(self.object_path(content_hash, row[0]), "rb") as f:
+            return f.read()
+
+    def get_json(self, content_hash):
+        return json.loads(self.get(content_hash))
+
+    def latest(self, kind, location=None):
+        """
+        Most recent entry of a kind (and location).
+
+        Returns:
+            dict or None: Entry with kind, location, fetched_at, hash, name
+            and the object path; None if nothing was archived.
+        """
+        row = self.conn.execute(
+            "SELECT e.kind, e.location, e.fetched_at, e.hash, e.name, p.suffix FROM entries e "
+            "JOIN payloads p ON p.hash = e.hash WHERE e.kind = ? AND e.location IS ? "
+            "ORDER BY e.fetched_at DESC, e.entry_id DESC LIMIT 1",
+            (kind, location),
+        ).fetchone()
+        if row is None:
+            return None
+        entry = dict(zip(["kind", "location", "fetched_at", "hash", "name"], row[:5]))
+        entry["path"] = self.object_path(entry["hash"], row[5])
+        return entry
+
+    def stats(self):
+        """
+        Returns:
+            dict: Logged entries, unique payloads and their raw and stored bytes.
+        """
+        entries = self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        payloads, size, stored = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM payloads"
+        ).fetchone()
+        return {"entries": entries, "payloads": payloads, "bytes": size, "stored_bytes": stored}
+
+    def close(self):
+        self.conn.close()
+
+def latest_archived_entry(project_root, kind, location=None):
+    """
+    Newest archived entry (see PayloadArchive.latest), or None when the
+    archive is empty or missing (the archive is not created by a lookup).
+    """
+    from src.utils.settings import get_settings
+
+    root = os.path.join(project_root, get_settings().archive_dir)
+    if not os.path.exists(os.path.join(root, INDEX_FILENAME)):
+        return None
+    archive = PayloadArchive(root)
+    try:
+        return archive.latest(kind, location)
+    finally:
+        archive.close()
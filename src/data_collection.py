@@ -1,45 +1,45 @@
 import os
-import re
-import json
 import time
 import requests
 import pandas as pd
 from datetime import datetime
 
 from src.utils.logger import get_logger
-from src.utils.config import OPENWEATHER_API_KEY
+from src.utils.config import get_openweather_api_key
 from src.utils.constants import BASE_URL, DEFAULT_LOCATIONS
-from src.utils.config_loader import load_project_root
+from src.utils.settings import get_settings
+from src.archive import PayloadArchive
 
 logger = get_logger(__name__)
-project_root = load_project_root()
 
-def fetch_weather(location_name, lat, lon, save_dir="data/raw", retries=3, backoff=2):
+def fetch_weather(location_name, lat, lon, save_dir=None, retries=3, backoff=2):
     """
-    Fetches weather data from OpenWeatherMap API and saves raw JSON.
+    Fetches weather data from OpenWeatherMap API and archives the raw JSON.
+
+    Responses go to the content-addressed payload archive (see src.archive),
+    so a payload identical to an earlier poll costs one index row, not a file.
 
     Args:
         location_name: Name of the location.
         lat: Latitude.
         lon: Longitude.
-        save_dir: Directory to save raw JSON.
+        save_dir: Archive directory (default: archive_dir setting).
         retries: Number of retry attempts.
         backoff: Exponential backoff factor.
 
     Returns:
         dict: Parsed JSON response.
     """
-    save_dir = os.path.join(project_root, save_dir)
-    os.makedirs(save_dir, exist_ok=True)
+    settings = get_settings()
+    save_dir = settings.path(save_dir or settings.archive_dir)
 
     params = {
         "lat": lat,
         "lon": lon,
-        "appid": OPENWEATHER_API_KEY,
+        "appid": get_openweather_api_key(),
         "units": "metric"
     }
 
-    safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', location_name)
     attempt = 0
 
     while attempt < retries:
@@ -48,10 +48,11 @@ def fetch_weather(location_name, lat, lon, save_dir="data/raw", retries=3, backo
             response.raise_for_status()
             data = response.json()
 
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M")
-            raw_path = os.path.join(save_dir, f"{safe_name}_{timestamp}.json")
-            with open(raw_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            archive = PayloadArchive(save_dir)
+            try:
+                archive.put_json(data, kind="current", location=location_name)
+            finally:
+                archive.close()
 
             return data
 
@@ -106,7 +107,7 @@ def collect_all_locations():
 
     df = pd.DataFrame(records)
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M")
-    processed_dir = os.path.join(project_root, "data", "processed")
+    processed_dir = get_settings().path("data", "processed")
     os.makedirs(processed_dir, exist_ok=True)
     processed_path = os.path.join(processed_dir, f"weather_{timestamp}.csv")
     df.to_csv(processed_path, index=False)
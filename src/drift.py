@@ -0,0 +1,277 @@
+import warnings
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+from src.utils.constants import RANGE_CHECKS
+
+logger = get_logger(__name__)
+
+# Weather inputs and the target are monitored by default
+DRIFT_FEATURES = list(RANGE_CHECKS) + ["signal_dbm"]
+
+DEFAULT_BINS = 20
+
+# Conventional PSI reading: < 0.1 stable, 0.1-0.2 moderate, > 0.2 significant shift
+PSI_THRESHOLD = 0.2
+
+# Two-sample KS critical coefficient for alpha = 0.05
+KS_ALPHA_COEFFICIENT = 1.358
+
+# Floor for empty bins so PSI stays finite
+PSI_EPSILON = 1e-4
+
+# PSI is noisy on sparse histograms; below this many rows per bin only KS flags drift
+PSI_MIN_ROWS_PER_BIN = 10
+
+POOLED = "*"
+
+class DriftReference:
+    """
+    Per-location, per-feature histograms captured at training time.
+
+    Bin edges are training-set quantiles shared by all locations and the
+    outer bins are open-ended, so every histogram has at most n_bins counts
+    regardless of data size.
+    """
+
+    def __init__(self, edges, counts, locations):
+        self.edges = edges
+        self.counts = counts
+        self.locations = list(locations)
+        self._index = {location: i for i, location in enumerate(self.locations)}
+
+    def location_codes(self, locations):
+        """
+        Returns:
+            np.ndarray: Reference row per location, -1 for unseen locations.
+        """
+        return pd.Series(locations).map(self._index).fillna(-1).to_numpy(dtype=np.int64)
+
+    def save(self, path):
+        arrays = {"locations": np.array(self.locations, dtype=str)}
+        for feature in self.edges:
+            arrays[f"edges__{feature}"] = self.edges[feature]
+            arrays[f"counts__{feature}"] = self.counts[feature]
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            features = [key[len("edges__"):] for key in data.files if key.startswith("edges__")]
+            return cls(
+                {f: data[f"edges__{f}"] for f in features},
+                {f: data[f"counts__{f}"] for f in features},
+                data["locations"].tolist(),
+            )
+
+def _normalized_locations(df, group_column):
+    return df[group_column].astype(str).str.lower().to_numpy()
+
+def _histograms(values, codes, edges, n_groups):
+    # One bincount over (group, bin) pairs; NaNs and unseen groups are skipped
+    n_bins = len(edges) + 1
+    valid = ~np.isnan(values) & (codes >= 0)
+    bins = np.searchsorted(edges, values[valid], side="right")
+    flat = np.bincount(codes[valid] * n_bins + bins, minlength=n_groups * n_bins)
+    return flat.reshape(n_groups, n_bins).astype(float)
+
+def build_reference(df, features=None, n_bins=DEFAULT_BINS, group_column="location"):
+    """
+    Captures reference histograms from training data.
+
+    Args:
+        df: Training DataFrame.
+        features: Columns to monitor (defaults to DRIFT_FEATURES present in df).
+        n_bins: Number of quantile bins per feature.
+        group_column: Column identifying the site.
+
+    Returns:
+        DriftReference: Reference profile.
+    """
+    features = [f for f in (features or DRIFT_FEATURES) if f in df.columns]
+    locations = pd.unique(_normalized_locations(df, group_column))
+    reference = DriftReference({}, {}, locations)
+    codes = reference.location_codes(_normalized_locations(df, group_column))
+    for feature in features:
+        values = df[feature].to_numpy(dtype=float)
+        edges = np.unique(np.nanquantile(values, np.linspace(0, 1, n_bins + 1)[1:-1]))
+        reference.edges[feature] = edges
+        reference.counts[feature] = _histograms(values, codes, edges, len(locations))
+    return reference
+
+def psi(expected, actual):
+    """
+    Population stability index between two histograms (last axis = bins).
+    """
+    p = np.maximum(expected / np.maximum(expected.sum(axis=-1, keepdims=True), 1), PSI_EPSILON)
+    q = np.maximum(actual / np.maximum(actual.sum(axis=-1, keepdims=True), 1), PSI_EPSILON)
+    return np.sum((q - p) * np.log(q / p), axis=-1)
+
+def ks_statistic(expected, actual):
+    """
+    KS statistic evaluated at the bin edges; a lower bound on the exact
+    two-sample statistic.
+    """
+    cdf_expected = np.cumsum(expected, axis=-1) / np.maximum(expected.sum(axis=-1, keepdims=True), 1)
+    cdf_actual = np.cumsum(actual, axis=-1) / np.maximum(actual.sum(axis=-1, keepdims=True), 1)
+    return np.abs(cdf_expected - cdf_actual).max(axis=-1)
+
+class DriftMonitor:
+    """
+    Compares incoming batches with a DriftReference.
+
+    Current histograms are exponentially decayed by ``decay`` per batch so
+    they reflect recent data; memory stays at one histogram per location
+    and feature. Locations unseen at training time are compared with the
+    pooled reference.
+    """
+
+    def __init__(self, reference, decay=0.9, group_column="location"):
+        self.reference = reference
+        self.decay = decay
+        self.group_column = group_column
+        self.current = {f: np.zeros_like(c) for f, c in reference.counts.items()}
+        self.unseen = {f: np.zeros(c.shape[1]) for f, c in reference.counts.items()}
+
+    def _compare(self, feature, current, unseen):
+        expected = self.reference.counts[feature]
+        rows = []
+        stats = [(self.reference.locations, expected, current)]
+        if unseen.sum() > 0:
+            stats.append(([POOLED], expected.sum(axis=0, keepdims=True), unseen[None, :]))
+        for locations, ref, cur in stats:
+            n_ref, n_cur = ref.sum(axis=1), cur.sum(axis=1)
+            scores_psi, scores_ks = psi(ref, cur), ks_statistic(ref, cur)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                critical = KS_ALPHA_COEFFICIENT * np.sqrt((n_ref + n_cur) / (n_ref * n_cur))
+            psi_reliable = n_cur >= PSI_MIN_ROWS_PER_BIN * ref.shape[1]
+            for i, location in enumerate(locations):
+                if n_cur[i] == 0:
+                    continue
+                drift = (psi_reliable[i] and scores_psi[i] > PSI_THRESHOLD) or scores_ks[i] > critical[i]
+                rows.append({
+                    "location": location, "feature": feature, "n": n_cur[i],
+                    "psi": scores_psi[i], "ks": scores_ks[i], "drift": bool(drift),
+                })
+        return rows
+
+    def update(self, batch):
+        """
+        Folds a batch into the current histograms and compares it with the
+        reference.
+
+        Args:
+            batch: DataFrame with the location column and monitored features.
+
+        Returns:
+            pd.DataFrame: location, feature, n, psi, ks and drift flag for
+            the batch alone.
+        """
+        locations = _normalized_locations(batch, self.group_column)
+        codes = self.reference.location_codes(locations)
+        n_groups = len(self.reference.locations)
+        rows = []
+        for feature, edges in self.reference.edges.items():
+            if feature not in batch.columns:
+                continue
+            values = batch[feature].to_numpy(dtype=float)
+            counts = _histograms(values, codes, edges, n_groups)
+            unseen = _histograms(values, np.where(codes < 0, 0, -1), edges, 1)[0]
+            self.current[feature] = self.current[feature] * self.decay + counts
+            self.unseen[feature] = self.unseen[feature] * self.decay + unseen
+            rows += self._compare(feature, counts, unseen)
+
+        report = pd.DataFrame(rows, columns=["location", "feature", "n", "psi", "ks", "drift"])
+        if report["drift"].any():
+            drifted = report[report["drift"]]
+            logger.warning(f"Drift in {len(drifted)} location/feature pairs: "
+                           f"{drifted[['location', 'feature']].values.tolist()[:10]}")
+        return report
+
+    def status(self):
+        """
+        Compares the decayed recent histograms with the reference.
+
+        Returns:
+            pd.DataFrame: Same columns as update().
+        """
+        rows = []
+        for feature in self.reference.edges:
+            rows += self._compare(feature, self.current[feature], self.unseen[feature])
+        return pd.DataFrame(rows, columns=["location", "feature", "n", "psi", "ks", "drift"])
+
+class SignalAnomalyDetector:
+    """
+    Rolling robust z-score over the last ``window`` signal readings per location.
+
+    Each reading is scored against the median and MAD of the readings before
+    it. Only the trailing window per location is kept between batches.
+    Flags: "outage" (missing or at/below outage_dbm), "flatline" (the window
+    and the reading are identical, typical of a stuck sensor) and "spike"
+    (|z| above z_threshold).
+    """
+
+    def __init__(self, window=168, z_threshold=3.5, outage_dbm=-115.0, min_history=24,
+                 column="signal_dbm", group_column="location", time_column="time"):
+        self.window = window
+        self.z_threshold = z_threshold
+        self.outage_dbm = outage_dbm
+        self.min_history = min_history
+        self.column = column
+        self.group_column = group_column
+        self.time_column = time_column
+        self.buffers = {}
+
+    def _score(self, history, values):
+        # Trailing windows of `window` values ending just before each new value
+        padded = np.concatenate([np.full(self.window, np.nan), history, values])
+        windows = np.lib.stride_tricks.sliding_window_view(padded[:-1], self.window)[-len(values):]
+        # All-NaN windows (no history yet) give NaN medians
+        with np.errstate(all="ignore"), warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            median = np.nanmedian(windows, axis=1)
+            mad = np.nanmedian(np.abs(windows - median[:, None]), axis=1)
+            z = 0.6745 * (values - median) / mad
+        n_history = np.sum(~np.isnan(windows), axis=1)
+        flatline = (n_history >= self.window) & (mad == 0) & (values == median)
+        z[(n_history < self.min_history) | (mad == 0)] = np.nan
+        return z, flatline
+
+    def update(self, batch):
+        """
+        Scores a batch of readings and advances the per-location buffers.
+
+        Args:
+            batch: DataFrame with location, time and signal columns.
+
+        Returns:
+            pd.DataFrame: location, time, signal, z_score and flag (empty string
+            when the reading looks normal), in the batch's row order.
+        """
+        locations = _normalized_locations(batch, self.group_column)
+        times = batch[self.time_column].to_numpy() if self.time_column in batch.columns else np.arange(len(batch))
+        values = batch[self.column].to_numpy(dtype=float)
+        z = np.full(len(batch), np.nan)
+        flatline = np.zeros(len(batch), dtype=bool)
+
+        order = np.lexsort((times, locations))
+        sorted_locations = locations[order]
+        bounds = np.flatnonzero(np.r_[True, sorted_locations[1:] != sorted_locations[:-1], True])
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            rows = order[lo:hi]
+            location = sorted_locations[lo]
+            history = self.buffers.get(location, np.empty(0))
+            z[rows], flatline[rows] = self._score(history, values[rows])
+            self.buffers[location] = np.concatenate([history, values[rows]])[-self.window:]
+
+        flag = np.full(len(batch), "", dtype=object)
+        flag[np.abs(z) > self.z_threshold] = "spike"
+        flag[flatline] = "flatline"
+        flag[np.isnan(values) | (values <= self.outage_dbm)] = "outage"
+        result = pd.DataFrame({"location": locations, "time": times, self.column: values,
+                               "z_score": z, "flag": flag}, index=batch.index)
+        flagged = (flag != "").sum()
+        if flagged:
+            logger.warning(f"{flagged} anomalous {self.column} readings in batch of {len(batch)}")
+        return result
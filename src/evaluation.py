@@ -1,21 +1,31 @@
 # src/evaluation.py
+import os
+import json
 import pandas as pd
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import numpy as np
 from src.models import get_model
 from src.preprocessing import preprocess
+from src.executor import attach, get_executor
+from src.streaming_metrics import StreamingMetrics, score_in_chunks
+from src.utils.logger import get_logger
 
+logger = get_logger(__name__)
 
-def evaluate(df, model_name, target_column="signal_dbm"):
+# Rows scored per predict call; predictions are folded into the metrics
+# accumulator and never held for the whole test set
+SCORING_CHUNK_SIZE = 100_000
+
+def evaluate(df, model_name, target_column="signal_dbm", chunk_size=SCORING_CHUNK_SIZE, export_dir=None,
+             explain_dir=None, explain_workers=1):
     # Decide whether to preserve nulls
     preserve_nulls = model_name in ["xgb", "stack"]
 
     # Run full preprocessing pipeline
     df = preprocess(df, save=False, preserve_nulls=preserve_nulls)
 
-    # Drop non-feature columns
-    X = df.select_dtypes(include=["number"]).copy()
+    # Drop non-feature columns and the target itself
+    X = df.select_dtypes(include=["number"]).drop(columns=[target_column])
     y = df[target_column]
 
     # Train/test split
@@ -24,13 +34,127 @@ def evaluate(df, model_name, target_column="signal_dbm"):
     # Get and train model
     model = get_model(model_name)
     model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
+    if export_dir is not None:
+        export_model(model, model_name, X_train.columns, export_dir)
+
+    # Evaluate chunk by chunk
+    scores = score_in_chunks(model, X_test, y_test, chunk_size=chunk_size)
+
+    if explain_dir is not None:
+        from src.explain import explain_model
+        explain_model(model, model_name, X_test, y_test, explain_dir, n_workers=explain_workers)
+
+    return scores.result(), scores
+
+
+def export_model(model, model_name, feature_names, export_dir):
+    """
+    Writes a fitted tree model as a compiled array file (see
+    src.tree_compiler); models that cannot be compiled are skipped.
+
+    Returns:
+        str or None: Path of the written <model_name>.tree file.
+    """
+    from src.tree_compiler import COMPILABLE_MODELS, compile_model
+
+    if model_name not in COMPILABLE_MODELS:
+        logger.info(f"Not exporting {model_name}: only {COMPILABLE_MODELS} can be compiled")
+        return None
+    os.makedirs(export_dir, exist_ok=True)
+    path = os.path.join(export_dir, f"{model_name}.tree")
+    compile_model(model, feature_names).save(path)
+    logger.info(f"Exported compiled {model_name} to {path}")
+    return path
+
+def _evaluate_shared(shared, model_name, target_column, chunk_size, export_dir, explain_dir, explain_workers):
+    return evaluate(attach(shared), model_name, target_column, chunk_size, export_dir, explain_dir, explain_workers)
+
+def evaluate_models(df, model_names, target_column="signal_dbm", n_workers=1, shard_by=None,
+                    chunk_size=SCORING_CHUNK_SIZE, export_dir=None, explain_dir=None):
+    """
+    Evaluates several models on the same data, optionally in parallel.
+
+    With more than one worker the models run on the configured executor
+    (see src.executor); the frame is scattered once and every task attaches
+    to it, instead of each receiving its own pickled copy.
+
+    Args:
+        df: Simulated signal DataFrame.
+        model_names: Model keys understood by get_model.
+        target_column: Name of the target column.
+        n_workers: Workers.
+        shard_by: None for one global model, or "location" / "cluster" to
+            train sharded models (see src.sharding); workers then train the
+            shards of each model in parallel.
+        chunk_size: Rows per predict call when scoring.
+        export_dir: If given, compilable models (rf, xgb, stack) are also
+            written there as <model>.tree files; ignored with shard_by.
+        explain_dir: If given, every model is also explained on its test set
+            (see src.explain) and the results cached there; ignored with
+            shard_by. With one model at a time the permutations use the
+            workers instead.
+
+    Returns:
+        dict: Model name → (metrics, StreamingMetrics).
+    """
+    if shard_by is not None:
+        if export_dir is not None or explain_dir is not None:
+            logger.warning("Sharded models are not exported or explained")
+        from src.sharding import evaluate_sharded
+
+        results = {}
+        for name in model_names:
+            metrics, scores, per_shard = evaluate_sharded(df.copy(), name, target_column, shard_by=shard_by,
+                                                          n_workers=n_workers, chunk_size=chunk_size)
+            for shard, shard_scores in per_shard.items():
+                logger.info(f"{name} shard {shard}: RMSE {shard_scores.result()['RMSE']:.3f}")
+            results[name] = (metrics, scores)
+        return results
+
+    if n_workers <= 1 or len(model_names) <= 1:
+        return {name: evaluate(df.copy(), name, target_column, chunk_size, export_dir, explain_dir, n_workers)
+                for name in model_names}
+
+    # Models run in parallel, so each explanation runs on a single worker
+    with get_executor(min(n_workers, len(model_names))) as executor:
+        shared = executor.scatter_frame(df)
+        try:
+            results = executor.map(_evaluate_shared, [(shared, name, target_column, chunk_size, export_dir,
+                                                       explain_dir, 1) for name in model_names])
+            return dict(zip(model_names, results))
+        finally:
+            executor.release(shared)
+
+def save_evaluation(results, output_dir):
+    """
+    Persists evaluate_models results so reports can be rendered later.
+
+    Args:
+        results: Dict of model name → (metrics, StreamingMetrics).
+        output_dir: Directory for the per-model accumulator .npz files and metrics.json.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    metrics = {}
+    for model_name, (model_metrics, scores) in results.items():
+        np.savez(os.path.join(output_dir, f"{model_name}.npz"), **scores.to_state())
+        metrics[model_name] = {k: float(v) for k, v in model_metrics.items()}
+    with open(os.path.join(output_dir, "metrics.json"), "w") as f:
+        json.dump(metrics, f, indent=2)
+
+def load_evaluation(output_dir):
+    """
+    Loads results written by save_evaluation.
 
-    # Evaluate
-    metrics = {
-        "MAE": mean_absolute_error(y_test, y_pred),
-        "RMSE": np.sqrt(mean_squared_error(y_test, y_pred)),
-        "R2": r2_score(y_test, y_pred)
-    }
+    Args:
+        output_dir: Directory passed to save_evaluation.
 
-    return metrics, y_test, y_pred
+    Returns:
+        dict: Model name → (metrics, StreamingMetrics).
+    """
+    with open(os.path.join(output_dir, "metrics.json")) as f:
+        metrics = json.load(f)
+    results = {}
+    for model_name, model_metrics in metrics.items():
+        with np.load(os.path.join(output_dir, f"{model_name}.npz")) as state:
+            results[model_name] = (model_metrics, StreamingMetrics.from_state(state))
+    return results
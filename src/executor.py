@@ -0,0 +1,291 @@
+import concurrent.futures
+from abc import ABC, abstractmethod
+import pandas as pd
+
+from src.shared_data import share_arrays, attach_arrays, share_frame, attach_frame, release as release_shared
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EXECUTORS = ("inline", "thread", "process", "dask")
+
+class SharedArrays:
+    """
+    Handle to arrays written to memory-mapped files by a process executor.
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+
+class SharedFrame:
+    """
+    Handle to a DataFrame written to memory-mapped files by a process executor.
+    """
+
+    def __init__(self, handle):
+        self.handle = handle
+
+def attach(data):
+    """
+    Worker-side view of data passed through Executor.scatter or
+    Executor.scatter_frame.
+
+    Every backend gives the same contract: the result is a new dict or
+    DataFrame object whose entries or columns may be replaced freely, but
+    whose array values must not be modified in place (they may be
+    read-only memory maps or shared with other tasks).
+
+    Args:
+        data: The value returned by scatter / scatter_frame, as received by the task.
+
+    Returns:
+        dict or pd.DataFrame: The arrays or frame.
+    """
+    if isinstance(data, SharedArrays):
+        return attach_arrays(data.handle)
+    if isinstance(data, SharedFrame):
+        return attach_frame(data.handle)
+    if isinstance(data, pd.DataFrame):
+        return data.copy(deep=False)
+    if isinstance(data, dict):
+        return dict(data)
+    return data
+
+class Executor(ABC):
+    """
+    Runs independent tasks on a backend and moves their inputs to where they run.
+
+    Tasks are plain module-level functions, so they can be pickled for
+    process and cluster backends. Large inputs are scattered once and
+    passed to every task as a handle that the task resolves with attach().
+    """
+
+    name = None
+
+    def __init__(self, n_workers=1):
+        self.n_workers = max(1, n_workers)
+
+    @abstractmethod
+    def submit(self, fn, *args):
+        """
+        Returns:
+            Future: Object with a blocking result() method.
+        """
+
+    def map(self, fn, tasks):
+        """
+        Runs fn(*task) for every task and yields the results in task order,
+        each as soon as it and all earlier tasks are done.
+
+        Args:
+            fn: Picklable function.
+            tasks: Iterable of argument tuples.
+        """
+        futures = [self.submit(fn, *task) for task in tasks]
+        for future in futures:
+            yield future.result()
+
+    def as_completed(self, fn, tasks):
+        """
+        Like map, but yields (task index, result) in completion order.
+        """
+        futures = {self.submit(fn, *task): i for i, task in enumerate(tasks)}
+        for future in concurrent.futures.as_completed(futures):
+            yield futures[future], future.result()
+
+    def scatter(self, arrays):
+        """
+        Places a dict of arrays where tasks can read it without a copy per task.
+
+        Returns:
+            Handle to pass to tasks; resolve it there with attach().
+        """
+        return arrays
+
+    def scatter_frame(self, df):
+        """
+        DataFrame counterpart of scatter.
+        """
+        return df
+
+    def release(self, data):
+        """
+        Frees data placed by scatter / scatter_frame.
+        """
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+class InlineExecutor(Executor):
+    """
+    Runs every task in the calling thread; map streams results lazily.
+    """
+
+    name = "inline"
+
+    def __init__(self, n_workers=1):
+        super().__init__(1)
+
+    def submit(self, fn, *args):
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def map(self, fn, tasks):
+        for task in tasks:
+            yield fn(*task)
+
+    def as_completed(self, fn, tasks):
+        for i, task in enumerate(tasks):
+            yield i, fn(*task)
+
+class _PoolExecutor(Executor):
+    pool_class = None
+
+    def __init__(self, n_workers=1):
+        super().__init__(n_workers)
+        self._pool = None
+
+    def submit(self, fn, *args):
+        # The pool is started on first use, so scatter-only use spawns nothing
+        if self._pool is None:
+            self._pool = self.pool_class(max_workers=self.n_workers)
+        return self._pool.submit(fn, *args)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+class ThreadExecutor(_PoolExecutor):
+    """
+    Thread pool; scattered data is shared by reference.
+    """
+
+    name = "thread"
+    pool_class = concurrent.futures.ThreadPoolExecutor
+
+class ProcessExecutor(_PoolExecutor):
+    """
+    Process pool; scattered data is written once to memory-mapped files
+    that every worker attaches to (see src.shared_data).
+    """
+
+    name = "process"
+    pool_class = concurrent.futures.ProcessPoolExecutor
+
+    def scatter(self, arrays):
+        return SharedArrays(share_arrays(arrays))
+
+    def scatter_frame(self, df):
+        return SharedFrame(share_frame(df))
+
+    def release(self, data):
+        if isinstance(data, (SharedArrays, SharedFrame)):
+            release_shared(data.handle)
+
+class DaskExecutor(Executor):
+    """
+    Dask distributed cluster (optional dependency: dask[distributed]).
+
+    Connects to the scheduler at ``address``, or starts an in-process local
+    cluster with ``n_workers`` worker threads when no address is given.
+    Scattered data is sent to the cluster once and stays on the workers;
+    tasks that receive it are scheduled next to it.
+    """
+
+    name = "dask"
+
+    def __init__(self, n_workers=1, address=None, client=None):
+        try:
+            from dask.distributed import Client, LocalCluster
+        except ImportError as e:
+            raise ImportError("The dask executor needs dask[distributed]: pip install 'dask[distributed]'") from e
+
+        self._cluster = None
+        self._owns_client = client is None
+        if client is None:
+            if address:
+                client = Client(address)
+            else:
+                self._cluster = LocalCluster(n_workers=max(1, n_workers), threads_per_worker=1, processes=False,
+                                             dashboard_address=None)
+                client = Client(self._cluster)
+        self.client = client
+        super().__init__(len(client.scheduler_info()["workers"]) or n_workers)
+
+    def submit(self, fn, *args):
+        return self.client.submit(fn, *args, pure=False)
+
+    def as_completed(self, fn, tasks):
+        from dask.distributed import as_completed
+
+        futures = [self.submit(fn, *task) for task in tasks]
+        index = {future.key: i for i, future in enumerate(futures)}
+        for future in as_completed(futures):
+            yield index[future.key], future.result()
+
+    def _scatter(self, data):
+        # A one-element list scatters the whole object as a single future
+        return self.client.scatter([data], hash=False)[0]
+
+    def scatter(self, arrays):
+        return self._scatter(arrays)
+
+    def scatter_frame(self, df):
+        return self._scatter(df)
+
+    def release(self, data):
+        # Dropping the future alone leaves the data on the workers until the
+        # scheduler notices; cancelling forgets the key on the cluster now
+        if hasattr(data, "key"):
+            self.client.cancel([data], force=True)
+
+    def close(self):
+        if self._owns_client:
+            self.client.close()
+            if self._cluster is not None:
+                self._cluster.close()
+
+def get_executor(n_workers=None, backend=None, address=None):
+    """
+    Executor for the configured backend.
+
+    Args:
+        n_workers: Worker count (default: workers setting). Local backends
+            run inline with one worker; a dask scheduler address is used
+            regardless, since the cluster brings its own workers.
+        backend: One of EXECUTORS (default: executor setting).
+        address: Dask scheduler address (default: executor_address setting).
+
+    Returns:
+        Executor: Use as a context manager.
+    """
+    from src.utils.settings import get_settings
+
+    settings = get_settings()
+    n_workers = settings.workers if n_workers is None else n_workers
+    backend = backend or settings.executor
+    address = settings.executor_address if address is None else address
+    if backend not in EXECUTORS:
+        raise ValueError(f"Unknown executor {backend!r}; expected one of {EXECUTORS}")
+
+    if backend == "dask" and address:
+        return DaskExecutor(n_workers, address)
+    if n_workers <= 1 or backend == "inline":
+        return InlineExecutor()
+    if backend == "thread":
+        return ThreadExecutor(n_workers)
+    if backend == "process":
+        return ProcessExecutor(n_workers)
+    return DaskExecutor(n_workers)
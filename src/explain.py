@@ -0,0 +1,288 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from src.executor import attach, get_executor
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when the explanation method changes so cached results are recomputed
+EXPLAIN_VERSION = 1
+
+# Test rows scored per permutation, and permutations per feature
+MAX_SAMPLES = 5_000
+N_REPEATS = 5
+
+LATEST_FILENAME = "latest.json"
+
+def model_hash(model):
+    """
+    Content hash of a fitted model (its pickled state).
+    """
+    import joblib
+    return joblib.hash(model)
+
+def dataset_hash(X, y):
+    """
+    Content hash of a feature frame and target.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([str(c) for c in X.columns]).encode())
+    for column in X.columns:
+        digest.update(np.ascontiguousarray(X[column].to_numpy(dtype=float)).tobytes())
+    digest.update(np.ascontiguousarray(np.asarray(y, dtype=float)).tobytes())
+    return digest.hexdigest()
+
+def _rmse(model, X, y):
+    return float(np.sqrt(np.mean((y - model.predict(X)) ** 2)))
+
+def _permutation_scores(model, X, y, columns, n_repeats, seed):
+    """
+    RMSE with each of ``columns`` shuffled, ``n_repeats`` times.
+
+    Each feature's permutations are seeded by (seed, column position), so
+    results do not depend on how features are split between workers.
+
+    Returns:
+        np.ndarray: (len(columns), n_repeats) scores.
+    """
+    scores = np.empty((len(columns), n_repeats))
+    for k, column in enumerate(columns):
+        rng = np.random.default_rng([seed, X.columns.get_loc(column)])
+        original = X[column].to_numpy().copy()
+        for r in range(n_repeats):
+            X[column] = original[rng.permutation(len(X))]
+            scores[k, r] = _rmse(model, X, y)
+        X[column] = original
+    return scores
+
+def _permutation_attached(shared, feature_names, model, columns, n_repeats, seed):
+    arrays = attach(shared)
+    # Permuting writes to the frame, so workers take their own copy of the sample
+    X = pd.DataFrame(np.array(arrays["X"]), columns=feature_names)
+    return _permutation_scores(model, X, np.asarray(arrays["y"]), columns, n_repeats, seed)
+
+def subsample(X, y, max_samples=MAX_SAMPLES, seed=42):
+    """
+    At most ``max_samples`` rows of X and y, chosen at random and kept in order.
+    """
+    if len(X) <= max_samples:
+        return X.reset_index(drop=True), np.asarray(y, dtype=float)
+    rows = np.sort(np.random.default_rng(seed).choice(len(X), max_samples, replace=False))
+    return X.iloc[rows].reset_index(drop=True), np.asarray(y, dtype=float)[rows]
+
+def permutation_importance(model, X, y, n_repeats=N_REPEATS, seed=42, n_workers=1):
+    """
+    Increase in RMSE when each feature is shuffled, for any fitted model.
+
+    Args:
+        model: Fitted estimator with predict.
+        X: Feature DataFrame (typically a test-set subsample).
+        y: Target.
+        n_repeats: Permutations per feature.
+        seed: Base seed for the permutations.
+        n_workers: Workers on the configured executor; features are split
+            between them and the sample is scattered once.
+
+    Returns:
+        tuple: (baseline RMSE, DataFrame with feature, importance_mean and
+        importance_std, one row per feature in column order).
+    """
+    X = X.reset_index(drop=True)
+    y = np.asarray(y, dtype=float)
+    baseline = _rmse(model, X, y)
+    columns = list(X.columns)
+
+    with get_executor(n_workers if len(columns) > 1 else 1) as executor:
+        if executor.n_workers <= 1:
+            scores = _permutation_scores(model, X.copy(), y, columns, n_repeats, seed)
+        else:
+            batches = [batch for batch in np.array_split(np.arange(len(columns)), executor.n_workers) if batch.size]
+            shared = executor.scatter({"X": X.to_numpy(dtype=float), "y": y})
+            try:
+                scores = np.concatenate(list(executor.map(
+                    _permutation_attached,
+                    [(shared, columns, model, [columns[i] for i in batch], n_repeats, seed) for batch in batches],
+                )))
+            finally:
+                executor.release(shared)
+
+    drops = scores - baseline
+    table = pd.DataFrame({"feature": columns, "importance_mean": drops.mean(axis=1),
+                          "importance_std": drops.std(axis=1)})
+    return baseline, table
+
+def _forest_attributions(model, X):
+    """
+    Saabas path attributions for a sklearn forest: along each row's decision
+    path every split credits its feature with the change in node mean, so
+    the bias plus the row's contributions equals the prediction.
+    """
+    from scipy import sparse
+
+    indicator, node_ptr = model.decision_path(X)
+    rows, cols, deltas, bias = [], [], [], 0.0
+    for offset, estimator in zip(node_ptr[:-1], model.estimators_):
+        tree = estimator.tree_
+        value = tree.value[:, 0, 0]
+        internal = np.flatnonzero(tree.children_left >= 0)
+        for children in (tree.children_left[internal], tree.children_right[internal]):
+            rows.append(offset + children)
+            cols.append(tree.feature[internal])
+            deltas.append(value[children] - value[internal])
+        bias += value[0]
+    credit = sparse.csr_matrix((np.concatenate(deltas), (np.concatenate(rows), np.concatenate(cols))),
+                               shape=(indicator.shape[1], X.shape[1]))
+    n_trees = len(model.estimators_)
+    return np.asarray((indicator @ credit).todense()) / n_trees, np.full(len(X), bias / n_trees)
+
+def _xgboost_attributions(model, X):
+    # XGBoost's built-in TreeSHAP; the last column is the bias term
+    from xgboost import DMatrix
+
+    contributions = model.get_booster().predict(DMatrix(X), pred_contribs=True)
+    return contributions[:, :-1].astype(float), contributions[:, -1].astype(float)
+
+def _linear_attributions(model, X):
+    # Exact for a linear model with the sample mean as the reference point
+    values = X.to_numpy(dtype=float)
+    mean = values.mean(axis=0)
+    return (values - mean) * model.coef_, np.full(len(X), model.intercept_ + mean @ model.coef_)
+
+def path_attributions(model, X):
+    """
+    Per-row additive feature attributions: contributions plus bias sum to
+    the prediction. Uses decision paths for RandomForestRegressor, TreeSHAP
+    for XGBoost, coefficients for LinearRegression, and the final
+    estimator's weights to combine the members of a StackingRegressor.
+
+    Args:
+        model: Fitted estimator.
+        X: Feature DataFrame.
+
+    Returns:
+        tuple or None: (contributions (n_rows, n_features), bias (n_rows,)),
+        or None if the model type is not supported.
+    """
+    from sklearn.ensemble import RandomForestRegressor, StackingRegressor
+    from sklearn.linear_model import LinearRegression
+
+    if isinstance(model, RandomForestRegressor):
+        return _forest_attributions(model, X)
+    if isinstance(model, LinearRegression):
+        return _linear_attributions(model, X)
+    if type(model).__name__ == "XGBRegressor":
+        return _xgboost_attributions(model, X)
+    if isinstance(model, StackingRegressor) and not model.passthrough:
+        final = model.final_estimator_
+        if not isinstance(final, LinearRegression):
+            return None
+        members = [path_attributions(estimator, X) for estimator in model.estimators_]
+        if any(member is None for member in members):
+            return None
+        contributions = sum(weight * c for weight, (c, _) in zip(final.coef_, members))
+        bias = final.intercept_ + sum(weight * b for weight, (_, b) in zip(final.coef_, members))
+        return contributions, bias
+    return None
+
+def _cache_path(cache_dir, key):
+    return os.path.join(cache_dir, f"{key}.json")
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def _set_latest(cache_dir, model_name, key):
+    latest_path = os.path.join(cache_dir, LATEST_FILENAME)
+    try:
+        with open(latest_path) as f:
+            latest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        latest = {}
+    if key is None:
+        latest.pop(model_name, None)
+    else:
+        latest[model_name] = key
+    _write_json(latest_path, latest)
+
+def explain_model(model, model_name, X, y, cache_dir, n_repeats=N_REPEATS, max_samples=MAX_SAMPLES,
+                  seed=42, n_workers=1):
+    """
+    Permutation importance and mean absolute path attributions for a fitted
+    model on a test-set subsample, cached per (model, dataset) content hash.
+
+    Args:
+        model: Fitted estimator.
+        model_name: Model key, recorded as the model's latest explanation.
+        X: Test feature DataFrame.
+        y: Test target.
+        cache_dir: Directory of <key>.json results and latest.json.
+        n_repeats: Permutations per feature.
+        max_samples: Test rows used.
+        seed: Subsampling and permutation seed.
+        n_workers: Workers for the permutations.
+
+    Returns:
+        dict: features, baseline_rmse, permutation_mean, permutation_std,
+        attribution_mean_abs (None for unsupported models), n_samples and key.
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    X_sample, y_sample = subsample(X, y, max_samples, seed)
+    key = hashlib.sha256(
+        f"{EXPLAIN_VERSION}:{model_hash(model)}:{dataset_hash(X_sample, y_sample)}:{n_repeats}:{seed}".encode()
+    ).hexdigest()
+    path = _cache_path(cache_dir, key)
+
+    if os.path.exists(path):
+        with open(path) as f:
+            explanation = json.load(f)
+        logger.info(f"Reusing cached explanation for {model_name} ({key[:12]})")
+    else:
+        baseline, table = permutation_importance(model, X_sample, y_sample, n_repeats, seed, n_workers)
+        attributions = path_attributions(model, X_sample)
+        explanation = {
+            "model": model_name,
+            "key": key,
+            "features": [str(c) for c in X_sample.columns],
+            "n_samples": len(X_sample),
+            "baseline_rmse": baseline,
+            "permutation_mean": table["importance_mean"].tolist(),
+            "permutation_std": table["importance_std"].tolist(),
+            "attribution_mean_abs": (np.abs(attributions[0]).mean(axis=0).tolist()
+                                     if attributions is not None else None),
+        }
+        _write_json(path, explanation)
+        logger.info(f"Explained {model_name} on {len(X_sample)} rows ({key[:12]})")
+
+    _set_latest(cache_dir, model_name, key)
+    return explanation
+
+def load_explanation(cache_dir, model_name):
+    """
+    Latest explanation recorded for a model, or None.
+    """
+    try:
+        with open(os.path.join(cache_dir, LATEST_FILENAME)) as f:
+            key = json.load(f).get(model_name)
+        if key is None:
+            return None
+        with open(_cache_path(cache_dir, key)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def forget_explanations(cache_dir, model_names):
+    """
+    Drops the latest-explanation pointers of re-evaluated models that were
+    not explained, so reports do not show explanations of an older fit.
+    Cached results stay on disk for reuse.
+    """
+    if not os.path.exists(os.path.join(cache_dir, LATEST_FILENAME)):
+        return
+    for model_name in model_names:
+        _set_latest(cache_dir, model_name, None)
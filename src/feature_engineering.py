@@ -1,7 +1,12 @@
 import pandas as pd
 from src.utils.config import DROP_COLUMNS
+from src.utils.settings import get_settings
+from src.window_features import add_window_features
 
-def engineer_features(df: pd.DataFrame, verbose: bool = False) -> pd.DataFrame:
+def engineer_features(df: pd.DataFrame, verbose: bool = False, require_target: bool = True,
+                      window_features: bool = None) -> pd.DataFrame:
+    if window_features is None:
+        window_features = get_settings().window_features
     df = df.copy()
 
     # Convert timestamp
@@ -21,6 +26,10 @@ def engineer_features(df: pd.DataFrame, verbose: bool = False) -> pd.DataFrame:
     # Normalize location
     df["location"] = df["location"].str.lower()
 
+    # Lags, rolling windows and rates of change per location, when enabled
+    if window_features:
+        df = add_window_features(df)
+
     # Composite key
     df["time_location"] = df["time"].astype(str) + "_" + df["location"]
     df.set_index("time_location", inplace=True)
@@ -28,8 +37,8 @@ def engineer_features(df: pd.DataFrame, verbose: bool = False) -> pd.DataFrame:
     # Drop intermediate columns
     df.drop(columns=["temperature_2m"] + DROP_COLUMNS, inplace=True, errors='ignore')
 
-    # Preserve target column
-    if "signal_dbm" not in df.columns:
+    # Preserve target column (weather-only frames are fine when predicting)
+    if require_target and "signal_dbm" not in df.columns:
         raise ValueError("Target column 'signal_dbm' missing after feature engineering.")
 
     if verbose:
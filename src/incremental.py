@@ -0,0 +1,278 @@
+import os
+import json
+import shutil
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+from src.preprocessing import preprocess
+from src.streaming_metrics import StreamingMetrics
+
+logger = get_logger(__name__)
+
+# Models with an out-of-core training path
+INCREMENTAL_MODELS = ["sgd", "xgb"]
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+STATE_FILENAME = "state.json"
+
+# XGBoost histogram bins; the external-memory matrix and booster must agree
+XGB_MAX_BIN = 256
+
+def iter_feature_chunks(path, feature_names=None, target_column="signal_dbm", chunk_size=DEFAULT_CHUNK_SIZE,
+                        start_chunk=0, preserve_nulls=False):
+    """
+    Streams a simulated signal CSV as preprocessed (X, y) chunks.
+
+    Chunks before ``start_chunk`` are skipped without being parsed, which
+    lets an interrupted run resume where its checkpoint stopped.
+
+    Args:
+        path: Simulated signal CSV.
+        feature_names: Feature columns to emit. Taken from the first chunk if None.
+        target_column: Name of the target column (never part of X).
+        chunk_size: Rows per chunk.
+        start_chunk: Index of the first chunk to read.
+        preserve_nulls: Passed to preprocess.
+
+    Yields:
+        tuple: (chunk index, X DataFrame, y Series).
+    """
+    if str(path).endswith(".parquet"):
+        raise ValueError("Out-of-core training streams CSV files; set storage_format to csv or csv.gz")
+    skip = range(1, 1 + start_chunk * chunk_size) if start_chunk else None
+    reader = pd.read_csv(path, chunksize=chunk_size, skiprows=skip)
+    for index, raw in enumerate(reader, start=start_chunk):
+        df = preprocess(raw, save=False, preserve_nulls=preserve_nulls)
+        X = df.select_dtypes(include=["number"]).drop(columns=[target_column])
+        if feature_names is None:
+            feature_names = X.columns.tolist()
+        yield index, X.reindex(columns=feature_names), df[target_column]
+
+def holdout_mask(n_rows, chunk_index, test_fraction=0.2, seed=42):
+    """
+    Deterministic per-chunk test-row mask, identical across resumed runs.
+    """
+    return np.random.default_rng([seed, chunk_index]).random(n_rows) < test_fraction
+
+def _write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def load_checkpoint(checkpoint_dir):
+    """
+    Returns:
+        dict or None: Saved training state, or None if there is no checkpoint.
+    """
+    try:
+        with open(os.path.join(checkpoint_dir, STATE_FILENAME)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+# State keys that must match for a checkpoint to be resumed
+RUN_KEYS = ("model", "source", "fingerprint", "chunk_size", "test_fraction")
+
+def source_fingerprint(path):
+    """
+    Size and modification time of the source file. simulate rewrites the
+    signal file in place, so the path alone does not identify the data.
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+def _new_state(model_name, path, chunk_size, test_fraction):
+    return {"model": model_name, "source": os.path.abspath(path), "fingerprint": source_fingerprint(path),
+            "chunk_size": chunk_size, "test_fraction": test_fraction, "feature_names": None, "chunks_done": 0,
+            "complete": False}
+
+def _resume_state(checkpoint_dir, model_name, path, chunk_size, test_fraction, resume):
+    state = load_checkpoint(checkpoint_dir) if resume else None
+    expected = _new_state(model_name, path, chunk_size, test_fraction)
+    if state and all(state.get(k) == expected[k] for k in RUN_KEYS):
+        logger.info(f"Resuming {model_name} from checkpoint after {state['chunks_done']} chunks")
+        return state
+    if state:
+        logger.warning(f"Checkpoint in {checkpoint_dir} belongs to a different run or source data; starting over")
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    os.makedirs(checkpoint_dir)
+    return expected
+
+class SGDChunkModel:
+    """
+    StandardScaler + SGDRegressor updated with partial_fit, one chunk at a time.
+    """
+
+    def __init__(self, random_state=42):
+        from sklearn.linear_model import SGDRegressor
+        from sklearn.preprocessing import StandardScaler
+
+        self.scaler = StandardScaler()
+        self.model = SGDRegressor(random_state=random_state)
+        # Signal levels sit around -70 dBm; fitting residuals around the first
+        # chunk's mean spares SGD from walking the intercept there
+        self.y_offset = None
+
+    def _transform(self, X):
+        # Features missing in a chunk are imputed with the running mean (0 after scaling)
+        return np.nan_to_num(self.scaler.transform(X.to_numpy(dtype=float)))
+
+    def partial_fit(self, X, y):
+        y = np.asarray(y, dtype=float)
+        if self.y_offset is None:
+            self.y_offset = float(y.mean())
+        self.scaler.partial_fit(X.to_numpy(dtype=float))
+        self.model.partial_fit(self._transform(X), y - self.y_offset)
+        return self
+
+    def predict(self, X):
+        return self.model.predict(self._transform(X)) + self.y_offset
+
+def train_sgd(path, checkpoint_dir, target_column="signal_dbm", chunk_size=DEFAULT_CHUNK_SIZE,
+              test_fraction=0.2, resume=True):
+    """
+    Single pass of SGD over the training rows of every chunk, checkpointing
+    the scaler and model after each chunk.
+
+    Returns:
+        tuple: (SGDChunkModel, state dict).
+    """
+    import joblib
+
+    state = _resume_state(checkpoint_dir, "sgd", path, chunk_size, test_fraction, resume)
+    model_path = os.path.join(checkpoint_dir, "model.joblib")
+    model = joblib.load(model_path) if state["chunks_done"] else SGDChunkModel()
+    if state["complete"]:
+        return model, state
+
+    for index, X, y in iter_feature_chunks(path, state["feature_names"], target_column, chunk_size,
+                                           start_chunk=state["chunks_done"]):
+        train = ~holdout_mask(len(X), index, test_fraction)
+        model.partial_fit(X[train], y[train])
+
+        state["feature_names"] = X.columns.tolist()
+        state["chunks_done"] = index + 1
+        joblib.dump(model, model_path + ".tmp")
+        os.replace(model_path + ".tmp", model_path)
+        _write_json(os.path.join(checkpoint_dir, STATE_FILENAME), state)
+
+    state["complete"] = True
+    _write_json(os.path.join(checkpoint_dir, STATE_FILENAME), state)
+    return model, state
+
+def _xgb_chunk_iterator(path, feature_names, target_column, chunk_size, test_fraction, cache_prefix):
+    import xgboost as xgb
+
+    class ChunkIterator(xgb.DataIter):
+        """
+        Feeds the training rows of every CSV chunk to an external-memory DMatrix.
+        """
+
+        def __init__(self):
+            self._chunks = None
+            super().__init__(cache_prefix=cache_prefix)
+
+        def next(self, input_data):
+            if self._chunks is None:
+                self._chunks = iter_feature_chunks(path, feature_names, target_column, chunk_size,
+                                                   preserve_nulls=True)
+            try:
+                index, X, y = next(self._chunks)
+            except StopIteration:
+                return False
+            train = ~holdout_mask(len(X), index, test_fraction)
+            input_data(data=X[train].to_numpy(dtype=float), label=y[train].to_numpy(dtype=float))
+            return True
+
+        def reset(self):
+            self._chunks = None
+
+    return ChunkIterator()
+
+class XGBChunkModel:
+    """
+    Wraps a Booster with the predict(X DataFrame) interface used for scoring.
+    """
+
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict(self, X):
+        return self.booster.inplace_predict(X.to_numpy(dtype=float))
+
+def train_xgb(path, checkpoint_dir, target_column="signal_dbm", chunk_size=DEFAULT_CHUNK_SIZE,
+              test_fraction=0.2, resume=True, num_boost_round=100, checkpoint_interval=10):
+    """
+    Trains XGBoost on an iterator-based external-memory DMatrix. Only one
+    chunk is held in memory while the quantized pages are built on disk; the
+    booster is checkpointed every ``checkpoint_interval`` rounds.
+
+    Returns:
+        tuple: (XGBChunkModel, state dict).
+    """
+    import xgboost as xgb
+
+    state = _resume_state(checkpoint_dir, "xgb", path, chunk_size, test_fraction, resume)
+    model_path = os.path.join(checkpoint_dir, "model.ubj")
+    booster = xgb.Booster(model_file=model_path) if os.path.exists(model_path) else None
+    done = booster.num_boosted_rounds() if booster is not None else 0
+    if state["complete"] or done >= num_boost_round:
+        return XGBChunkModel(booster), state
+
+    if state["feature_names"] is None:
+        _, X, _ = next(iter_feature_chunks(path, None, target_column, chunk_size, preserve_nulls=True))
+        state["feature_names"] = X.columns.tolist()
+
+    iterator = _xgb_chunk_iterator(path, state["feature_names"], target_column, chunk_size, test_fraction,
+                                   cache_prefix=os.path.join(checkpoint_dir, "cache"))
+    dtrain = xgb.ExtMemQuantileDMatrix(iterator, max_bin=XGB_MAX_BIN)
+    params = {"tree_method": "hist", "max_bin": XGB_MAX_BIN, "seed": 42}
+
+    while done < num_boost_round:
+        rounds = min(checkpoint_interval, num_boost_round - done)
+        booster = xgb.train(params, dtrain, num_boost_round=rounds, xgb_model=booster)
+        done = booster.num_boosted_rounds()
+        booster.save_model(model_path + ".tmp.ubj")
+        os.replace(model_path + ".tmp.ubj", model_path)
+        state["rounds_done"] = done
+        _write_json(os.path.join(checkpoint_dir, STATE_FILENAME), state)
+
+    state["complete"] = True
+    _write_json(os.path.join(checkpoint_dir, STATE_FILENAME), state)
+    return XGBChunkModel(booster), state
+
+def evaluate_incremental(path, model_name, checkpoint_dir, target_column="signal_dbm",
+                         chunk_size=DEFAULT_CHUNK_SIZE, test_fraction=0.2, resume=True, **train_kwargs):
+    """
+    Out-of-core counterpart of evaluation.evaluate: trains from disk, then
+    streams the held-out rows of every chunk through the model.
+
+    Args:
+        path: Simulated signal CSV.
+        model_name: One of INCREMENTAL_MODELS.
+        checkpoint_dir: Directory for the model checkpoint and training state.
+        target_column: Name of the target column.
+        chunk_size: Rows per chunk.
+        test_fraction: Fraction of each chunk held out for scoring.
+        resume: Continue from an existing matching checkpoint.
+        **train_kwargs: Extra arguments for the model's trainer.
+
+    Returns:
+        tuple: (metrics, StreamingMetrics).
+    """
+    trainers = {"sgd": train_sgd, "xgb": train_xgb}
+    if model_name not in trainers:
+        raise ValueError(f"Model {model_name} has no incremental training path")
+
+    model, state = trainers[model_name](path, checkpoint_dir, target_column, chunk_size, test_fraction,
+                                        resume=resume, **train_kwargs)
+
+    scores = StreamingMetrics(seed=42)
+    for index, X, y in iter_feature_chunks(path, state["feature_names"], target_column, chunk_size,
+                                           preserve_nulls=model_name == "xgb"):
+        test = holdout_mask(len(X), index, test_fraction)
+        scores.update(y[test], model.predict(X[test]))
+    return scores.result(), scores
@@ -1,25 +1,23 @@
-import os
 import requests
 import pandas as pd
 from datetime import datetime
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from src.utils.config import START_DATE, END_DATE
 from src.utils.logger import get_logger
 from src.utils.constants import DEFAULT_LOCATIONS, EXPECTED_COLUMNS, DEFAULT_TIMEZONE, BASE_URL_HISTORICAL
-from src.utils.config_loader import load_project_root
+from src.utils.settings import get_settings
+from src.archive import PayloadArchive
 
 logger = get_logger(__name__)
-project_root = load_project_root()
-OUTPUT_DIR = os.path.join(project_root, "data", "processed")
 
 def fetch_open_meteo(city, lat, lon):
+    settings = get_settings()
     params = {
         "latitude": lat,
         "longitude": lon,
-        "start_date": START_DATE,
-        "end_date": END_DATE,
+        "start_date": settings.start_date,
+        "end_date": settings.end_date,
         "hourly": EXPECTED_COLUMNS[:-2],  # exclude 'location' and 'time'
         "timezone": DEFAULT_TIMEZONE
     }
@@ -40,7 +38,10 @@ def fetch_open_meteo(city, lat, lon):
         return None
 
 def collect_all():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    """
+    Fetches historical weather for every default location and archives the
+    combined CSV (see src.archive); get_latest_historical_file resolves it.
+    """
     all_dfs = []
 
     for loc in DEFAULT_LOCATIONS:
@@ -56,8 +57,17 @@ def collect_all():
     if all_dfs:
         full_df = pd.concat(all_dfs, ignore_index=True)
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M")
-        output_path = os.path.join(OUTPUT_DIR, f"weather_historical_{timestamp}.csv")
-        full_df.to_csv(output_path, index=False)
-        logger.info(f"Saved historical weather data to {output_path}")
+        # A refresh that returns the same data only adds an index entry
+        archive = PayloadArchive.for_project()
+        try:
+            previous = archive.latest("historical")
+            content_hash = archive.put(full_df.to_csv(index=False).encode("utf-8"), kind="historical",
+                                       suffix=".csv", name=f"weather_historical_{timestamp}.csv")
+        finally:
+            archive.close()
+        if previous and previous["hash"] == content_hash:
+            logger.info("Historical weather data unchanged since the last collection")
+        else:
+            logger.info(f"Archived historical weather data as {content_hash[:12]}")
     else:
         logger.error("No data collected. All fetches failed.")
@@ -0,0 +1,110 @@
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Second-order terms that mirror the couplings in
+# signal_simulation.simulate_realistic_signal_strength: rain × wind and
+# humidity × temperature interactions, quadratic humidity absorption, and
+# squares standing in for the |x - c| temperature and pressure terms and
+# the piecewise-linear rain, cloud and wind responses. The measured "rain"
+# column stands in for the simulation's rain_rate, which the weather data
+# only carries where sensor faults were injected
+PHYSICAL_INTERACTIONS = [
+    ("rain", "windspeed_10m"),
+    ("relative_humidity_2m", "temperature_celsius"),
+    ("relative_humidity_2m", "relative_humidity_2m"),
+    ("temperature_celsius", "temperature_celsius"),
+    ("pressure_msl", "pressure_msl"),
+    ("rain", "rain"),
+    ("cloudcover", "cloudcover"),
+    ("windspeed_10m", "windspeed_10m"),
+]
+
+# Rows expanded into design-matrix rows at a time
+CHUNK_SIZE = 50_000
+
+class PhysicalPolyRegressor(BaseEstimator, RegressorMixin):
+    """
+    Linear regression on every input column plus a declared set of
+    pairwise product terms, instead of all degree-2 combinations.
+
+    The design matrix is never materialized: rows are expanded
+    chunk_size at a time and folded into the R factor of a running QR
+    decomposition of [design | y], so memory is O(chunk_size × p + p²)
+    for p = 1 + n_features + n_interactions. Missing inputs are filled
+    with the training column means.
+
+    Args:
+        interactions: (column, column) pairs; a pair of the same column is
+            its square. Pairs naming columns absent from X are skipped.
+        chunk_size: Rows per design chunk.
+    """
+
+    def __init__(self, interactions=PHYSICAL_INTERACTIONS, chunk_size=CHUNK_SIZE):
+        self.interactions = interactions
+        self.chunk_size = chunk_size
+
+    def _design(self, X):
+        X = np.where(np.isnan(X), self.fill_values_, X)
+        products = [X[:, i] * X[:, j] for i, j in self.interaction_index_]
+        return np.column_stack([np.ones(len(X)), X] + products)
+
+    def _chunks(self, X):
+        if hasattr(X, "columns"):
+            X = X[list(self.feature_names_in_)]
+        values = X.to_numpy(dtype=float) if hasattr(X, "to_numpy") else np.asarray(X, dtype=float)
+        for start in range(0, len(values), self.chunk_size):
+            yield start, self._design(values[start:start + self.chunk_size])
+
+    def fit(self, X, y):
+        """
+        Args:
+            X: DataFrame of numeric features (interactions refer to its columns).
+            y: Target.
+
+        Returns:
+            PhysicalPolyRegressor: self.
+        """
+        if not hasattr(X, "columns"):
+            raise ValueError("PhysicalPolyRegressor needs a DataFrame to resolve interaction columns")
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = X.shape[1]
+        position = {name: i for i, name in enumerate(self.feature_names_in_)}
+        self.interaction_index_ = [(position[a], position[b]) for a, b in self.interactions
+                                   if a in position and b in position]
+        skipped = [pair for pair in self.interactions if pair[0] not in position or pair[1] not in position]
+        if skipped:
+            logger.warning(f"Skipping interactions with missing columns: {skipped}")
+        self.terms_ = (["intercept"] + list(self.feature_names_in_)
+                       + [f"{self.feature_names_in_[i]}*{self.feature_names_in_[j]}" for i, j in self.interaction_index_])
+
+        means = X.mean(skipna=True).to_numpy(dtype=float)
+        self.fill_values_ = np.where(np.isnan(means), 0.0, means)
+
+        y = np.asarray(y, dtype=float)
+        n_terms = len(self.terms_)
+        r = np.zeros((0, n_terms + 1))
+        for start, design in self._chunks(X):
+            block = np.column_stack([design, y[start:start + len(design)]])
+            r = np.linalg.qr(np.vstack([r, block]), mode="r")
+
+        # R has the column norms of [design | y]; equilibrating by them keeps
+        # the rank cut-off meaningful when terms differ in scale by orders of magnitude
+        r = np.vstack([r, np.zeros((max(0, n_terms + 1 - len(r)), n_terms + 1))])
+        norms = np.linalg.norm(r[:, :n_terms], axis=0)
+        norms[norms == 0] = 1.0
+        solution, _, rank, _ = np.linalg.lstsq(r[:n_terms, :n_terms] / norms, r[:n_terms, n_terms], rcond=None)
+        coef = solution / norms
+        if rank < n_terms:
+            logger.info(f"Design has rank {rank} of {n_terms} terms; using the minimum-norm solution")
+
+        self.intercept_ = float(coef[0])
+        self.coef_ = coef[1:]
+        return self
+
+    def predict(self, X):
+        full = np.concatenate([[self.intercept_], self.coef_])
+        return np.concatenate([design @ full for _, design in self._chunks(X)]) if len(X) else np.empty(0)
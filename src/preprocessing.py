@@ -6,7 +6,6 @@ from src.utils.config_loader import load_project_root
 from src.utils.utils import safe_name
 
 logger = get_logger(__name__)
-project_root = load_project_root()
 
 def handle_null_values(df):
     for col in df.columns[df.isna().any()]:
@@ -16,15 +15,15 @@ def handle_null_values(df):
             df[col] = df[col].ffill().bfill()
     return df
 
-def preprocess(df, save=True, preserve_nulls=False):
+def preprocess(df, save=True, preserve_nulls=False, require_target=True):
     if not preserve_nulls:
         df = handle_null_values(df)
     df["location"] = df["location"].apply(safe_name)
     df = handle_null_values(df)
-    df = engineer_features(df)
+    df = engineer_features(df, require_target=require_target)
 
     if save:
-        output_path = os.path.join(project_root, "data", "processed", "weather_engineered_latest.csv")
+        output_path = os.path.join(load_project_root(), "data", "processed", "weather_engineered_latest.csv")
         df.to_csv(output_path, index=False)
         logger.info(f"✅ Saved engineered features to {output_path}")
 
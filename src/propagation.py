@@ -0,0 +1,266 @@
+from functools import lru_cache
+import numpy as np
+
+from src.utils.constants import DEFAULT_LOCATIONS
+from src.spatial_index import normalize_location
+
+# ITU-R P.838-3 regression coefficients: (a_j, b_j, c_j, m, c)
+P838_COEFFICIENTS = {
+    "kH": (
+        [-5.33980, -0.35351, -0.23789, -0.94158],
+        [-0.10008, 1.26970, 0.86036, 0.64552],
+        [1.13098, 0.45400, 0.15354, 0.16817],
+        -0.18961, 0.71147,
+    ),
+    "kV": (
+        [-3.80595, -3.44965, -0.39902, 0.50167],
+        [0.56934, -0.22911, 0.73042, 1.07319],
+        [0.81061, 0.51059, 0.11899, 0.27195],
+        -0.16398, 0.63297,
+    ),
+    "alphaH": (
+        [-0.14318, 0.29591, 0.32177, -5.37610, 16.1721],
+        [1.82442, 0.77564, 0.63773, -0.96230, -3.29980],
+        [-0.55187, 0.19822, 0.13164, 1.47828, 3.43990],
+        0.67849, -1.95537,
+    ),
+    "alphaV": (
+        [-0.07771, 0.56727, -0.20238, -48.2991, 48.5833],
+        [2.33840, 0.95545, 1.14520, 0.791669, 0.791459],
+        [-0.76284, 0.54039, 0.26809, 0.116226, 0.116479],
+        -0.053739, 0.83433,
+    ),
+}
+
+# Frequency grid (GHz) on which the coefficients are tabulated
+FREQUENCY_GRID_GHZ = np.geomspace(1.0, 100.0, 1024)
+
+# Polarization tilt angle relative to horizontal (degrees)
+POLARIZATION_TILT = {"horizontal": 0.0, "vertical": 90.0, "circular": 45.0}
+
+EFFECTIVE_EARTH_RADIUS_KM = 8500.0
+OXYGEN_EQUIVALENT_HEIGHT_KM = 6.0
+WATER_VAPOUR_EQUIVALENT_HEIGHT_KM = 2.1
+
+# Liquid water path (kg/m²) assumed for a fully overcast sky
+OVERCAST_LIQUID_WATER_KG_M2 = 0.5
+
+DEFAULT_LATITUDE = 35.0
+
+# Link used when simulate_from_csv is asked for the ITU engine without links
+DEFAULT_LINK = {"name": "ku_band", "frequency_ghz": 12.0, "elevation_deg": 40.0, "polarization": "circular"}
+
+def _p838_regression(log_f, coefficients):
+    # Returns log10(k) for the k coefficients and alpha itself otherwise
+    a, b, c, m, offset = (np.asarray(v, dtype=float) for v in coefficients)
+    terms = a * np.exp(-((log_f[..., None] - b) / c) ** 2)
+    return terms.sum(axis=-1) + m * log_f + offset
+
+@lru_cache(maxsize=None)
+def coefficient_table():
+    """
+    Evaluates the ITU-R P.838-3 regressions once on FREQUENCY_GRID_GHZ.
+
+    Returns:
+        dict: log10 of the grid frequencies, log10(kH), log10(kV), alphaH
+        and alphaV arrays.
+    """
+    log_f = np.log10(FREQUENCY_GRID_GHZ)
+    table = {"log_f": log_f}
+    for name, coefficients in P838_COEFFICIENTS.items():
+        table[name] = _p838_regression(log_f, coefficients)
+    return table
+
+def _polarization_tilt(polarization):
+    if isinstance(polarization, str):
+        return POLARIZATION_TILT[polarization.lower()]
+    return np.asarray(polarization, dtype=float)
+
+def rain_coefficients(frequency_ghz, elevation_deg=90.0, polarization="circular"):
+    """
+    Interpolates the P.838 k and alpha coefficients for arbitrary links.
+
+    Args:
+        frequency_ghz: Carrier frequency (GHz), 1–100. Array-like.
+        elevation_deg: Path elevation angle (degrees). Array-like.
+        polarization: "horizontal", "vertical", "circular" or a tilt angle in degrees.
+
+    Returns:
+        tuple: (k, alpha) arrays broadcast over the inputs.
+    """
+    table = coefficient_table()
+    log_f = np.log10(np.clip(np.asarray(frequency_ghz, dtype=float), FREQUENCY_GRID_GHZ[0], FREQUENCY_GRID_GHZ[-1]))
+    k_h = 10 ** np.interp(log_f, table["log_f"], table["kH"])
+    k_v = 10 ** np.interp(log_f, table["log_f"], table["kV"])
+    alpha_h = np.interp(log_f, table["log_f"], table["alphaH"])
+    alpha_v = np.interp(log_f, table["log_f"], table["alphaV"])
+
+    theta = np.radians(np.asarray(elevation_deg, dtype=float))
+    tau = np.radians(_polarization_tilt(polarization))
+    mix = np.cos(theta) ** 2 * np.cos(2 * tau)
+    k = (k_h + k_v + (k_h - k_v) * mix) / 2
+    alpha = (k_h * alpha_h + k_v * alpha_v + (k_h * alpha_h - k_v * alpha_v) * mix) / (2 * k)
+    return k, alpha
+
+def specific_rain_attenuation(rain_rate, frequency_ghz, elevation_deg=90.0, polarization="circular"):
+    """
+    Specific attenuation gamma_R = k * R^alpha (dB/km), ITU-R P.838.
+
+    Args:
+        rain_rate: Rain rate (mm/h).
+        frequency_ghz: Carrier frequency (GHz).
+        elevation_deg: Path elevation angle (degrees).
+        polarization: Polarization name or tilt angle.
+
+    Returns:
+        np.ndarray: Specific attenuation (dB/km).
+    """
+    k, alpha = rain_coefficients(frequency_ghz, elevation_deg, polarization)
+    return k * np.maximum(np.asarray(rain_rate, dtype=float), 0.0) ** alpha
+
+def rain_height_km(latitude_deg):
+    """
+    Mean rain height above sea level (simplified ITU-R P.839).
+
+    Args:
+        latitude_deg: Station latitude (degrees).
+
+    Returns:
+        np.ndarray: Rain height (km).
+    """
+    latitude = np.abs(np.asarray(latitude_deg, dtype=float))
+    return np.where(latitude <= 23.0, 5.0, np.maximum(5.0 - 0.075 * (latitude - 23.0), 0.5))
+
+def slant_path_km(elevation_deg, rain_height, station_height_km=0.0):
+    """
+    Slant-path length below the rain height (ITU-R P.618, step 2).
+
+    Args:
+        elevation_deg: Path elevation angle (degrees).
+        rain_height: Rain height (km).
+        station_height_km: Station height above sea level (km).
+
+    Returns:
+        np.ndarray: Slant-path length (km).
+    """
+    theta = np.radians(np.asarray(elevation_deg, dtype=float))
+    height = np.maximum(np.asarray(rain_height, dtype=float) - station_height_km, 0.0)
+    sin_theta = np.sin(theta)
+    flat_earth = height / np.maximum(sin_theta, 1e-6)
+    curved_earth = 2 * height / (np.sqrt(sin_theta ** 2 + 2 * height / EFFECTIVE_EARTH_RADIUS_KM) + sin_theta)
+    return np.where(np.degrees(theta) >= 5.0, flat_earth, curved_earth)
+
+def rain_path_attenuation(rain_rate, frequency_ghz, elevation_deg, polarization="circular",
+                          latitude_deg=DEFAULT_LATITUDE):
+    """
+    Rain attenuation along the slant path, with the P.618 horizontal
+    reduction factor applied to the path length.
+
+    Args:
+        rain_rate: Rain rate (mm/h).
+        frequency_ghz: Carrier frequency (GHz).
+        elevation_deg: Path elevation angle (degrees).
+        polarization: Polarization name or tilt angle.
+        latitude_deg: Station latitude (degrees).
+
+    Returns:
+        np.ndarray: Rain attenuation (dB).
+    """
+    gamma = specific_rain_attenuation(rain_rate, frequency_ghz, elevation_deg, polarization)
+    path = slant_path_km(elevation_deg, rain_height_km(latitude_deg))
+    horizontal = path * np.cos(np.radians(elevation_deg))
+    frequency = np.asarray(frequency_ghz, dtype=float)
+    reduction = 1.0 / (1.0 + 0.78 * np.sqrt(horizontal * gamma / frequency) - 0.38 * (1.0 - np.exp(-2.0 * horizontal)))
+    return gamma * path * reduction
+
+def water_vapour_density(temperature_c, relative_humidity):
+    """
+    Surface water-vapour density (g/m³) from temperature and humidity (ITU-R P.453).
+    """
+    temperature = np.asarray(temperature_c, dtype=float)
+    vapour_pressure = np.asarray(relative_humidity, dtype=float) / 100 * 6.1121 * np.exp(
+        17.502 * temperature / (temperature + 240.97)
+    )
+    return 216.7 * vapour_pressure / (temperature + 273.15)
+
+def gaseous_attenuation(frequency_ghz, elevation_deg, temperature_c, relative_humidity, pressure_hpa=1013.25):
+    """
+    Oxygen and water-vapour absorption along the slant path, using the
+    simplified ITU-R P.676 specific attenuations (valid below ~57 GHz) and
+    fixed equivalent heights.
+
+    Args:
+        frequency_ghz: Carrier frequency (GHz).
+        elevation_deg: Path elevation angle (degrees).
+        temperature_c: Surface temperature (°C).
+        relative_humidity: Surface relative humidity (%).
+        pressure_hpa: Surface pressure (hPa).
+
+    Returns:
+        np.ndarray: Gaseous attenuation (dB).
+    """
+    f = np.asarray(frequency_ghz, dtype=float)
+    rho = water_vapour_density(temperature_c, relative_humidity)
+    gamma_oxygen = (7.19e-3 + 6.09 / (f ** 2 + 0.227) + 4.81 / ((f - 57) ** 2 + 1.50)) * f ** 2 * 1e-3
+    gamma_oxygen = gamma_oxygen * (np.asarray(pressure_hpa, dtype=float) / 1013.25) ** 2
+    gamma_water = (
+        0.050 + 0.0021 * rho
+        + 3.6 / ((f - 22.2) ** 2 + 8.5)
+        + 10.6 / ((f - 183.3) ** 2 + 9.0)
+        + 8.9 / ((f - 325.4) ** 2 + 26.3)
+    ) * f ** 2 * rho * 1e-4
+    zenith = gamma_oxygen * OXYGEN_EQUIVALENT_HEIGHT_KM + gamma_water * WATER_VAPOUR_EQUIVALENT_HEIGHT_KM
+    return zenith / np.sin(np.radians(np.maximum(np.asarray(elevation_deg, dtype=float), 5.0)))
+
+def cloud_attenuation(frequency_ghz, elevation_deg, cloud_cover):
+    """
+    Cloud attenuation (ITU-R P.840 form A = L * K_l / sin(theta)), with the
+    liquid water path scaled from cloud cover and a power-law fit of K_l at
+    0 °C that holds below ~40 GHz.
+
+    Args:
+        frequency_ghz: Carrier frequency (GHz).
+        elevation_deg: Path elevation angle (degrees).
+        cloud_cover: Cloud cover (%).
+
+    Returns:
+        np.ndarray: Cloud attenuation (dB).
+    """
+    liquid_water = OVERCAST_LIQUID_WATER_KG_M2 * np.clip(np.asarray(cloud_cover, dtype=float), 0, 100) / 100
+    k_l = 0.00115 * np.asarray(frequency_ghz, dtype=float) ** 1.9
+    return liquid_water * k_l / np.sin(np.radians(np.maximum(np.asarray(elevation_deg, dtype=float), 5.0)))
+
+def location_latitudes(locations):
+    """
+    Maps location names to DEFAULT_LOCATIONS latitudes.
+
+    Args:
+        locations: Array-like of location names.
+
+    Returns:
+        np.ndarray: Latitude per entry, DEFAULT_LATITUDE when unknown.
+    """
+    lookup = {normalize_location(loc["name"]): loc["latitude"] for loc in DEFAULT_LOCATIONS}
+    return np.array([lookup.get(normalize_location(name), DEFAULT_LATITUDE) for name in locations], dtype=float)
+
+def link_attenuation(weather, links, latitude_deg=DEFAULT_LATITUDE):
+    """
+    Total propagation loss for every link and every weather row.
+
+    Args:
+        weather: Dict of weather arrays (see signal_simulation.extract_weather_arrays).
+        links: List of link dicts with frequency_ghz, elevation_deg and polarization.
+        latitude_deg: Latitude per weather row, or a scalar.
+
+    Returns:
+        np.ndarray: Attenuation (dB) with shape (len(links), n_rows).
+    """
+    frequency = np.array([link["frequency_ghz"] for link in links], dtype=float)[:, None]
+    elevation = np.array([link["elevation_deg"] for link in links], dtype=float)[:, None]
+    tilt = np.array([_polarization_tilt(link.get("polarization", "circular")) for link in links], dtype=float)[:, None]
+
+    rain = rain_path_attenuation(weather["rain_rate"][None, :], frequency, elevation, tilt, np.asarray(latitude_deg)[None, ...])
+    gas = gaseous_attenuation(frequency, elevation, weather["temperature_2m"][None, :],
+                              weather["relative_humidity_2m"][None, :], weather["pressure_msl"][None, :])
+    cloud = cloud_attenuation(frequency, elevation, weather["cloudcover"][None, :])
+    return rain + gas + cloud
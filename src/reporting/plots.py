@@ -1,15 +1,41 @@
 import os
+import matplotlib
+matplotlib.use("Agg")  # Figures are only written to disk, never shown
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
-def plot_predictions(y_true, y_pred, model_name, project_root):
+# Above MAX_SCATTER_POINTS the scatter is randomly downsampled; above
+# HEXBIN_THRESHOLD it is replaced by a hexbin density plot
+MAX_SCATTER_POINTS = 20_000
+HEXBIN_THRESHOLD = 200_000
+
+# Kernel density estimates are skipped for larger residual samples
+KDE_MAX_POINTS = 50_000
+
+def _downsample(y_true, y_pred, max_points, seed=42):
+    rng = np.random.default_rng(seed)
+    idx = np.sort(rng.choice(len(y_true), max_points, replace=False))
+    return y_true[idx], y_pred[idx]
+
+def plot_predictions(y_true, y_pred, model_name, project_root,
+                     max_points=MAX_SCATTER_POINTS, hexbin_threshold=HEXBIN_THRESHOLD):
     output_dir = os.path.join(project_root, "results", "figures")
     os.makedirs(output_dir, exist_ok=True)
 
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    lo, hi = np.min(y_true), np.max(y_true)
+
     plt.figure(figsize=(6, 6))
-    sns.scatterplot(x=y_true, y=y_pred, alpha=0.6)
-    plt.plot([min(y_true), max(y_true)], [min(y_true), max(y_true)], color='red', linestyle='--')
+    if len(y_true) > hexbin_threshold:
+        plt.hexbin(y_true, y_pred, gridsize=80, bins="log", mincnt=1, cmap="viridis")
+        plt.colorbar(label="log10(count)")
+    else:
+        if len(y_true) > max_points:
+            y_true, y_pred = _downsample(y_true, y_pred, max_points)
+        sns.scatterplot(x=y_true, y=y_pred, alpha=0.6)
+    plt.plot([lo, hi], [lo, hi], color='red', linestyle='--')
     plt.xlabel("Actual")
     plt.ylabel("Predicted")
     plt.title(f"{model_name.upper()} Predictions")
@@ -18,13 +44,13 @@ def plot_predictions(y_true, y_pred, model_name, project_root):
     plt.close()
     return path
 
-def plot_residuals(y_true, y_pred, model_name, project_root):
+def plot_residuals(y_true, y_pred, model_name, project_root, kde_max_points=KDE_MAX_POINTS):
     output_dir = os.path.join(project_root, "results", "figures")
     os.makedirs(output_dir, exist_ok=True)
 
     residuals = np.array(y_true) - np.array(y_pred)
     plt.figure(figsize=(6, 4))
-    sns.histplot(residuals, bins=30, kde=True)
+    sns.histplot(residuals, bins=30, kde=len(residuals) <= kde_max_points)
     plt.xlabel("Residual")
     plt.title(f"{model_name.upper()} Residuals")
     path = os.path.join(output_dir, f"{model_name}_residuals.png")
@@ -32,23 +58,51 @@ def plot_residuals(y_true, y_pred, model_name, project_root):
     plt.close()
     return path
 
-def plot_feature_importance(model, model_name, feature_names, project_root):
-    if not hasattr(model, "feature_importances_"):
-        return None
+def plot_residual_histogram(counts, edges, model_name, project_root):
+    """
+    Residual histogram from precomputed bin counts, e.g. a metrics sketch.
+    """
+    output_dir = os.path.join(project_root, "results", "figures")
+    os.makedirs(output_dir, exist_ok=True)
+
+    edges = np.asarray(edges, dtype=float)
+    plt.figure(figsize=(6, 4))
+    plt.stairs(counts, edges, fill=True, alpha=0.6)
+    plt.xlabel("Residual")
+    plt.ylabel("Count")
+    plt.title(f"{model_name.upper()} Residuals")
+    path = os.path.join(output_dir, f"{model_name}_residuals.png")
+    plt.savefig(path)
+    plt.close()
+    return path
 
+def plot_importances(importances, feature_names, model_name, project_root, suffix="feature_importance",
+                     title="Feature Importance", xlabel="Importance", top_n=20):
     output_dir = os.path.join(project_root, "results", "figures")
     os.makedirs(output_dir, exist_ok=True)
 
-    importances = model.feature_importances_
-    indices = np.argsort(importances)[::-1]
+    importances = np.asarray(importances)
+    indices = np.argsort(importances)[::-1][:top_n]
     sorted_features = [feature_names[i] for i in indices]
 
     plt.figure(figsize=(8, 6))
     sns.barplot(x=importances[indices], y=sorted_features)
-    plt.title(f"{model_name.upper()} Feature Importance")
-    plt.xlabel("Importance")
-    path = os.path.join(output_dir, f"{model_name}_feature_importance.png")
+    plt.title(f"{model_name.upper()} {title}")
+    plt.xlabel(xlabel)
+    path = os.path.join(output_dir, f"{model_name}_{suffix}.png")
     plt.tight_layout()
     plt.savefig(path)
     plt.close()
     return path
+
+def plot_attributions(importances, feature_names, model_name, project_root):
+    """
+    Mean absolute path attribution per feature (see src.explain).
+    """
+    return plot_importances(importances, feature_names, model_name, project_root, suffix="attributions",
+                            title="Mean |Attribution|", xlabel="Mean absolute contribution (dB)")
+
+def plot_feature_importance(model, model_name, feature_names, project_root):
+    if not hasattr(model, "feature_importances_"):
+        return None
+    return plot_importances(model.feature_importances_, feature_names, model_name, project_root)
@@ -0,0 +1,129 @@
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+
+from src.executor import get_executor
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Bump when plot styling changes so cached figures are re-rendered
+RENDER_VERSION = 1
+
+CACHE_FILENAME = ".render_cache.json"
+
+# pyplot keeps global state, so figures are drawn one at a time per process
+# (thread and in-process cluster backends share it)
+_PYPLOT_LOCK = threading.Lock()
+
+# Figure kind → filename suffix written by the matching plot function
+FIGURE_SUFFIXES = {
+    "predictions": "predictions",
+    "residuals": "residuals",
+    "residual_histogram": "residuals",
+    "importances": "feature_importance",
+    "attributions": "attributions",
+}
+
+def figure_job(kind, model_name, **inputs):
+    """
+    Describes one figure to render.
+
+    Args:
+        kind: One of FIGURE_SUFFIXES.
+        model_name: Model the figure belongs to.
+        **inputs: Keyword arguments for the plot function (arrays, names).
+
+    Returns:
+        dict: Job for render_figures.
+    """
+    if kind not in FIGURE_SUFFIXES:
+        raise ValueError(f"Unknown figure kind: {kind}")
+    return {"kind": kind, "model_name": model_name, "inputs": inputs}
+
+def job_hash(job):
+    """
+    Content hash of a job's inputs, used to skip unchanged figures.
+    """
+    digest = hashlib.sha256(f"{RENDER_VERSION}:{job['kind']}:{job['model_name']}".encode())
+    for name in sorted(job["inputs"]):
+        values = np.ascontiguousarray(np.asarray(job["inputs"][name]))
+        digest.update(f"{name}:{values.dtype}:{values.shape}".encode())
+        digest.update(values.tobytes())
+    return digest.hexdigest()
+
+def _figure_path(job, project_root):
+    filename = f"{job['model_name']}_{FIGURE_SUFFIXES[job['kind']]}.png"
+    return os.path.join(project_root, "results", "figures", filename)
+
+def _render(job, project_root):
+    from src.reporting import plots
+
+    renderers = {
+        "predictions": plots.plot_predictions,
+        "residuals": plots.plot_residuals,
+        "residual_histogram": plots.plot_residual_histogram,
+        "importances": plots.plot_importances,
+        "attributions": plots.plot_attributions,
+    }
+    with _PYPLOT_LOCK:
+        return renderers[job["kind"]](model_name=job["model_name"], project_root=project_root, **job["inputs"])
+
+def _load_cache(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def cached_hashes(project_root):
+    """
+    Returns:
+        dict: Figure filename → content hash of its current rendering.
+    """
+    return _load_cache(os.path.join(project_root, "results", "figures", CACHE_FILENAME))
+
+def render_figures(jobs, project_root, n_workers=1, force=False):
+    """
+    Renders a batch of figures with the Agg backend, skipping figures whose
+    inputs are unchanged since they were last rendered.
+
+    Args:
+        jobs: List of figure_job dicts.
+        project_root: Project root; figures go to results/figures.
+        n_workers: Workers used to render.
+        force: Re-render every figure regardless of the cache.
+
+    Returns:
+        list: Figure path per job, in job order.
+    """
+    figure_dir = os.path.join(project_root, "results", "figures")
+    os.makedirs(figure_dir, exist_ok=True)
+    cache_path = os.path.join(figure_dir, CACHE_FILENAME)
+    cache = _load_cache(cache_path)
+
+    paths = [None] * len(jobs)
+    hashes = [job_hash(job) for job in jobs]
+    pending = []
+    for i, job in enumerate(jobs):
+        path = _figure_path(job, project_root)
+        if not force and cache.get(os.path.basename(path)) == hashes[i] and os.path.exists(path):
+            paths[i] = path
+        else:
+            pending.append(i)
+
+    with get_executor(min(n_workers, len(pending))) as executor:
+        for i, path in zip(pending, executor.map(_render, [(jobs[i], project_root) for i in pending])):
+            paths[i] = path
+
+    for i in pending:
+        cache[os.path.basename(paths[i])] = hashes[i]
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, cache_path)
+
+    logger.info(f"Rendered {len(pending)} figures, reused {len(jobs) - len(pending)} cached")
+    return paths
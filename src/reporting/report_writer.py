@@ -1,36 +1,124 @@
 import os
-import pandas as pd
-from datetime import datetime, UTC
-
-def generate_markdown_report(model_name, metrics, plot_paths, project_root):
-    report_dir = os.path.join(project_root, "results", "reports")
-    os.makedirs(report_dir, exist_ok=True)
-
-    timestamp = datetime.now(UTC).strftime("%Y-%m-%d_%H-%M-%S")
-    report_filename = f"{model_name}_report_{timestamp}.md"
-    report_path = os.path.join(report_dir, report_filename)
-
-    with open(report_path, "w") as f:
-        f.write(f"# {model_name.upper()} Model Report\n\n")
-        f.write(f"**Timestamp:** {timestamp}\n\n")
-        f.write("## Metrics\n")
-        for k, v in metrics.items():
-            f.write(f"- {k}: {v:.2f}\n")
-        f.write("\n## Plots\n")
-        for label, path in plot_paths.items():
-            rel_path = os.path.relpath(path, project_root)
-            f.write(f"![{label}]({rel_path})\n")
-
-    # Log to report manifest
-    manifest_path = os.path.join(report_dir, "report_manifest.csv")
-    log_entry = {
-        "timestamp": timestamp,
-        "model": model_name,
-        "report_file": report_filename,
-        **{k.lower(): round(v, 2) for k, v in metrics.items()}
-    }
-    df_log = pd.DataFrame([log_entry])
-    df_log.to_csv(manifest_path, mode="a" if os.path.exists(manifest_path) else "w",
-                  header=not os.path.exists(manifest_path), index=False)
-
-    return report_path
+from string import Template
+
+from src.reporting.render import cached_hashes
+
+REPORT_FILENAME = "run_report.md"
+
+# Metrics where larger is better; for Bias the smallest magnitude wins
+MAXIMIZED_METRICS = {"r2"}
+METRIC_ORDER = ["mae", "rmse", "r2", "bias"]
+
+REPORT_TEMPLATE = Template("""\
+# Run $run_id — Model Comparison
+
+**Started (UTC):** $started_at
+**Finished (UTC):** $finished_at
+**Status:** $status
+**Weather data:** $weather_file
+**Signal data:** $signal_file
+
+## Metrics
+$metrics_table
+
+## Stage Timings
+$stage_table
+
+## Figures
+$figures
+""")
+
+def _format_value(value):
+    return f"{value:.4f}" if isinstance(value, float) else str(value)
+
+def _metrics_table(metrics):
+    if not metrics:
+        return "_No metrics recorded._"
+    names = {name.lower() for model_metrics in metrics.values() for name in model_metrics}
+    columns = [m for m in METRIC_ORDER if m in names] + sorted(names - set(METRIC_ORDER))
+    lowered = {model: {k.lower(): v for k, v in values.items()} for model, values in metrics.items()}
+
+    # Every model that ties for the best value is bolded
+    best = {}
+    for column in columns:
+        values = {model: v[column] for model, v in lowered.items() if column in v}
+        if column in MAXIMIZED_METRICS:
+            target = max(values.values())
+        elif column == "bias":
+            values = {model: abs(value) for model, value in values.items()}
+            target = min(values.values())
+        else:
+            target = min(values.values())
+        best[column] = {model for model, value in values.items() if value == target}
+
+    lines = ["| Model | " + " | ".join(c.upper() for c in columns) + " |",
+             "|---|" + "---:|" * len(columns)]
+    for model in sorted(lowered):
+        cells = []
+        for column in columns:
+            value = lowered[model].get(column)
+            cell = "–" if value is None else _format_value(value)
+            cells.append(f"**{cell}**" if model in best[column] else cell)
+        lines.append(f"| {model.upper()} | " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+def _stage_table(stages):
+    if not stages:
+        return "_No stage timings recorded._"
+    lines = ["| Stage | Duration (s) |", "|---|---:|"]
+    lines += [f"| {stage} | {duration:.2f} |" for stage, duration in stages.items()]
+    lines.append(f"| **total** | **{sum(stages.values()):.2f}** |")
+    return "\n".join(lines)
+
+def _figure_section(figures, project_root):
+    if not figures:
+        return "_No figures recorded._"
+    current = cached_hashes(project_root)
+    lines = []
+    for model in sorted(figures):
+        lines.append(f"### {model.upper()}")
+        for label, (path, content_hash) in figures[model].items():
+            rel_path = os.path.relpath(path, project_root) if os.path.isabs(path) else path
+            lines.append(f"![{label}]({rel_path})")
+            if content_hash and current.get(os.path.basename(path)) != content_hash:
+                lines.append(f"_{label} has been re-rendered by a later run._")
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+def render_run_report(summary, project_root):
+    """
+    Renders the comparison report of one run.
+
+    Args:
+        summary: Run summary as returned by run_store.run_summary (or built
+            in memory with the same keys).
+        project_root: Project root, used for relative figure links.
+
+    Returns:
+        str: Markdown report.
+    """
+    return REPORT_TEMPLATE.substitute(
+        run_id=summary["run_id"],
+        started_at=summary.get("started_at") or "–",
+        finished_at=summary.get("finished_at") or "–",
+        status=summary.get("status") or "–",
+        weather_file=summary.get("weather_file") or "–",
+        signal_file=summary.get("signal_file") or "–",
+        metrics_table=_metrics_table(summary.get("metrics", {})),
+        stage_table=_stage_table(summary.get("stages", {})),
+        figures=_figure_section(summary.get("figures", {}), project_root),
+    )
+
+def write_run_report(summary, project_root, path=None):
+    """
+    Writes the comparison report, by default to results/reports/run_report.md.
+    Older runs are regenerated from the run store rather than kept as files.
+
+    Returns:
+        str: Report path.
+    """
+    path = path or os.path.join(project_root, "results", "reports", REPORT_FILENAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(render_run_report(summary, project_root))
+    return path
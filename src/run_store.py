@@ -0,0 +1,380 @@
+import os
+import re
+import csv
+import time
+from contextlib import contextmanager
+from datetime import datetime, UTC
+import pandas as pd
+
+from src.utils.logger import get_logger
+from src.utils.db import connect_sqlite, write_transaction
+
+logger = get_logger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Markdown image link, as written by the legacy per-model reports
+FIGURE_LINK = re.compile(r"^!\[(?P<label>[^\]]*)\]\((?P<path>[^)]+)\)\s*$", re.MULTILINE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL DEFAULT 'running',
+    weather_file TEXT,
+    signal_file TEXT,
+    source TEXT NOT NULL DEFAULT 'pipeline'
+);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    stage TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    duration_s REAL NOT NULL,
+    PRIMARY KEY (run_id, stage)
+);
+CREATE TABLE IF NOT EXISTS models (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    model TEXT NOT NULL,
+    report_file TEXT,
+    PRIMARY KEY (run_id, model)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, model, metric),
+    FOREIGN KEY (run_id, model) REFERENCES models(run_id, model)
+);
+CREATE TABLE IF NOT EXISTS figures (
+    run_id INTEGER NOT NULL REFERENCES runs(run_id),
+    model TEXT NOT NULL,
+    label TEXT NOT NULL,
+    path TEXT NOT NULL,
+    content_hash TEXT,
+    PRIMARY KEY (run_id, model, label)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_runs_started_at ON runs(started_at);
+CREATE INDEX IF NOT EXISTS idx_metrics_metric_model ON metrics(metric, model, value);
+"""
+
+def _now():
+    return datetime.now(UTC).strftime(TIMESTAMP_FORMAT)
+
+def default_store_path(project_root):
+    return os.path.join(project_root, "results", "run_history.sqlite")
+
+def connect(db_path):
+    """
+    Opens the run-history store, creating the schema if needed.
+
+    Args:
+        db_path: SQLite file path.
+
+    Returns:
+        sqlite3.Connection: Open connection. Use one connection per process.
+    """
+    conn = connect_sqlite(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+def start_run(conn, weather_file=None, signal_file=None, started_at=None, source="pipeline"):
+    """
+    Registers a new run.
+
+    Returns:
+        int: run_id.
+    """
+    with write_transaction(conn):
+        cursor = conn.execute(
+            "INSERT INTO runs (started_at, weather_file, signal_file, source) VALUES (?, ?, ?, ?)",
+            (started_at or _now(), weather_file, signal_file, source),
+        )
+    return cursor.lastrowid
+
+def update_run(conn, run_id, **fields):
+    """
+    Updates weather_file, signal_file or status of a run.
+    """
+    allowed = {"weather_file", "signal_file", "status"}
+    unknown = set(fields) - allowed
+    if unknown:
+        raise ValueError(f"Cannot update run fields: {unknown}")
+    if not fields:
+        return
+    assignments = ", ".join(f"{name} = ?" for name in fields)
+    with write_transaction(conn):
+        conn.execute(f"UPDATE runs SET {assignments} WHERE run_id = ?", (*fields.values(), run_id))
+
+def finish_run(conn, run_id, status="completed"):
+    with write_transaction(conn):
+        conn.execute("UPDATE runs SET finished_at = ?, status = ? WHERE run_id = ?", (_now(), status, run_id))
+
+def record_stage(conn, run_id, stage_name, duration_s, started_at=None):
+    with write_transaction(conn):
+        conn.execute(
+            "INSERT OR REPLACE INTO stages (run_id, stage, started_at, duration_s) VALUES (?, ?, ?, ?)",
+            (run_id, stage_name, started_at or _now(), duration_s),
+        )
+
+@contextmanager
+def stage(conn, run_id, stage_name, timings=None):
+    """
+    Times a pipeline stage and records its duration, also into the optional
+    ``timings`` dict (stage name → seconds).
+    """
+    started_at = _now()
+    start = time.perf_counter()
+    yield
+    duration = time.perf_counter() - start
+    record_stage(conn, run_id, stage_name, duration, started_at)
+    if timings is not None:
+        timings[stage_name] = duration
+
+def record_model(conn, run_id, model_name, metrics, report_file=None):
+    """
+    Stores the metrics of one model in a run. Metric names are lower-cased.
+
+    Args:
+        conn: Store connection.
+        run_id: Run identifier.
+        model_name: Model key.
+        metrics: Dict of metric name → value.
+        report_file: Optional report filename.
+    """
+    with write_transaction(conn):
+        conn.execute(
+            "INSERT INTO models (run_id, model, report_file) VALUES (?, ?, ?) "
+            "ON CONFLICT (run_id, model) DO UPDATE SET report_file = COALESCE(excluded.report_file, report_file)",
+            (run_id, model_name, report_file),
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO metrics (run_id, model, metric, value) VALUES (?, ?, ?, ?)",
+            [(run_id, model_name, k.lower(), float(v)) for k, v in metrics.items()],
+        )
+
+def record_figures(conn, run_id, figures):
+    """
+    Stores the figures rendered for a run.
+
+    Args:
+        conn: Store connection.
+        run_id: Run identifier.
+        figures: Dict of model → {label: (path, content hash)}.
+    """
+    with write_transaction(conn):
+        conn.executemany(
+            "INSERT OR REPLACE INTO figures (run_id, model, label, path, content_hash) VALUES (?, ?, ?, ?, ?)",
+            [(run_id, model, label, path, content_hash)
+             for model, entries in figures.items() for label, (path, content_hash) in entries.items()],
+        )
+
+def run_info(conn, run_id):
+    """
+    Returns:
+        dict: Row of the runs table, or None for an unknown run.
+    """
+    cursor = conn.execute("SELECT * FROM runs WHERE run_id = ?", (run_id,))
+    row = cursor.fetchone()
+    return dict(zip([c[0] for c in cursor.description], row)) if row else None
+
+def run_summary(conn, run_id):
+    """
+    Everything the run report needs, read back from the store.
+
+    Returns:
+        dict: Run row plus "metrics" (model → {metric: value}), "stages"
+        (stage → seconds) and "figures" (model → {label: (path, hash)}).
+    """
+    summary = run_info(conn, run_id)
+    if summary is None:
+        raise ValueError(f"Unknown run: {run_id}")
+    summary["metrics"] = {}
+    for model, metric, value in conn.execute(
+        "SELECT model, metric, value FROM metrics WHERE run_id = ? ORDER BY model", (run_id,)
+    ):
+        summary["metrics"].setdefault(model, {})[metric] = value
+    summary["stages"] = dict(conn.execute(
+        "SELECT stage, duration_s FROM stages WHERE run_id = ? ORDER BY rowid", (run_id,)
+    ).fetchall())
+    summary["figures"] = {}
+    for model, label, path, content_hash in conn.execute(
+        "SELECT model, label, path, content_hash FROM figures WHERE run_id = ? ORDER BY model, label", (run_id,)
+    ):
+        summary["figures"].setdefault(model, {})[label] = (path, content_hash)
+    return summary
+
+def latest_run_id(conn):
+    row = conn.execute("SELECT MAX(run_id) FROM runs").fetchone()
+    return row[0]
+
+def run_metrics(conn, run_id):
+    """
+    Returns:
+        pd.DataFrame: One row per model with a column per metric.
+    """
+    df = pd.read_sql_query(
+        "SELECT model, metric, value FROM metrics WHERE run_id = ?", conn, params=(run_id,)
+    )
+    return df.pivot(index="model", columns="metric", values="value").reset_index().rename_axis(columns=None)
+
+def run_stages(conn, run_id):
+    return pd.read_sql_query(
+        "SELECT stage, started_at, duration_s FROM stages WHERE run_id = ? ORDER BY rowid",
+        conn, params=(run_id,)
+    )
+
+def best_metric_per_model(conn, metric="rmse", last_n_runs=10, minimize=True):
+    """
+    Best value of a metric for every model over the most recent runs.
+
+    Args:
+        conn: Store connection.
+        metric: Metric name (lower case).
+        last_n_runs: Number of most recent runs to consider.
+        minimize: Whether lower is better.
+
+    Returns:
+        pd.DataFrame: model, value and the run_id that achieved it.
+    """
+    aggregate = "MIN" if minimize else "MAX"
+    query = f"""
+        WITH recent AS (
+            SELECT run_id FROM runs ORDER BY started_at DESC, run_id DESC LIMIT ?
+        ),
+        scoped AS (
+            SELECT m.run_id, m.model, m.value FROM metrics m
+            JOIN recent r ON r.run_id = m.run_id
+            WHERE m.metric = ?
+        ),
+        best AS (
+            SELECT model, {aggregate}(value) AS value FROM scoped GROUP BY model
+        )
+        SELECT b.model, b.value, MAX(s.run_id) AS run_id
+        FROM best b JOIN scoped s ON s.model = b.model AND s.value = b.value
+        GROUP BY b.model, b.value
+        ORDER BY b.value {"ASC" if minimize else "DESC"}
+    """
+    return pd.read_sql_query(query, conn, params=(last_n_runs, metric.lower()))
+
+def _parse_timestamp(value):
+    for fmt in (TIMESTAMP_FORMAT, "%Y-%m-%d_%H-%M-%S"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Unrecognized timestamp: {value}")
+
+def _report_figures(report_path):
+    """
+    Figure links of a legacy per-model report, {label: (path, None)}; empty
+    when the report file is gone.
+    """
+    try:
+        with open(report_path) as f:
+            text = f.read()
+    except FileNotFoundError:
+        return {}
+    return {match["label"]: (match["path"], None) for match in FIGURE_LINK.finditer(text)}
+
+def import_csv_manifests(conn, run_log_path=None, report_manifest_path=None, match_window_s=600):
+    """
+    One-time import of the legacy run_log.csv and report_manifest.csv files.
+
+    run_log.csv rows are grouped into runs: a run continues while the input
+    files are unchanged and no model repeats. Rows whose header drifted
+    (no model columns) become runs without metrics. report_manifest.csv rows
+    are attached to the imported model with the closest timestamp, or
+    imported as their own run when nothing matches; the figures linked from
+    their report files (next to the manifest) are recorded for that run, so
+    the per-model reports can be deleted afterwards.
+
+    Args:
+        conn: Store connection.
+        run_log_path: Path to run_log.csv.
+        report_manifest_path: Path to report_manifest.csv.
+        match_window_s: Maximum time difference for matching a report to a run.
+
+    Returns:
+        int: Number of runs imported; 0 if the import already happened.
+    """
+    if conn.execute("SELECT value FROM meta WHERE key = 'csv_imported'").fetchone():
+        logger.info("Legacy CSV manifests already imported.")
+        return 0
+
+    runs = []
+    if run_log_path and os.path.exists(run_log_path):
+        with open(run_log_path, newline="") as f:
+            rows = list(csv.reader(f))[1:]
+        current = None
+        for row in rows:
+            if not row:
+                continue
+            timestamp, weather_file, signal_file = row[:3]
+            model = row[3] if len(row) > 3 else None
+            metrics = dict(zip(("mae", "rmse", "r2"), map(float, row[4:7]))) if len(row) > 4 else {}
+            same_run = (
+                current is not None and model is not None
+                and current["files"] == (weather_file, signal_file)
+                and model not in current["models"]
+            )
+            if not same_run:
+                current = {"started_at": timestamp, "files": (weather_file, signal_file), "models": {}}
+                runs.append(current)
+            if model is not None:
+                current["models"][model] = {"metrics": metrics, "timestamp": timestamp, "report_file": None}
+
+    reports = []
+    if report_manifest_path and os.path.exists(report_manifest_path):
+        reports = pd.read_csv(report_manifest_path).to_dict("records")
+
+    for report in reports:
+        report_time = _parse_timestamp(report["timestamp"])
+        candidates = [
+            (abs((_parse_timestamp(entry["timestamp"]) - report_time).total_seconds()), entry)
+            for run in runs for model, entry in run["models"].items()
+            if model == report["model"] and entry["report_file"] is None
+        ]
+        candidates = [c for c in candidates if c[0] <= match_window_s]
+        if candidates:
+            min(candidates, key=lambda c: c[0])[1]["report_file"] = report["report_file"]
+        else:
+            metrics = {k: report[k] for k in ("mae", "rmse", "r2") if k in report}
+            runs.append({
+                "started_at": _parse_timestamp(report["timestamp"]).strftime(TIMESTAMP_FORMAT),
+                "files": (None, None),
+                "models": {report["model"]: {"metrics": metrics, "timestamp": report["timestamp"],
+                                             "report_file": report["report_file"]}},
+            })
+
+    with write_transaction(conn):
+        for run in runs:
+            cursor = conn.execute(
+                "INSERT INTO runs (started_at, finished_at, status, weather_file, signal_file, source) "
+                "VALUES (?, ?, 'completed', ?, ?, 'import')",
+                (run["started_at"], run["started_at"], *run["files"]),
+            )
+            for model, entry in run["models"].items():
+                conn.execute("INSERT INTO models (run_id, model, report_file) VALUES (?, ?, ?)",
+                             (cursor.lastrowid, model, entry["report_file"]))
+                conn.executemany(
+                    "INSERT INTO metrics (run_id, model, metric, value) VALUES (?, ?, ?, ?)",
+                    [(cursor.lastrowid, model, k, float(v)) for k, v in entry["metrics"].items()],
+                )
+                if entry["report_file"]:
+                    figures = _report_figures(os.path.join(os.path.dirname(report_manifest_path),
+                                                           entry["report_file"]))
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO figures (run_id, model, label, path, content_hash) "
+                        "VALUES (?, ?, ?, ?, NULL)",
+                        [(cursor.lastrowid, model, label, path) for label, (path, _) in figures.items()],
+                    )
+        conn.execute("INSERT INTO meta (key, value) VALUES ('csv_imported', ?)", (_now(),))
+
+    logger.info(f"Imported {len(runs)} runs from legacy CSV manifests")
+    return len(runs)
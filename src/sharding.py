@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.utils.logger import get_logger
+from src.models import get_model
+from src.preprocessing import preprocess
+from src.executor import attach, get_executor
+from src.streaming_metrics import StreamingMetrics, score_in_chunks
+
+logger = get_logger(__name__)
+
+# Shards with fewer training rows are served by the global fallback model
+MIN_SHARD_ROWS = 50
+
+# Per-location weather means used to group sites into climate clusters
+CLIMATE_COLUMNS = [
+    "temperature_celsius",
+    "relative_humidity_2m",
+    "cloudcover",
+    "windspeed_10m",
+    "pressure_msl",
+    "precipitation",
+    "rain",
+]
+
+FALLBACK = "__global__"
+
+def climate_clusters(df, n_clusters=4, seed=42):
+    """
+    Groups locations with similar climate using KMeans on standardized
+    per-location weather means.
+
+    Args:
+        df: Preprocessed DataFrame with a location column.
+        n_clusters: Number of clusters (capped at the number of locations).
+        seed: KMeans random state.
+
+    Returns:
+        dict: Location → cluster label ("cluster_<k>").
+    """
+    from sklearn.cluster import KMeans
+
+    columns = [c for c in CLIMATE_COLUMNS if c in df.columns]
+    profile = df.groupby("location")[columns].mean()
+    profile = profile.fillna(profile.mean()).fillna(0.0)
+    scaled = (profile - profile.mean()) / profile.std(ddof=0).replace(0, 1)
+    n_clusters = min(n_clusters, len(profile))
+    labels = KMeans(n_clusters=n_clusters, n_init=10, random_state=seed).fit_predict(scaled)
+    return {location: f"cluster_{label}" for location, label in zip(profile.index, labels)}
+
+class ShardedModel:
+    """
+    One fitted model per shard plus a global fallback.
+
+    predict() expects the feature columns and a location column; rows are
+    routed to their shard's model and unseen or untrained locations fall
+    back to the global model.
+    """
+
+    def __init__(self, feature_names, shard_of, models, fallback):
+        self.feature_names = list(feature_names)
+        self.shard_of = dict(shard_of)
+        self.models = dict(models)
+        self.fallback = fallback
+
+    def route(self, locations):
+        """
+        Returns:
+            np.ndarray: Shard name per row, FALLBACK where no shard model exists.
+        """
+        shards = pd.Series(locations).map(self.shard_of)
+        return shards.where(shards.isin(list(self.models)), FALLBACK).to_numpy()
+
+    def predict(self, X):
+        features = X[self.feature_names].to_numpy(dtype=float)
+        shards = self.route(X["location"].to_numpy())
+        y_pred = np.empty(len(X))
+        for shard in np.unique(shards):
+            rows = shards == shard
+            model = self.models.get(shard, self.fallback)
+            y_pred[rows] = model.predict(features[rows])
+        return y_pred
+
+def _fit_shard(shared, model_name, rows):
+    arrays = attach(shared)
+    rows = slice(None) if rows is None else rows
+    model = get_model(model_name)
+    model.fit(np.asarray(arrays["X"][rows]), np.asarray(arrays["y"][rows]))
+    return model
+
+def train_sharded(X, y, locations, model_name, shard_of, n_workers=1, min_rows=MIN_SHARD_ROWS):
+    """
+    Trains one model per shard and a global fallback, in parallel.
+
+    The training matrix is scattered once on the configured executor;
+    every task attaches to it and fits on its own row subset.
+
+    Args:
+        X: Numeric feature DataFrame (target excluded).
+        y: Target values.
+        locations: Location per row.
+        model_name: Model key understood by get_model.
+        shard_of: Dict of location → shard name.
+        n_workers: Workers.
+        min_rows: Minimum training rows for a dedicated shard model.
+
+    Returns:
+        ShardedModel: Fitted router.
+    """
+    shards = pd.Series(np.asarray(locations)).map(shard_of).to_numpy()
+    tasks = {FALLBACK: None}
+    for shard in pd.unique(shards[pd.notna(shards)]):
+        rows = np.flatnonzero(shards == shard)
+        if len(rows) >= min_rows:
+            tasks[shard] = rows
+        else:
+            logger.info(f"Shard {shard} has {len(rows)} rows; using the global model")
+
+    with get_executor(min(n_workers, len(tasks))) as executor:
+        shared = executor.scatter({"X": X.to_numpy(dtype=float), "y": np.asarray(y, dtype=float)})
+        try:
+            fitted = executor.map(_fit_shard, [(shared, model_name, rows) for rows in tasks.values()])
+            models = dict(zip(tasks, fitted))
+        finally:
+            executor.release(shared)
+
+    fallback = models.pop(FALLBACK)
+    logger.info(f"Trained {len(models)} {model_name} shards plus a global fallback")
+    return ShardedModel(X.columns, shard_of, models, fallback)
+
+def evaluate_sharded(df, model_name, target_column="signal_dbm", shard_by="location",
+                     n_clusters=4, n_workers=1, chunk_size=100_000):
+    """
+    Sharded counterpart of evaluation.evaluate.
+
+    Args:
+        df: Simulated signal DataFrame.
+        model_name: Model key understood by get_model.
+        target_column: Name of the target column.
+        shard_by: "location" or "cluster".
+        n_clusters: Number of climate clusters when shard_by="cluster".
+        n_workers: Workers for shard training.
+        chunk_size: Rows per predict call when scoring.
+
+    Returns:
+        tuple: (metrics, StreamingMetrics, per-shard StreamingMetrics dict).
+    """
+    if shard_by not in ("location", "cluster"):
+        raise ValueError(f"Unknown shard mode: {shard_by}")
+
+    df = preprocess(df, save=False, preserve_nulls=model_name in ["xgb", "stack"])
+    X = df.select_dtypes(include=["number"]).drop(columns=[target_column])
+    y = df[target_column]
+
+    if shard_by == "location":
+        shard_of = {location: location for location in df["location"].unique()}
+    else:
+        shard_of = climate_clusters(df, n_clusters)
+
+    X_train, X_test, y_train, y_test, loc_train, loc_test = train_test_split(
+        X, y, df["location"], test_size=0.2, random_state=42
+    )
+    model = train_sharded(X_train, y_train, loc_train, model_name, shard_of, n_workers=n_workers)
+
+    # Score every shard separately and merge into the overall metrics
+    X_test = X_test.assign(location=loc_test.to_numpy())
+    routed = model.route(loc_test.to_numpy())
+    per_shard = {}
+    scores = StreamingMetrics(seed=42)
+    for i, shard in enumerate(np.unique(routed)):
+        rows = routed == shard
+        per_shard[shard] = score_in_chunks(model, X_test[rows], y_test[rows], chunk_size=chunk_size,
+                                           metrics=StreamingMetrics(seed=i))
+        scores.merge(per_shard[shard])
+    return scores.result(), scores, per_shard
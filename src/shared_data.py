@@ -0,0 +1,138 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def share_arrays(arrays, directory=None):
+    """
+    Writes arrays to memory-mappable .npy files so worker processes can
+    attach to them without receiving a pickled copy.
+
+    Args:
+        arrays: Dict of name → np.ndarray.
+        directory: Target directory. A temporary directory is created if None.
+
+    Returns:
+        dict: Picklable handle to pass to attach_arrays.
+    """
+    directory = directory or tempfile.mkdtemp(prefix="signal_shared_")
+    os.makedirs(directory, exist_ok=True)
+    files = {}
+    for name, values in arrays.items():
+        path = os.path.join(directory, f"{name}.npy")
+        np.save(path, np.ascontiguousarray(values))
+        files[name] = path
+    return {"directory": directory, "arrays": files}
+
+def attach_arrays(handle):
+    """
+    Opens shared arrays as read-only memory maps.
+
+    Args:
+        handle: Handle returned by share_arrays.
+
+    Returns:
+        dict: Name → read-only np.memmap.
+    """
+    return {name: np.load(path, mmap_mode="r") for name, path in handle["arrays"].items()}
+
+def share_frame(df, directory=None):
+    """
+    Stores a DataFrame as memory-mapped column blocks.
+
+    Numeric columns are grouped by dtype into one (columns, rows) block each,
+    datetimes are stored as int64 nanoseconds and every other column is
+    stored as categorical codes. The index is not preserved.
+
+    Args:
+        df: DataFrame to share.
+        directory: Target directory. A temporary directory is created if None.
+
+    Returns:
+        dict: Picklable handle to pass to attach_frame.
+    """
+    arrays = {}
+    blocks = []
+    datetimes = []
+    categoricals = {}
+
+    numeric = df.select_dtypes(include=["number", "bool"])
+    for dtype, columns in numeric.columns.groupby(numeric.dtypes).items():
+        name = f"block_{len(blocks)}"
+        arrays[name] = numeric[list(columns)].to_numpy(dtype=dtype).T
+        blocks.append({"name": name, "columns": list(columns)})
+
+    for column in df.columns.difference(numeric.columns, sort=False):
+        if pd.api.types.is_datetime64_any_dtype(df[column]):
+            name = f"datetime_{len(datetimes)}"
+            tz = df[column].dt.tz
+            values = df[column].dt.tz_convert("UTC").dt.tz_localize(None) if tz else df[column]
+            arrays[name] = values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            datetimes.append({"name": name, "column": column, "tz": str(tz) if tz else None})
+        else:
+            codes, categories = pd.factorize(df[column])
+            name = f"codes_{len(categoricals)}"
+            arrays[name] = codes
+            categoricals[column] = {"name": name, "categories": categories.tolist()}
+
+    handle = share_arrays(arrays, directory)
+    handle.update({
+        "columns": df.columns.tolist(),
+        "blocks": blocks,
+        "datetimes": datetimes,
+        "categoricals": categoricals,
+        "n_rows": len(df),
+    })
+    logger.info(f"Shared {len(df)} rows x {df.shape[1]} columns in {handle['directory']}")
+    return handle
+
+def attach_frame(handle):
+    """
+    Rebuilds a shared DataFrame on top of the memory-mapped blocks.
+
+    Numeric columns are zero-copy views of the files; new columns can be
+    assigned freely, but numeric values must not be modified in place.
+    Reordering columns would copy the blocks, so numeric columns come first,
+    grouped by dtype, followed by datetime and other columns.
+
+    Args:
+        handle: Handle returned by share_frame.
+
+    Returns:
+        pd.DataFrame: Frame with the shared columns.
+    """
+    arrays = attach_arrays(handle)
+    parts = [
+        pd.DataFrame(arrays[block["name"]].T, columns=block["columns"], copy=False)
+        for block in handle["blocks"]
+    ]
+
+    others = pd.DataFrame(index=pd.RangeIndex(handle["n_rows"]))
+    for entry in handle["datetimes"]:
+        values = pd.to_datetime(np.asarray(arrays[entry["name"]]).view("datetime64[ns]"))
+        if entry["tz"]:
+            values = values.tz_localize("UTC").tz_convert(entry["tz"])
+        others[entry["column"]] = values
+    for column, entry in handle["categoricals"].items():
+        categories = np.asarray(entry["categories"] + [None], dtype=object)
+        others[column] = categories[np.asarray(arrays[entry["name"]])]
+    if len(others.columns) or not parts:
+        parts.append(others)
+
+    # Blocks have distinct dtypes, so concatenating them does not consolidate
+    # (and copy) the memory-mapped values
+    return pd.concat(parts, axis=1, copy=False)
+
+def release(handle):
+    """
+    Removes the files behind a shared handle.
+
+    Args:
+        handle: Handle returned by share_arrays or share_frame.
+    """
+    shutil.rmtree(handle["directory"], ignore_errors=True)
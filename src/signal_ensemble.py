@@ -0,0 +1,251 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+from src.executor import attach, get_executor
+from src.signal_simulation import (
+    extract_weather_arrays,
+    compute_attenuation,
+    compute_noise_std,
+    location_bias_offsets,
+    LOCATION_BIAS_STD,
+    SIGNAL_FLOOR,
+    SIGNAL_CEILING,
+    SIGNAL_STEP,
+    INTERFERENCE_PROBABILITY,
+    INTERFERENCE_RANGE,
+)
+
+logger = get_logger(__name__)
+
+# Upper bound on rows × realizations held in memory at once
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+# Number of quantized signal levels between SIGNAL_FLOOR and SIGNAL_CEILING
+N_LEVELS = int(round((SIGNAL_CEILING - SIGNAL_FLOOR) / SIGNAL_STEP)) + 1
+
+def _quantile_label(q):
+    return f"signal_q{q * 100:g}"
+
+def _resolve_chunk_size(chunk_size, n_realizations):
+    if chunk_size is None:
+        chunk_size = max(1, MAX_BLOCK_ELEMENTS // n_realizations)
+    return int(chunk_size)
+
+def prepare_ensemble_inputs(df, base_dbm=-70.0):
+    """
+    Computes the deterministic part of the simulation once per row.
+
+    Args:
+        df: Weather DataFrame.
+        base_dbm: Clear-sky signal level.
+
+    Returns:
+        tuple: (mean signal before noise, noise standard deviation), both per row.
+    """
+    weather = extract_weather_arrays(df)
+    bias = location_bias_offsets(df)
+    center = base_dbm - compute_attenuation(weather) + bias
+    noise_std = compute_noise_std(weather)
+    noise_std = np.sqrt(noise_std ** 2 + np.where(bias != 0, LOCATION_BIAS_STD ** 2, 0.0))
+    return center, noise_std
+
+def draw_realizations(center, noise_std, n_realizations, rng):
+    """
+    Draws a (rows, n_realizations) block of quantized signal values.
+
+    Args:
+        center: Mean signal per row before noise.
+        noise_std: Gaussian noise standard deviation per row.
+        n_realizations: Realizations per row.
+        rng: numpy Generator.
+
+    Returns:
+        np.ndarray: Signal values (dBm) clipped to the receiver range and
+        quantized to SIGNAL_STEP.
+    """
+    shape = (len(center), n_realizations)
+    signal = center[:, None] + rng.standard_normal(shape) * noise_std[:, None]
+
+    # Intermittent interference events
+    interference = rng.random(shape) < INTERFERENCE_PROBABILITY
+    n_events = int(interference.sum())
+    if n_events:
+        signal[interference] += rng.uniform(*INTERFERENCE_RANGE, n_events)
+
+    np.clip(signal, SIGNAL_FLOOR, SIGNAL_CEILING, out=signal)
+    return np.round(signal / SIGNAL_STEP) * SIGNAL_STEP
+
+def _run_chunks(task, arrays, chunk_size, seed, n_workers, *args):
+    """
+    Applies ``task`` to consecutive row chunks of ``arrays`` on the
+    configured executor (see src.executor).
+
+    Every chunk gets its own child seed, so results do not depend on the
+    number of workers or the backend. The arrays are scattered once and
+    every task attaches to them.
+    """
+    n_rows = len(next(iter(arrays.values())))
+    bounds = [(start, min(start + chunk_size, n_rows)) for start in range(0, n_rows, chunk_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds))
+
+    with get_executor(n_workers if len(bounds) > 1 else 1) as executor:
+        shared = executor.scatter(arrays)
+        try:
+            return list(executor.map(_run_attached, [(task, shared, start, stop, child, *args)
+                                                     for (start, stop), child in zip(bounds, seeds)]))
+        finally:
+            executor.release(shared)
+
+def _run_attached(task, shared, *args):
+    return task(attach(shared), *args)
+
+def _row_stats_task(arrays, start, stop, seed, n_realizations, quantiles, outage_threshold):
+    rng = np.random.default_rng(seed)
+    block = draw_realizations(arrays["center"][start:stop], arrays["noise_std"][start:stop], n_realizations, rng)
+    quantile_values = np.quantile(block, quantiles, axis=1) if len(quantiles) else np.empty((0, stop - start))
+    return block.mean(axis=1), block.std(axis=1), quantile_values, (block < outage_threshold).mean(axis=1)
+
+def simulate_signal_ensemble(df, n_realizations=500, base_dbm=-70.0, quantiles=(0.01, 0.05, 0.5),
+                             outage_threshold=-90.0, chunk_size=None, seed=42, n_workers=1):
+    """
+    Runs a Monte Carlo ensemble of the signal simulation and reduces it per row.
+
+    Realizations are drawn in batched (chunk, n_realizations) blocks and
+    reduced immediately, so the full ensemble is never materialized.
+
+    Args:
+        df: Weather DataFrame.
+        n_realizations: Number of noisy realizations per row.
+        base_dbm: Clear-sky signal level.
+        quantiles: Quantiles to report per row.
+        outage_threshold: Signal level (dBm) below which the link is in outage.
+        chunk_size: Rows per batch. Defaults to a size bounded by MAX_BLOCK_ELEMENTS.
+        seed: Seed for the random generator.
+        n_workers: Workers used to simulate chunks (executor setting picks the backend).
+
+    Returns:
+        pd.DataFrame: signal_mean, signal_std, one column per quantile and
+        outage_prob, indexed like ``df``.
+    """
+    center, noise_std = prepare_ensemble_inputs(df, base_dbm)
+    chunk_size = _resolve_chunk_size(chunk_size, n_realizations)
+    quantiles = list(quantiles)
+    chunks = _run_chunks(_row_stats_task, {"center": center, "noise_std": noise_std}, chunk_size, seed,
+                         n_workers, n_realizations, quantiles, outage_threshold)
+
+    means, stds, quantile_values, outage = (np.concatenate(parts, axis=-1) for parts in zip(*chunks))
+    result = pd.DataFrame({"signal_mean": means, "signal_std": stds}, index=df.index)
+    for q, values in zip(quantiles, quantile_values):
+        result[_quantile_label(q)] = values
+    result["outage_prob"] = outage
+    return result
+
+def group_codes(df, by):
+    """
+    Integer group code per row (-1 where a key is missing) and the unique
+    group keys. ``hour``, ``month`` and ``year`` are derived from the
+    timestamp when not present as columns.
+
+    Returns:
+        tuple: (codes array, DataFrame of group keys in code order).
+    """
+    keys = pd.DataFrame(index=df.index)
+    times = None
+    for column in by:
+        if column in df.columns:
+            keys[column] = df[column].to_numpy()
+            continue
+        if column not in ("hour", "month", "year"):
+            raise KeyError(f"Grouping column '{column}' not found.")
+        if times is None:
+            time_column = "timestamp" if "timestamp" in df.columns else "time"
+            times = pd.to_datetime(df[time_column], errors="coerce")
+        keys[column] = getattr(times.dt, column).to_numpy()
+
+    grouped = keys.groupby(by, sort=True)
+    codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    uniques = grouped.size().index.to_frame(index=False)
+    return codes, uniques
+
+def _histogram_quantile(cumulative, total, q):
+    # Index of the first level whose cumulative count reaches q * total
+    target = np.maximum(np.ceil(q * total), 1)[:, None]
+    return SIGNAL_FLOOR + SIGNAL_STEP * (cumulative < target).sum(axis=1)
+
+def histogram_summary(counts, quantiles=(0.01, 0.05, 0.5), outage_threshold=-90.0):
+    """
+    Reduces per-group histograms over the quantized signal levels.
+
+    Args:
+        counts: (groups, N_LEVELS) counts of each signal level.
+        quantiles: Quantiles to report per group.
+        outage_threshold: Signal level (dBm) below which the link is in outage.
+
+    Returns:
+        dict: n_samples, signal_mean, signal_std, one entry per quantile and
+        outage_prob, each an array with one value per group.
+    """
+    level_values = SIGNAL_FLOOR + SIGNAL_STEP * np.arange(N_LEVELS)
+    total = counts.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = counts @ level_values / total
+        variance = counts @ level_values ** 2 / total - mean ** 2
+        outage = counts[:, level_values < outage_threshold].sum(axis=1) / total
+    cumulative = np.cumsum(counts, axis=1)
+
+    summary = {"n_samples": total, "signal_mean": mean, "signal_std": np.sqrt(np.maximum(variance, 0))}
+    for q in quantiles:
+        summary[_quantile_label(q)] = _histogram_quantile(cumulative, total, q)
+    summary["outage_prob"] = outage
+    return summary
+
+def _group_counts_task(arrays, start, stop, seed, n_realizations, n_groups):
+    rng = np.random.default_rng(seed)
+    block = draw_realizations(arrays["center"][start:stop], arrays["noise_std"][start:stop], n_realizations, rng)
+    levels = np.rint((block - SIGNAL_FLOOR) / SIGNAL_STEP).astype(np.int64)
+    codes = np.asarray(arrays["codes"][start:stop])
+    bins = codes[:, None] * N_LEVELS + levels
+    return np.bincount(bins[codes >= 0].ravel(), minlength=n_groups * N_LEVELS)
+
+def summarize_signal_ensemble(df, by=("location", "month"), n_realizations=500, base_dbm=-70.0,
+                              quantiles=(0.01, 0.05, 0.5), outage_threshold=-90.0,
+                              chunk_size=None, seed=42, n_workers=1):
+    """
+    Runs a Monte Carlo ensemble and aggregates it over groups of rows.
+
+    Simulated values live on a fixed grid of N_LEVELS quantized levels, so
+    each group is reduced to a level histogram. Quantiles, moments and outage
+    probability are exact and memory stays at groups × N_LEVELS.
+
+    Args:
+        df: Weather DataFrame.
+        by: Grouping columns. ``hour``, ``month`` and ``year`` are derived
+            from the timestamp when not present as columns.
+        n_realizations: Number of noisy realizations per row.
+        base_dbm: Clear-sky signal level.
+        quantiles: Quantiles to report per group.
+        outage_threshold: Signal level (dBm) below which the link is in outage.
+        chunk_size: Rows per batch. Defaults to a size bounded by MAX_BLOCK_ELEMENTS.
+        seed: Seed for the random generator.
+        n_workers: Workers used to simulate chunks (executor setting picks the backend).
+
+    Returns:
+        pd.DataFrame: One row per group with n_samples, signal_mean,
+        signal_std, one column per quantile and outage_prob.
+    """
+    by = list(by)
+    codes, uniques = group_codes(df, by)
+    n_groups = len(uniques)
+    center, noise_std = prepare_ensemble_inputs(df, base_dbm)
+    chunk_size = _resolve_chunk_size(chunk_size, n_realizations)
+
+    arrays = {"center": center, "noise_std": noise_std, "codes": codes}
+    chunks = _run_chunks(_group_counts_task, arrays, chunk_size, seed, n_workers, n_realizations, n_groups)
+    counts = np.sum(chunks, axis=0).reshape(n_groups, N_LEVELS)
+
+    result = uniques
+    for name, values in histogram_summary(counts, quantiles, outage_threshold).items():
+        result[name] = values
+    logger.info(f"Summarized {n_realizations} realizations over {n_groups} groups")
+    return result
@@ -0,0 +1,462 @@
+import os
+import numpy as np
+import pandas as pd
+
+from src.utils.db import connect_sqlite, write_transaction
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+LEVELS = ("hour", "day", "month")
+
+# An hour whose mean signal is below this level (dBm) counts as an outage hour
+OUTAGE_DBM = -90.0
+
+# Quantile sketch: counts in fixed 0.5 dB bins from HISTOGRAM_MIN_DBM, values
+# outside the range fall in the end bins. Fixed bins merge exactly, so any
+# range of rollups gives the same quantiles as its raw rows, to within a bin.
+HISTOGRAM_MIN_DBM = -160.0
+BIN_WIDTH_DB = 0.5
+N_BINS = 300
+
+# Rollup histograms are stored sparsely as packed (bin, count) pairs
+HISTOGRAM_DTYPE = np.dtype([("bin", "<u2"), ("count", "<u4")])
+
+# Rows read per chunk by ingest_file, and rollups whose quantiles are
+# computed at once by queries (bounds the dense histogram block)
+CHUNK_SIZE = 500_000
+QUANTILE_BLOCK = 20_000
+
+ROLLUP_COLUMNS = ["location", "period_start", "n", "n_missing", "sum", "sum_sq", "min", "max",
+                  "hours", "outage_hours", "histogram"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    level TEXT NOT NULL,
+    source TEXT NOT NULL,
+    location TEXT NOT NULL,
+    period_start TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    n_missing INTEGER NOT NULL,
+    sum REAL NOT NULL,
+    sum_sq REAL NOT NULL,
+    min REAL,
+    max REAL,
+    hours INTEGER NOT NULL,
+    outage_hours INTEGER NOT NULL,
+    histogram BLOB NOT NULL,
+    PRIMARY KEY (level, source, location, period_start)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+def _quantile_label(q):
+    return f"signal_q{q * 100:g}"
+
+def _period_starts(times, level):
+    if level == "hour":
+        return times.dt.floor("h")
+    if level == "day":
+        return times.dt.floor("D")
+    return times.dt.to_period("M").dt.to_timestamp()
+
+def _format(times):
+    # Rollups share few distinct periods, so only those are formatted
+    codes, periods = pd.factorize(times)
+    return pd.Series(periods.strftime(TIMESTAMP_FORMAT).to_numpy()[codes], index=times.index)
+
+def _parents(period_starts, level):
+    """
+    Start of the ``level`` period each formatted period start falls in.
+    """
+    codes, periods = pd.factorize(period_starts)
+    parents = _period_starts(pd.Series(pd.to_datetime(periods, format=TIMESTAMP_FORMAT)), level)
+    return pd.Series(_format(parents).to_numpy()[codes], index=period_starts.index)
+
+def _bins(values):
+    return np.clip(((values - HISTOGRAM_MIN_DBM) // BIN_WIDTH_DB).astype(np.int64), 0, N_BINS - 1)
+
+def _sparse_histograms(groups, bins, counts, n_groups):
+    """
+    Packs (group, bin, count) entries into one histogram blob per group.
+    """
+    keys, inverse = np.unique(groups * N_BINS + bins, return_inverse=True)
+    entries = np.empty(len(keys), dtype=HISTOGRAM_DTYPE)
+    entries["bin"] = keys % N_BINS
+    entries["count"] = np.bincount(inverse, weights=counts, minlength=len(keys))
+    bounds = np.searchsorted(keys // N_BINS, np.arange(n_groups + 1)) * HISTOGRAM_DTYPE.itemsize
+    data = entries.tobytes()
+    return [data[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+def _histogram_entries(blobs):
+    """
+    Returns:
+        tuple: (row index, bin, count) arrays over all entries of ``blobs``.
+    """
+    sizes = np.fromiter((len(blob) for blob in blobs), dtype=np.int64, count=len(blobs))
+    entries = np.frombuffer(b"".join(blobs), dtype=HISTOGRAM_DTYPE)
+    rows = np.repeat(np.arange(len(blobs)), sizes // HISTOGRAM_DTYPE.itemsize)
+    return rows, entries["bin"].astype(np.int64), entries["count"].astype(np.int64)
+
+def _dense_histograms(blobs):
+    rows, bins, counts = _histogram_entries(blobs)
+    return np.bincount(rows * N_BINS + bins, weights=counts, minlength=len(blobs) * N_BINS).reshape(-1, N_BINS)
+
+def _histogram_quantiles(blobs, quantiles, lower, upper):
+    """
+    Quantiles from histogram blobs by interpolating within the bin holding
+    each rank, clamped to the rollup's exact min and max.
+
+    Returns:
+        np.ndarray: (len(quantiles), len(blobs)); NaN for empty rollups.
+    """
+    result = np.full((len(quantiles), len(blobs)), np.nan)
+    for start in range(0, len(blobs), QUANTILE_BLOCK):
+        stop = min(start + QUANTILE_BLOCK, len(blobs))
+        cumulative = _dense_histograms(blobs[start:stop]).cumsum(axis=1)
+        total = cumulative[:, -1]
+        rows = np.arange(stop - start)
+        for k, q in enumerate(quantiles):
+            rank = q * total
+            bin_index = np.minimum((cumulative < rank[:, None]).sum(axis=1), N_BINS - 1)
+            before = np.where(bin_index > 0, cumulative[rows, bin_index - 1], 0)
+            in_bin = cumulative[rows, bin_index] - before
+            fraction = np.divide(rank - before, in_bin, out=np.zeros(len(rows)), where=in_bin > 0)
+            values = HISTOGRAM_MIN_DBM + (bin_index + fraction) * BIN_WIDTH_DB
+            values = np.clip(values, lower[start:stop], upper[start:stop])
+            result[k, start:stop] = np.where(total > 0, values, np.nan)
+    return result
+
+def _flag_hours(rollups, outage_dbm):
+    # An hour counts once if it has values, and as an outage if its mean is low
+    has_values = rollups["n"] > 0
+    mean = rollups["sum"] / rollups["n"].where(has_values)
+    rollups["hours"] = has_values.astype(int)
+    rollups["outage_hours"] = (has_values & (mean < outage_dbm)).astype(int)
+    return rollups
+
+def _combine(rollups, keys, level, outage_dbm):
+    """
+    Merges rollup rows sharing ``keys`` into one rollup each. Hour rollups
+    re-derive their outage flag from the merged mean; coarser levels sum
+    the hours below them.
+    """
+    if rollups.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    groups = rollups.groupby(keys, sort=True)
+    merged = groups.agg(n=("n", "sum"), n_missing=("n_missing", "sum"), sum=("sum", "sum"),
+                        sum_sq=("sum_sq", "sum"), min=("min", "min"), max=("max", "max"),
+                        hours=("hours", "sum"), outage_hours=("outage_hours", "sum")).reset_index()
+    rows, bins, counts = _histogram_entries(rollups["histogram"].tolist())
+    merged["histogram"] = _sparse_histograms(groups.ngroup().to_numpy()[rows], bins, counts, len(merged))
+    return _flag_hours(merged, outage_dbm) if level == "hour" else merged
+
+def _period_end(period_start, level):
+    start = pd.Timestamp(period_start)
+    step = {"hour": pd.Timedelta(hours=1), "day": pd.Timedelta(days=1), "month": pd.DateOffset(months=1)}[level]
+    return (start + step).strftime(TIMESTAMP_FORMAT)
+
+def summarize(rollups, quantiles=()):
+    """
+    Turns rollup sums into count, missing, mean, std (sample), min, max,
+    hours, outage_hours and one column per quantile.
+
+    Args:
+        rollups: Rollup rows (as returned by SignalHistory.rollups).
+        quantiles: Quantiles estimated from the histograms.
+
+    Returns:
+        pd.DataFrame: One row per rollup, other columns kept in front.
+    """
+    n = rollups["n"].astype(float)
+    mean = rollups["sum"] / n.where(n > 0)
+    variance = (rollups["sum_sq"] - rollups["sum"] * mean) / (n - 1).where(n > 1)
+    result = rollups.drop(columns=["n", "n_missing", "sum", "sum_sq", "min", "max", "hours",
+                                   "outage_hours", "histogram"])
+    result = result.assign(count=rollups["n"].astype(int), missing=rollups["n_missing"].astype(int), mean=mean,
+                           std=np.sqrt(variance.clip(lower=0)), min=rollups["min"], max=rollups["max"],
+                           hours=rollups["hours"].astype(int), outage_hours=rollups["outage_hours"].astype(int))
+    if len(quantiles):
+        values = _histogram_quantiles(rollups["histogram"].tolist(), list(quantiles),
+                                      rollups["min"].to_numpy(dtype=float), rollups["max"].to_numpy(dtype=float))
+        for q, column in zip(quantiles, values):
+            result[_quantile_label(q)] = column
+    return result.reset_index(drop=True)
+
+def _time_column(df):
+    for column in ("timestamp", "time"):
+        if column in df.columns:
+            return column
+    raise ValueError("Signal data needs a 'timestamp' or 'time' column")
+
+def _hour_rollups(df, outage_dbm):
+    """
+    Hour rollups of raw rows with time, location and signal_dbm columns.
+    Rows with an unparseable time are skipped.
+    """
+    times = pd.to_datetime(df[_time_column(df)], errors="coerce")
+    if times.dt.tz is not None:
+        times = times.dt.tz_convert("UTC").dt.tz_localize(None)
+    locations = df["location"].astype(str) if "location" in df.columns else pd.Series("all", index=df.index)
+    value = pd.to_numeric(df["signal_dbm"], errors="coerce")
+    present = value.notna()
+    frame = pd.DataFrame({"location": locations, "period_start": _period_starts(times, "hour"),
+                          "n": present.astype(int), "n_missing": (~present).astype(int),
+                          "sum": value.fillna(0.0), "sum_sq": value.fillna(0.0) ** 2, "min": value, "max": value})
+    frame = frame[frame["period_start"].notna()]
+    if frame.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+    groups = frame.groupby(["location", "period_start"], sort=True)
+    rollups = groups.agg(n=("n", "sum"), n_missing=("n_missing", "sum"), sum=("sum", "sum"),
+                         sum_sq=("sum_sq", "sum"), min=("min", "min"), max=("max", "max")).reset_index()
+    ids = groups.ngroup().to_numpy()[frame["n"].to_numpy() > 0]
+    values = frame.loc[frame["n"] > 0, "min"].to_numpy()
+    rollups["histogram"] = _sparse_histograms(ids, _bins(values), np.ones(len(ids)), len(rollups))
+    rollups["period_start"] = _format(rollups["period_start"])
+    return _flag_hours(rollups, outage_dbm)
+
+def _range_segments(start, end):
+    """
+    Splits [start, end) into whole months, whole days and leftover hours,
+    so a range aggregate reads the fewest rollups.
+
+    Returns:
+        list: (level, start, end) tuples covering the range.
+    """
+    start, end = start.floor("h"), end.ceil("h")
+    first_day, last_day = start.ceil("D"), end.floor("D")
+    if first_day >= last_day:
+        segments = [("hour", start, end)]
+    else:
+        first_month = first_day.to_period("M").to_timestamp()
+        if first_month < first_day:
+            first_month = (first_day.to_period("M") + 1).to_timestamp()
+        last_month = last_day.to_period("M").to_timestamp()
+        if first_month >= last_month:
+            segments = [("hour", start, first_day), ("day", first_day, last_day), ("hour", last_day, end)]
+        else:
+            segments = [("hour", start, first_day), ("day", first_day, first_month),
+                        ("month", first_month, last_month), ("day", last_month, last_day),
+                        ("hour", last_day, end)]
+    return [(level, a, b) for level, a, b in segments if a < b]
+
+class SignalHistory:
+    """
+    Signal history kept as hour, day and month rollups per (source,
+    location) in SQLite: count, missing count, sum and sum of squares,
+    min, max, hours, outage hours and a 0.5 dB histogram for quantiles.
+
+    Ingesting new rows merges them into their hour rollups and re-derives
+    only the days and months those hours fall in, so the store is
+    maintained incrementally. Queries read rollups through the primary
+    key or period index and never touch raw rows.
+    """
+
+    def __init__(self, path, outage_dbm=OUTAGE_DBM):
+        self.path = path
+        self.conn = connect_sqlite(path)
+        self.conn.executescript(SCHEMA)
+        with write_transaction(self.conn):
+            self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('outage_dbm', ?)", (str(outage_dbm),))
+        self.outage_dbm = float(self.conn.execute("SELECT value FROM meta WHERE key = 'outage_dbm'").fetchone()[0])
+        if self.outage_dbm != outage_dbm:
+            raise ValueError(f"{path} keeps outage hours below {self.outage_dbm} dBm, not {outage_dbm}")
+
+    @classmethod
+    def for_project(cls, project_root=None):
+        """
+        History at the history_path setting, relative to ``project_root``
+        (defaults to the configured project root).
+        """
+        from src.utils.settings import get_settings
+
+        settings = get_settings()
+        return cls(os.path.join(project_root or settings.project_root, settings.history_path))
+
+    def _select(self, level, source, start=None, end=None, locations=None):
+        sql = f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM rollups WHERE level = ? AND source = ?"
+        params = [level, source]
+        if start is not None:
+            sql += " AND period_start >= ?"
+            params.append(start)
+        if end is not None:
+            sql += " AND period_start < ?"
+            params.append(end)
+        # Without a location filter the stored locations are listed, so the
+        # lookup still goes through the primary key
+        locations = self.locations(source) if locations is None else locations
+        sql += f" AND location IN ({', '.join('?' * len(locations))})"
+        params.extend(locations)
+        rows = self.conn.execute(sql + " ORDER BY location, period_start", params).fetchall()
+        rollups = pd.DataFrame(rows, columns=ROLLUP_COLUMNS)
+        # Hours without values store NULL min and max
+        rollups[["min", "max"]] = rollups[["min", "max"]].astype(float)
+        return rollups
+
+    def _write(self, level, source, rollups):
+        self.conn.executemany(
+            f"INSERT OR REPLACE INTO rollups (level, source, {', '.join(ROLLUP_COLUMNS)}) "
+            f"VALUES (?, ?, {', '.join('?' * len(ROLLUP_COLUMNS))})",
+            rollups.assign(level=level, source=source)[["level", "source", *ROLLUP_COLUMNS]].itertuples(
+                index=False, name=None),
+        )
+
+    def _ingest_chunk(self, df, source):
+        rollups = _hour_rollups(df, self.outage_dbm)
+        if rollups.empty:
+            return 0
+        written = len(rollups)
+        keys = ["location", "period_start"]
+        for level, coarser in (("hour", "day"), ("day", "month")):
+            # Stored rollups of this level in the coarser periods touched, read
+            # before writing so a fresh range costs no read-back
+            rollups["parent"] = _parents(rollups["period_start"], coarser)
+            parents = rollups[["location", "parent"]].drop_duplicates()
+            stored = self._select(level, source, parents["parent"].min(), _period_end(parents["parent"].max(), coarser),
+                                  parents["location"].unique().tolist())
+            stored["parent"] = _parents(stored["period_start"], coarser)
+            stored = stored.merge(parents, on=["location", "parent"])
+            updated = pd.MultiIndex.from_frame(stored[keys]).isin(pd.MultiIndex.from_frame(rollups[keys]))
+
+            # New rows add to their stored hours; coarser rollups are re-derived whole
+            if level == "hour" and updated.any():
+                rollups = _combine(pd.concat([stored[updated], rollups], ignore_index=True), keys + ["parent"], "hour",
+                                   self.outage_dbm)
+            self._write(level, source, rollups)
+            siblings = pd.concat([stored[~updated], rollups], ignore_index=True) if not updated.all() else rollups
+            rollups = _combine(siblings.drop(columns="period_start").rename(columns={"parent": "period_start"}), keys,
+                               coarser, self.outage_dbm)
+        self._write("month", source, rollups)
+        return written
+
+    def ingest(self, df, source="simulated", replace=False):
+        """
+        Adds signal rows to the rollups.
+
+        Args:
+            df: DataFrame or iterable of DataFrames with a timestamp or
+                time column, signal_dbm and (optionally) location.
+            source: History the rows belong to, e.g. "simulated" or "measured".
+            replace: Drop everything previously ingested for ``source``
+                first (a new simulation supersedes the old one); otherwise
+                the rows are added to the existing rollups.
+
+        Returns:
+            int: Hour rollups written.
+        """
+        chunks = [df] if isinstance(df, pd.DataFrame) else df
+        written = 0
+        with write_transaction(self.conn):
+            if replace:
+                self.conn.execute("DELETE FROM rollups WHERE source = ?", (source,))
+            for chunk in chunks:
+                written += self._ingest_chunk(chunk, source)
+        logger.info(f"Ingested {written} hours of {source} signal history into {self.path}")
+        return written
+
+    def ingest_file(self, path, source="simulated", replace=False, chunk_size=CHUNK_SIZE):
+        """
+        Ingests a signal file, reading CSVs in chunks of ``chunk_size``
+        rows and only the columns the rollups need.
+        """
+        from src.utils.utils import read_table
+
+        if str(path).endswith(".parquet"):
+            return self.ingest(read_table(path), source, replace)
+        columns = [c for c in read_table(path, nrows=0).columns if c in ("timestamp", "time", "location", "signal_dbm")]
+        return self.ingest(read_table(path, usecols=columns, chunksize=chunk_size), source, replace)
+
+    def sources(self):
+        return [row[0] for row in self.conn.execute("SELECT DISTINCT source FROM rollups ORDER BY source")]
+
+    def locations(self, source="simulated"):
+        return [row[0] for row in self.conn.execute(
+            "SELECT DISTINCT location FROM rollups WHERE level = 'month' AND source = ? ORDER BY location", (source,))]
+
+    def span(self, source="simulated"):
+        """
+        Returns:
+            tuple: (first hour, end of last hour) as Timestamps, or (None, None).
+        """
+        # Per-location MIN / MAX are primary key seeks; over the whole level they scan
+        query = ("SELECT {0}((SELECT {0}(period_start) FROM rollups r WHERE r.level = 'hour' AND r.source = m.source "
+                 "AND r.location = m.location)) FROM rollups m WHERE m.level = 'month' AND m.source = ?")
+        first = self.conn.execute(query.format("MIN"), (source,)).fetchone()[0]
+        last = self.conn.execute(query.format("MAX"), (source,)).fetchone()[0]
+        if first is None:
+            return None, None
+        return pd.Timestamp(first), pd.Timestamp(last) + pd.Timedelta(hours=1)
+
+    def rollups(self, level, start=None, end=None, locations=None, source="simulated"):
+        """
+        Raw rollup rows (sums and histogram blobs) of one level whose period
+        starts in [start, end).
+        """
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level {level!r}; expected one of {LEVELS}")
+        start = None if start is None else pd.Timestamp(start).strftime(TIMESTAMP_FORMAT)
+        end = None if end is None else pd.Timestamp(end).strftime(TIMESTAMP_FORMAT)
+        return self._select(level, source, start, end, None if locations is None else list(locations))
+
+    def query(self, level, start=None, end=None, locations=None, quantiles=(0.05, 0.5, 0.95), source="simulated"):
+        """
+        Per-period statistics, e.g. daily p5 per site for a quarter:
+        ``query("day", "2023-07-01", "2023-10-01", quantiles=[0.05])``.
+
+        Args:
+            level: "hour", "day" or "month".
+            start: First period start (inclusive); None for the beginning.
+            end: Last period start (exclusive); None for the end.
+            locations: Locations to include (default: all).
+            quantiles: Quantiles estimated from the histograms (within 0.5 dB).
+            source: History to read.
+
+        Returns:
+            pd.DataFrame: location, period_start, count, missing, mean, std,
+            min, max, hours, outage_hours and signal_q<p> per quantile.
+        """
+        result = summarize(self.rollups(level, start, end, locations, source), quantiles)
+        result["period_start"] = pd.to_datetime(result["period_start"])
+        return result
+
+    def aggregate(self, start=None, end=None, locations=None, quantiles=(0.05, 0.5, 0.95), by_location=True,
+                  source="simulated"):
+        """
+        Statistics over an arbitrary time range, from the coarsest rollups
+        that tile it (whole months, then days, then edge hours).
+
+        Args:
+            start: Range start (inclusive, rounded down to the hour); None
+                for the first hour stored.
+            end: Range end (exclusive, rounded up to the hour); None for
+                the end of the last hour stored.
+            locations: Locations to include (default: all).
+            quantiles: Quantiles estimated from the histograms.
+            by_location: One row per location; otherwise one row overall.
+            source: History to read.
+
+        Returns:
+            pd.DataFrame: Columns as in query, without period_start.
+        """
+        if start is None or end is None:
+            first, last = self.span(source)
+            start = first if start is None else start
+            end = last if end is None else end
+        segments = _range_segments(pd.Timestamp(start), pd.Timestamp(end)) if start is not None and end is not None else []
+
+        parts = [self.rollups(level, a, b, locations, source) for level, a, b in segments]
+        parts = [part for part in parts if not part.empty]
+        rollups = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=ROLLUP_COLUMNS)
+        if not by_location:
+            rollups["location"] = "all"
+        merged = _combine(rollups.drop(columns="period_start"), ["location"], "range", self.outage_dbm)
+        return summarize(merged.drop(columns="period_start", errors="ignore"), quantiles)
+
+    def close(self):
+        self.conn.close()
@@ -4,34 +4,89 @@ import pandas as pd
 from datetime import datetime, UTC
 import random
 from src.utils.logger import get_logger
-from src.utils.config_loader import load_project_root
-from debugpy.common import timestamp
+from src.utils.settings import get_settings
+from src.utils.utils import write_table
+from src.executor import attach, get_executor
+from src.propagation import DEFAULT_LINK, link_attenuation, location_latitudes, DEFAULT_LATITUDE
+from src.spatial_index import normalized_locations
 
 
 logger = get_logger(__name__)
-project_root = load_project_root()
 
-def simulate_realistic_signal_strength(row, base_dbm=-70.0):
+# Fallback values used when a weather input is missing or NaN
+WEATHER_DEFAULTS = {
+    "rain_rate": 0.0,
+    "relative_humidity_2m": 50.0,
+    "cloudcover": 0.0,
+    "windspeed_10m": 0.0,
+    "pressure_msl": 1013.25,
+    "temperature_2m": 20.0,
+}
+
+# Inputs filled from another column before WEATHER_DEFAULTS apply: Open-Meteo
+# frames report hourly precipitation as rain (mm over the hour), not rain_rate
+WEATHER_FALLBACKS = {"rain_rate": "rain"}
+
+# Geographic/equipment-specific biases (dB), keyed by normalized location
+# name (see src.spatial_index.normalize_location)
+LOCATION_BIAS = {
+    'seattle': -1.8,    # Urban environment, frequent precipitation
+    'miami': 0.3,       # Coastal conditions, atmospheric ducting
+    'phoenix': -0.5,    # High temperature equipment effects
+    'denver': -2.2,     # High altitude, atmospheric effects
+    'london': -1.4      # Urban density, frequent overcast
+}
+LOCATION_BIAS_STD = 0.4
+
+# Receiver dynamic range and quantization step (dBm)
+SIGNAL_FLOOR = -120.0
+SIGNAL_CEILING = -40.0
+SIGNAL_STEP = 0.5
+
+INTERFERENCE_PROBABILITY = 0.05
+INTERFERENCE_RANGE = (-5.0, -2.0)
+
+# Sensor readings that can drop out or glitch, and the extreme values
+# injected by add_outliers (storms, saturated air, gusts)
+FAULT_COLUMNS = ['rain_rate', 'relative_humidity_2m', 'windspeed_10m']
+OUTLIER_RANGES = {
+    'rain_rate': (50, 100),
+    'relative_humidity_2m': (95, 100),
+    'windspeed_10m': (30, 50),
+}
+
+def _row_reading(row, column):
+    """
+    One weather input of a row: NaN or absent readings fall back to the
+    WEATHER_FALLBACKS column, then to WEATHER_DEFAULTS.
+    """
+    value = _as_float(row.get(column))
+    if value != value and column in WEATHER_FALLBACKS:
+        value = _as_float(row.get(WEATHER_FALLBACKS[column]))
+    return WEATHER_DEFAULTS[column] if value != value else value
+
+def _as_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def simulate_realistic_signal_strength(row, base_dbm=-70.0, rng=np.random):
     """
     Signal strength simulation based on ITU-R recommendations and 
     real-world satellite communication principles.
+
+    ``rng`` draws the noise terms: the global numpy generator by default,
+    or a np.random.RandomState to keep concurrent simulations independent.
     """
     
-    # Extract weather parameters with defaults
-    rain_rate = row.get("rain_rate", 0.0) or 0.0
-    humidity = row.get("relative_humidity_2m", 50.0) or 50.0
-    cloud_cover = row.get("cloudcover", 0.0) or 0.0
-    wind_speed = row.get("windspeed_10m", 0.0) or 0.0
-    pressure = row.get("pressure_msl", 1013.25) or 1013.25
-    temperature = row.get("temperature_2m", 20.0) or 20.0
-
-    # Ensure all are floats, NaNs replaced
-    rain_rate = 0.0 if pd.isna(rain_rate) else rain_rate
-    humidity = 50.0 if pd.isna(humidity) else humidity
-    cloud_cover = 0.0 if pd.isna(cloud_cover) else cloud_cover
-    wind_speed = 0.0 if pd.isna(wind_speed) else wind_speed
-    pressure = 1013.25 if pd.isna(pressure) else pressure
-    temperature = 20.0 if pd.isna(temperature) else temperature
+    # Weather inputs, read by the same rule as extract_weather_arrays
+    rain_rate = _row_reading(row, "rain_rate")
+    humidity = _row_reading(row, "relative_humidity_2m")
+    cloud_cover = _row_reading(row, "cloudcover")
+    wind_speed = _row_reading(row, "windspeed_10m")
+    pressure = _row_reading(row, "pressure_msl")
+    temperature = _row_reading(row, "temperature_2m")
 
     # Rain attenuation based on ITU-R P.838 model (simplified)
     if rain_rate < 1.0:
@@ -72,11 +127,14 @@ def simulate_realistic_signal_strength(row, base_dbm=-70.0):
     humidity_temp_interaction = (humidity / 100) * abs(temperature - 20) * 0.1
     
     # Diurnal atmospheric variations
-    hour = timestamp.hour if hasattr(timestamp, 'hour') else 12
+    timestamp = row.get("timestamp", row.get("time"))
+    if isinstance(timestamp, str):
+        timestamp = pd.to_datetime(timestamp, errors="coerce")
+    hour = 12 if pd.isna(timestamp) else timestamp.hour
     time_effect = np.sin(2 * np.pi * hour / 24) * 1.5  # Daily atmospheric cycle
     
     # Seasonal atmospheric changes
-    month = timestamp.month if hasattr(timestamp, 'month') else 6
+    month = 6 if pd.isna(timestamp) else timestamp.month
     seasonal_effect = np.sin(2 * np.pi * month / 12) * 0.8
     
     # Calculate total attenuation
@@ -98,23 +156,23 @@ def simulate_realistic_signal_strength(row, base_dbm=-70.0):
     
     # Signal measurement noise from various sources
     # Equipment thermal noise
-    equipment_noise = np.random.normal(0, 1.5)
+    equipment_noise = rng.normal(0, 1.5)
     
     # Atmospheric scintillation (weather-dependent)
     scintillation_factor = 1 + rain_rate * 0.2 + wind_speed * 0.1
-    atmospheric_noise = np.random.normal(0, 0.8 * scintillation_factor)
+    atmospheric_noise = rng.normal(0, 0.8 * scintillation_factor)
     
     # Intermittent interference sources
-    if np.random.random() < 0.05:  # 5% probability
-        interference = np.random.uniform(-5, -2)  # Signal degradation event
+    if rng.random() < 0.05:  # 5% probability
+        interference = rng.uniform(-5, -2)  # Signal degradation event
     else:
         interference = 0
     
     # Multipath propagation effects
     if humidity > 80 and temperature > 25:  # Ducting conditions
-        multipath_noise = np.random.normal(0, 2.0)
+        multipath_noise = rng.normal(0, 2.0)
     else:
-        multipath_noise = np.random.normal(0, 0.5)
+        multipath_noise = rng.normal(0, 0.5)
     
     # Add all noise components
     total_noise = equipment_noise + atmospheric_noise + interference + multipath_noise
@@ -129,6 +187,199 @@ def simulate_realistic_signal_strength(row, base_dbm=-70.0):
     
     return signal_strength
 
+def _numeric_column(df, column):
+    if column not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+
+def extract_weather_arrays(df):
+    """
+    Pulls the simulation inputs out of a weather DataFrame as float arrays.
+
+    Missing columns and NaNs fall back to their WEATHER_FALLBACKS column,
+    then to WEATHER_DEFAULTS. The fallback columns are returned too (with
+    defaults applied), so readings dropped later can be refilled by the
+    same rule (see missing_readings).
+
+    Args:
+        df: Weather DataFrame.
+
+    Returns:
+        dict: Column name → float array, plus ``hour`` and ``month`` arrays.
+    """
+    n_rows = len(df)
+    arrays = {}
+    for column, default in WEATHER_DEFAULTS.items():
+        values = _numeric_column(df, column)
+        if column in WEATHER_FALLBACKS:
+            fallback = _numeric_column(df, WEATHER_FALLBACKS[column])
+            arrays[WEATHER_FALLBACKS[column]] = np.where(np.isnan(fallback), default, fallback)
+            values = np.where(np.isnan(values), fallback, values)
+        arrays[column] = np.where(np.isnan(values), default, values)
+
+    # Diurnal/seasonal terms use the row timestamp when one is available
+    hour = np.full(n_rows, 12.0)
+    month = np.full(n_rows, 6.0)
+    for column in ("timestamp", "time"):
+        if column in df.columns:
+            times = pd.to_datetime(df[column], errors="coerce")
+            hour = times.dt.hour.fillna(12).to_numpy(dtype=float)
+            month = times.dt.month.fillna(6).to_numpy(dtype=float)
+            break
+    arrays["hour"] = hour
+    arrays["month"] = month
+    return arrays
+
+def missing_readings(weather, column, rows):
+    """
+    Values extract_weather_arrays gives ``column`` at ``rows`` when the
+    reading is missing there: its fallback column, else the default.
+
+    Args:
+        weather: Output of extract_weather_arrays.
+        column: Column of WEATHER_DEFAULTS.
+        rows: Row indices.
+
+    Returns:
+        np.ndarray: Float values for those rows.
+    """
+    if column in WEATHER_FALLBACKS:
+        return weather[WEATHER_FALLBACKS[column]][rows]
+    return np.full(len(rows), WEATHER_DEFAULTS[column])
+
+def compute_attenuation(weather):
+    """
+    Vectorized version of the deterministic attenuation terms in
+    simulate_realistic_signal_strength.
+
+    Args:
+        weather: Output of extract_weather_arrays.
+
+    Returns:
+        np.ndarray: Total attenuation (dB) per row.
+    """
+    rain_rate = weather["rain_rate"]
+    humidity = weather["relative_humidity_2m"]
+    cloud_cover = weather["cloudcover"]
+    wind_speed = weather["windspeed_10m"]
+    pressure = weather["pressure_msl"]
+    temperature = weather["temperature_2m"]
+
+    rain_attenuation = np.where(
+        rain_rate < 1.0, rain_rate * 0.2,
+        np.where(rain_rate < 5.0, 0.2 + (rain_rate - 1.0) * 0.5, 2.2 + (rain_rate - 5.0) * 1.2)
+    )
+    humidity_attenuation = np.maximum(0, (humidity - 30) / 70) ** 2 * 3.0
+    cloud_attenuation = np.where(
+        cloud_cover < 20, 0.0,
+        np.where(cloud_cover < 50, (cloud_cover - 20) * 0.02, 0.6 + (cloud_cover - 50) * 0.04)
+    )
+    wind_effect = np.where(wind_speed < 5, -wind_speed * 0.1, (wind_speed - 5) * 0.15)
+    pressure_attenuation = np.abs(pressure - 1013.25) * 0.01
+    temp_effect = np.abs(temperature - 20) * 0.05
+    rain_wind_interaction = rain_rate * wind_speed * 0.02
+    humidity_temp_interaction = (humidity / 100) * np.abs(temperature - 20) * 0.1
+    time_effect = np.sin(2 * np.pi * weather["hour"] / 24) * 1.5
+    seasonal_effect = np.sin(2 * np.pi * weather["month"] / 12) * 0.8
+
+    return (
+        rain_attenuation +
+        humidity_attenuation +
+        cloud_attenuation +
+        wind_effect +
+        pressure_attenuation +
+        temp_effect +
+        rain_wind_interaction +
+        humidity_temp_interaction +
+        time_effect +
+        seasonal_effect
+    )
+
+def compute_noise_std(weather):
+    """
+    Standard deviation of the combined Gaussian noise terms per row.
+
+    Equipment, scintillation and multipath noise are independent zero-mean
+    normals, so they collapse into a single draw with this standard deviation.
+
+    Args:
+        weather: Output of extract_weather_arrays.
+
+    Returns:
+        np.ndarray: Noise standard deviation (dB) per row.
+    """
+    scintillation_factor = 1 + weather["rain_rate"] * 0.2 + weather["windspeed_10m"] * 0.1
+    ducting = (weather["relative_humidity_2m"] > 80) & (weather["temperature_2m"] > 25)
+    multipath_std = np.where(ducting, 2.0, 0.5)
+    return np.sqrt(1.5 ** 2 + (0.8 * scintillation_factor) ** 2 + multipath_std ** 2)
+
+def location_bias_offsets(df):
+    """
+    Looks up the LOCATION_BIAS offset for every row by exact (case- and
+    whitespace-insensitive) location name.
+
+    Args:
+        df: DataFrame with an optional ``location`` column.
+
+    Returns:
+        np.ndarray: Bias (dB) per row, 0 for unknown locations.
+    """
+    offsets = np.zeros(len(df))
+    if 'location' not in df.columns:
+        return offsets
+    keys = normalized_locations(df['location'])
+    for location, bias in LOCATION_BIAS.items():
+        offsets[(keys == location).to_numpy()] = bias
+    return offsets
+
+def simulate_itu_signal_strength(df, links=None, base_dbm=-70.0):
+    """
+    Vectorized signal simulation driven by the ITU-R propagation model.
+
+    Rain, gaseous and cloud attenuation come from src.propagation for each
+    link; measurement noise, interference and hardware limits follow
+    simulate_realistic_signal_strength.
+
+    Args:
+        df: Weather DataFrame.
+        links: List of link dicts (frequency_ghz, elevation_deg, polarization,
+            optional name). Defaults to DEFAULT_LINK.
+        base_dbm: Clear-sky signal level.
+
+    Returns:
+        pd.DataFrame: ``df`` with a ``signal_dbm`` column. With several links
+        the rows are repeated per link and tagged with a ``link`` column.
+    """
+    links = links or [DEFAULT_LINK]
+    weather = extract_weather_arrays(df)
+    if 'latitude' in df.columns:
+        latitude = df['latitude'].fillna(DEFAULT_LATITUDE).to_numpy(dtype=float)
+    elif 'location' in df.columns:
+        latitude = location_latitudes(df['location'])
+    else:
+        latitude = DEFAULT_LATITUDE
+
+    attenuation = link_attenuation(weather, links, latitude)
+    noise_std = compute_noise_std(weather)
+    shape = attenuation.shape
+    noise = np.random.normal(0, 1, shape) * noise_std[None, :]
+    interference = np.where(
+        np.random.random(shape) < INTERFERENCE_PROBABILITY,
+        np.random.uniform(*INTERFERENCE_RANGE, shape),
+        0.0
+    )
+    signal = np.clip(base_dbm - attenuation + noise + interference, SIGNAL_FLOOR, SIGNAL_CEILING)
+    signal = np.round(signal / SIGNAL_STEP) * SIGNAL_STEP
+
+    frames = []
+    for i, link in enumerate(links):
+        frame = df.copy()
+        frame['signal_dbm'] = signal[i]
+        if len(links) > 1:
+            frame['link'] = link.get('name', f"link_{i}")
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
 def add_missing_data_simulation(df, missing_rate=0.05):
     """
     Simulate sensor failures and data collection issues
@@ -136,7 +387,7 @@ def add_missing_data_simulation(df, missing_rate=0.05):
     df_copy = df.copy()
     
     # Randomly set some values to NaN
-    for column in ['rain_rate', 'relative_humidity_2m', 'windspeed_10m']:
+    for column in FAULT_COLUMNS:
         mask = np.random.random(len(df_copy)) < missing_rate
         df_copy.loc[mask, column] = np.nan
     
@@ -153,63 +404,118 @@ def add_outliers(df, outlier_rate=0.02):
     
     for idx in outlier_indices:
         # Equipment malfunction on single parameter
-        param = np.random.choice(['rain_rate', 'relative_humidity_2m', 'windspeed_10m'])
-        if param == 'rain_rate':
-            df_copy.loc[idx, param] = np.random.uniform(50, 100)  # Storm conditions
-        elif param == 'relative_humidity_2m':
-            df_copy.loc[idx, param] = np.random.uniform(95, 100)  # Saturated conditions
-        else:
-            df_copy.loc[idx, param] = np.random.uniform(30, 50)   # High wind conditions
+        param = np.random.choice(FAULT_COLUMNS)
+        df_copy.loc[idx, param] = np.random.uniform(*OUTLIER_RANGES[param])
     
     return df_copy
 
-# Updated to match your original function signature exactly
-def simulate_from_csv(input_path, output_subdir="data/simulated"):
+def _simulate_rows_task(shared, rows, seed):
+    rng = np.random.RandomState(seed)
+    return attach(shared).iloc[rows].apply(simulate_realistic_signal_strength, axis=1, rng=rng).to_numpy(dtype=float)
+
+def simulate_legacy_sharded(df, seed, n_workers=1):
+    """
+    Runs the row-wise legacy model one location at a time on the configured
+    executor (see src.executor). Each location draws its noise from its own
+    generator, seeded from ``seed`` and the location's position in the data,
+    so the result does not depend on the number of workers or the backend.
+
+    Args:
+        df: Weather DataFrame.
+        seed: Base random seed.
+        n_workers: Workers; the frame is scattered to them once.
+
+    Returns:
+        np.ndarray: Signal strength (dBm) per row.
+    """
+    if 'location' in df.columns:
+        codes = pd.factorize(df['location'], use_na_sentinel=False)[0]
+        shards = [np.flatnonzero(codes == code) for code in range(codes.max() + 1)] if len(df) else []
+    else:
+        shards = [np.arange(len(df))]
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(len(shards))]
+
+    # Timestamps are parsed once here rather than row by row
+    for column in ("timestamp", "time"):
+        if column in df.columns:
+            if not pd.api.types.is_datetime64_any_dtype(df[column]):
+                df = df.assign(**{column: pd.to_datetime(df[column], errors="coerce")})
+            break
+
+    signal = np.empty(len(df))
+    with get_executor(min(n_workers, len(shards))) as executor:
+        shared = executor.scatter_frame(df)
+        try:
+            tasks = [(shared, rows, shard_seed) for rows, shard_seed in zip(shards, seeds)]
+            for rows, values in zip(shards, executor.map(_simulate_rows_task, tasks)):
+                signal[rows] = values
+        finally:
+            executor.release(shared)
+    return signal
+
+def simulate_from_csv(input_path, output_subdir="data/simulated", engine="legacy", links=None,
+                      missing_rate=None, outlier_rate=None, seed=None, n_workers=None):
     """
     Load weather data, simulate REALISTIC signal strength, and save results.
     
     Args:
-        input_path: Path to processed weather CSV.
+        input_path: Path to processed weather CSV, or a weather DataFrame
+            (e.g. from src.synthetic_weather).
         output_subdir: Subdirectory under project root to save results.
+        engine: "legacy" for the row-wise empirical model, "itu" for the
+            vectorized ITU-R propagation model.
+        links: Link definitions for the "itu" engine.
+        missing_rate: Fraction of readings blanked out (default: missing_rate setting).
+        outlier_rate: Fraction of rows with an injected outlier (default: outlier_rate setting).
+        seed: Random seed (default: seed setting).
+        n_workers: Workers for the per-location legacy simulation (default:
+            workers setting).
+
+    The output format follows the storage_format setting.
     """
-    output_dir = os.path.join(project_root, output_subdir)
+    if engine not in ("legacy", "itu"):
+        raise ValueError(f"Unknown simulation engine: {engine}")
+
+    settings = get_settings()
+    missing_rate = settings.missing_rate if missing_rate is None else missing_rate
+    outlier_rate = settings.outlier_rate if outlier_rate is None else outlier_rate
+    seed = settings.seed if seed is None else seed
+    n_workers = settings.workers if n_workers is None else n_workers
+    output_dir = settings.path(output_subdir)
     os.makedirs(output_dir, exist_ok=True)
 
     # Load data
-    df = pd.read_csv(input_path)
+    df = input_path.copy() if isinstance(input_path, pd.DataFrame) else pd.read_csv(input_path)
     
     # Convert timestamp if it exists
     if 'timestamp' in df.columns:
         df['timestamp'] = pd.to_datetime(df['timestamp'])
     
     # Add realistic complexity
-    df = add_missing_data_simulation(df, missing_rate=0.02)  # 2% missing data
-    df = add_outliers(df, outlier_rate=0.015)  # 1.5% outliers
+    np.random.seed(seed)  # For reproducible results
+    df = add_missing_data_simulation(df, missing_rate=missing_rate)
+    df = add_outliers(df, outlier_rate=outlier_rate)
     
     # Generate signal strength using advanced simulation
-    np.random.seed(42)  # For reproducible results
-    df['signal_dbm'] = df.apply(simulate_realistic_signal_strength, axis=1)
+    if engine == "itu":
+        df = simulate_itu_signal_strength(df, links=links)
+    else:
+        df['signal_dbm'] = simulate_legacy_sharded(df, seed, n_workers)
     
     # Add geographic/equipment-specific biases
     if 'location' in df.columns:
-        location_bias = {
-            'seattle': -1.8,    # Urban environment, frequent precipitation
-            'miami': 0.3,       # Coastal conditions, atmospheric ducting
-            'phoenix': -0.5,    # High temperature equipment effects
-            'denver': -2.2,     # High altitude, atmospheric effects
-            'london': -1.4      # Urban density, frequent overcast
-        }
-        for location, bias in location_bias.items():
-            mask = df['location'].str.contains(location, case=False, na=False)
+        keys = normalized_locations(df['location'])
+        for location, bias in LOCATION_BIAS.items():
+            mask = keys == location
             if mask.any():
-                df.loc[mask, 'signal_dbm'] += bias + np.random.normal(0, 0.4, mask.sum())
+                df.loc[mask, 'signal_dbm'] += bias + np.random.normal(0, LOCATION_BIAS_STD, mask.sum())
 
     # Save to the same path as your original
-    output_path = os.path.join(output_dir, "signal_latest.csv")
-    df.to_csv(output_path, index=False)
+    output_path = os.path.join(output_dir, os.path.basename(settings.signal_path))
+    write_table(df, output_path)
     
     logger.info(f"Saved simulated signal data to {output_path}")
-    print(f"Simulation results saved to data/simulated/signal_latest.csv")
+    print(f"Simulation results saved to {os.path.relpath(output_path, settings.project_root)}")
     
     # Display signal characteristics
     print(f"\n Signal Strength Statistics:")
@@ -0,0 +1,266 @@
+import itertools
+import numpy as np
+import pandas as pd
+
+from src.utils.logger import get_logger
+from src.executor import attach, get_executor
+from src.signal_ensemble import N_LEVELS, group_codes, histogram_summary
+from src.signal_simulation import (
+    extract_weather_arrays,
+    compute_attenuation,
+    compute_noise_std,
+    location_bias_offsets,
+    missing_readings,
+    FAULT_COLUMNS,
+    OUTLIER_RANGES,
+    WEATHER_DEFAULTS,
+    WEATHER_FALLBACKS,
+    LOCATION_BIAS_STD,
+    SIGNAL_FLOOR,
+    SIGNAL_CEILING,
+    SIGNAL_STEP,
+    INTERFERENCE_PROBABILITY,
+    INTERFERENCE_RANGE,
+)
+
+logger = get_logger(__name__)
+
+# Measurement noise profiles: scale on the weather-dependent noise standard
+# deviation and probability of an interference event per reading
+NOISE_PROFILES = {
+    "quiet": {"noise_scale": 0.5, "interference_probability": 0.01},
+    "nominal": {"noise_scale": 1.0, "interference_probability": INTERFERENCE_PROBABILITY},
+    "harsh": {"noise_scale": 1.5, "interference_probability": 0.15},
+}
+
+# Swept parameters and their values when not swept
+DEFAULT_PARAMETERS = {
+    "base_dbm": -70.0,
+    "noise_profile": "nominal",
+    "missing_rate": 0.02,
+    "outlier_rate": 0.015,
+    "bias_scale": 1.0,
+    "seed": 42,
+}
+PARAMETERS = list(DEFAULT_PARAMETERS)
+
+WEATHER_KEYS = list(WEATHER_DEFAULTS) + list(WEATHER_FALLBACKS.values()) + ["hour", "month"]
+
+def parameter_grid(**axes):
+    """
+    Cartesian product of parameter values.
+
+    Args:
+        **axes: Parameter name → value or list of values. Parameters not
+            given take their DEFAULT_PARAMETERS value.
+
+    Returns:
+        pd.DataFrame: One row per parameter set, columns PARAMETERS.
+    """
+    unknown = set(axes) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    values = []
+    for name in PARAMETERS:
+        value = axes.get(name, DEFAULT_PARAMETERS[name])
+        values.append(list(value) if isinstance(value, (list, tuple, np.ndarray, pd.Series)) else [value])
+    grid = pd.DataFrame(list(itertools.product(*values)), columns=PARAMETERS)
+    _validate_grid(grid)
+    return grid
+
+def _validate_grid(grid):
+    missing = set(PARAMETERS) - set(grid.columns)
+    if missing:
+        raise ValueError(f"Sweep grid is missing parameters: {sorted(missing)}")
+    profiles = set(grid["noise_profile"]) - set(NOISE_PROFILES)
+    if profiles:
+        raise ValueError(f"Unknown noise profiles: {sorted(profiles)}; expected {sorted(NOISE_PROFILES)}")
+    for rate in ("missing_rate", "outlier_rate"):
+        if not grid[rate].between(0, 1).all():
+            raise ValueError(f"{rate} must be between 0 and 1")
+
+class SweepBase:
+    """
+    Deterministic per-row simulation inputs, computed once and shared by
+    every parameter set of a sweep: the weather arrays, attenuation, noise
+    standard deviation and location bias, plus each row's group code.
+    """
+
+    def __init__(self, weather, attenuation, noise_std, bias, codes, groups):
+        self.weather = weather
+        self.attenuation = attenuation
+        self.noise_std = noise_std
+        self.bias = bias
+        self.codes = codes
+        self.groups = groups
+
+    def __len__(self):
+        return len(self.attenuation)
+
+    def arrays(self):
+        """
+        Flat dict of arrays for share_arrays.
+        """
+        arrays = {f"weather__{key}": self.weather[key] for key in WEATHER_KEYS}
+        arrays.update(attenuation=self.attenuation, noise_std=self.noise_std, bias=self.bias, codes=self.codes)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, groups=None):
+        weather = {key: np.asarray(arrays[f"weather__{key}"]) for key in WEATHER_KEYS}
+        return cls(weather, np.asarray(arrays["attenuation"]), np.asarray(arrays["noise_std"]),
+                   np.asarray(arrays["bias"]), np.asarray(arrays["codes"]), groups)
+
+def prepare_sweep(df, by=("location",)):
+    """
+    Runs the deterministic attenuation pass once for a sweep.
+
+    Args:
+        df: Weather DataFrame.
+        by: Grouping columns for the summary (see signal_ensemble.group_codes);
+            empty for one overall group.
+
+    Returns:
+        SweepBase: Reusable across run_sweep calls.
+    """
+    weather = extract_weather_arrays(df)
+    if by:
+        codes, groups = group_codes(df, list(by))
+    else:
+        codes, groups = np.zeros(len(df), dtype=np.int64), pd.DataFrame(index=[0])
+    return SweepBase(weather, compute_attenuation(weather), compute_noise_std(weather),
+                     location_bias_offsets(df), codes, groups)
+
+def _draw_faults(n_rows, rng, missing_rate, outlier_rate):
+    """
+    Draws sensor dropouts and outliers like add_missing_data_simulation and
+    add_outliers.
+
+    Returns:
+        list: (column, row indices, values) in the order they apply;
+        values is None for dropped readings.
+    """
+    faults = []
+    if missing_rate > 0:
+        for column in FAULT_COLUMNS:
+            faults.append((column, np.flatnonzero(rng.random(n_rows) < missing_rate), None))
+    n_outliers = int(n_rows * outlier_rate)
+    if n_outliers:
+        rows = rng.choice(n_rows, n_outliers, replace=False)
+        which = rng.integers(len(FAULT_COLUMNS), size=n_outliers)
+        for k, column in enumerate(FAULT_COLUMNS):
+            low, high = OUTLIER_RANGES[column]
+            selected = rows[which == k]
+            faults.append((column, selected, rng.uniform(low, high, selected.size)))
+    return faults
+
+def _faulted_rows(base, rng, missing_rate, outlier_rate):
+    """
+    Applies _draw_faults and recomputes attenuation and noise only for the
+    rows they touch. Dropped readings are refilled like extract_weather_arrays
+    fills missing ones (see missing_readings).
+
+    Returns:
+        tuple: (row indices, attenuation, noise std) for the faulted rows.
+    """
+    faults = _draw_faults(len(base), rng, missing_rate, outlier_rate)
+    faulted = np.unique(np.concatenate([rows for _, rows, _ in faults])) if faults else np.empty(0, dtype=np.int64)
+    if faulted.size == 0:
+        return faulted, np.empty(0), np.empty(0)
+    weather = {key: base.weather[key][faulted].copy() for key in WEATHER_KEYS}
+    # Outliers are applied after dropouts and overwrite them, as in simulate_from_csv
+    for column, rows, values in faults:
+        if values is None:
+            values = missing_readings(base.weather, column, rows)
+        weather[column][np.searchsorted(faulted, rows)] = values
+    return faulted, compute_attenuation(weather), compute_noise_std(weather)
+
+def simulate_counts(base, params, n_groups):
+    """
+    Simulates one parameter set and histograms it per group.
+
+    The generator is seeded by params["seed"] alone, so parameter sets that
+    share a seed use common random numbers and differ only by the swept
+    parameters.
+
+    Returns:
+        np.ndarray: (n_groups, N_LEVELS) signal level counts.
+    """
+    rng = np.random.default_rng(int(params["seed"]))
+    profile = NOISE_PROFILES[params["noise_profile"]]
+    attenuation, noise_std = base.attenuation, base.noise_std
+
+    rows, fault_attenuation, fault_noise_std = _faulted_rows(base, rng, params["missing_rate"], params["outlier_rate"])
+    if rows.size:
+        attenuation, noise_std = attenuation.copy(), noise_std.copy()
+        attenuation[rows] = fault_attenuation
+        noise_std[rows] = fault_noise_std
+
+    noise_std = np.sqrt(noise_std ** 2 + np.where(base.bias != 0, LOCATION_BIAS_STD ** 2, 0.0))
+    signal = (params["base_dbm"] - attenuation + params["bias_scale"] * base.bias
+              + rng.standard_normal(len(base)) * noise_std * profile["noise_scale"])
+    interference = rng.random(len(base)) < profile["interference_probability"]
+    signal[interference] += rng.uniform(*INTERFERENCE_RANGE, int(interference.sum()))
+
+    np.clip(signal, SIGNAL_FLOOR, SIGNAL_CEILING, out=signal)
+    levels = np.rint((signal - SIGNAL_FLOOR) / SIGNAL_STEP).astype(np.int64)
+    valid = base.codes >= 0
+    counts = np.bincount(base.codes[valid] * N_LEVELS + levels[valid], minlength=n_groups * N_LEVELS)
+    return counts.reshape(n_groups, N_LEVELS)
+
+def _sweep_task(base, records, n_groups):
+    return [simulate_counts(base, params, n_groups) for params in records]
+
+def _sweep_attached(shared, records, n_groups):
+    return _sweep_task(SweepBase.from_arrays(attach(shared)), records, n_groups)
+
+def run_sweep(data, grid=None, by=("location",), quantiles=(0.05, 0.5, 0.95), outage_threshold=-90.0,
+              n_workers=1):
+    """
+    Applies many simulation parameter sets on top of one attenuation pass.
+
+    Args:
+        data: Weather DataFrame, or a SweepBase from prepare_sweep to reuse
+            its cached attenuation (``by`` is then ignored).
+        grid: DataFrame of parameter sets (see parameter_grid); defaults to
+            DEFAULT_PARAMETERS only.
+        by: Grouping columns for the summary when ``data`` is a DataFrame.
+        quantiles: Signal quantiles to report.
+        outage_threshold: Signal level (dBm) below which the link is in outage.
+        n_workers: Workers on the configured executor; parameter sets are
+            split between them and the per-row arrays are scattered once.
+
+    Returns:
+        pd.DataFrame: Tidy table with sweep_id, the parameters, the group
+        columns, n_samples, signal_mean, signal_std, the quantiles and
+        outage_prob, one row per parameter set and group.
+    """
+    base = data if isinstance(data, SweepBase) else prepare_sweep(data, by)
+    grid = parameter_grid() if grid is None else grid.reset_index(drop=True)
+    _validate_grid(grid)
+    records = grid[PARAMETERS].to_dict("records")
+    n_groups = len(base.groups)
+
+    with get_executor(n_workers if len(records) > 1 else 1) as executor:
+        if executor.n_workers <= 1:
+            counts = _sweep_task(base, records, n_groups)
+        else:
+            batches = [batch for batch in np.array_split(np.arange(len(records)), executor.n_workers) if batch.size]
+            shared = executor.scatter(base.arrays())
+            try:
+                results = executor.map(_sweep_attached, [(shared, [records[i] for i in batch], n_groups)
+                                                         for batch in batches])
+                counts = [c for batch_counts in results for c in batch_counts]
+            finally:
+                executor.release(shared)
+
+    summary = histogram_summary(np.concatenate(counts), quantiles, outage_threshold)
+    result = grid[PARAMETERS].loc[grid.index.repeat(n_groups)].reset_index(drop=True)
+    result.insert(0, "sweep_id", np.repeat(np.arange(len(grid)), n_groups))
+    groups = pd.concat([base.groups] * len(grid), ignore_index=True)
+    for column in groups.columns:
+        result[column] = groups[column].to_numpy()
+    for name, values in summary.items():
+        result[name] = values
+    logger.info(f"Swept {len(grid)} parameter sets over {len(base)} rows and {n_groups} groups")
+    return result
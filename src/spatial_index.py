@@ -0,0 +1,231 @@
+import hashlib
+import numpy as np
+import pandas as pd
+
+from src.utils.constants import DEFAULT_LOCATIONS
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Sources blended per station and the inverse-distance weighting power
+K_NEAREST = 4
+IDW_POWER = 2.0
+
+# Stations closer than this to a source take that source's weather as is
+EXACT_MATCH_KM = 0.01
+
+# Elements of the (stations, k, times, columns) block gathered at once
+MAX_BLOCK_ELEMENTS = 4_000_000
+
+# Built indexes by source set, so each set is indexed once per process
+_INDEX_CACHE = {}
+
+def normalize_location(name):
+    """
+    Case- and whitespace-insensitive key of a location name.
+    """
+    return " ".join(str(name).split()).casefold()
+
+def normalized_locations(locations):
+    """
+    normalize_location for a Series, computed once per distinct name.
+
+    Returns:
+        pd.Series: Normalized names, NaN where the name is missing.
+    """
+    codes, names = pd.factorize(locations)
+    keys = np.array([normalize_location(name) for name in names] + [np.nan], dtype=object)
+    return pd.Series(keys[codes], index=locations.index)
+
+def _coordinate_table(locations):
+    """
+    DataFrame with name, latitude and longitude from a DataFrame (name,
+    location or station column) or a list of location dicts.
+    """
+    table = pd.DataFrame(list(locations)) if not isinstance(locations, pd.DataFrame) else locations
+    for column in ("name", "location", "station"):
+        if column in table.columns:
+            break
+    else:
+        raise ValueError("Locations need a name, location or station column")
+    missing = {"latitude", "longitude"} - set(table.columns)
+    if missing:
+        raise ValueError(f"Locations are missing columns: {sorted(missing)}")
+    return pd.DataFrame({"name": table[column].astype(str).to_numpy(),
+                         "latitude": table["latitude"].to_numpy(dtype=float),
+                         "longitude": table["longitude"].to_numpy(dtype=float)})
+
+class SpatialIndex:
+    """
+    Ball tree on haversine distance over weather-source coordinates.
+
+    Resolves batches of station coordinates to their k nearest sources and
+    inverse-distance weights over them. Build it through get_index so each
+    source set is indexed once.
+    """
+
+    def __init__(self, names, latitudes, longitudes):
+        from sklearn.neighbors import BallTree
+
+        self.names = [str(name) for name in names]
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        if not len(self.names):
+            raise ValueError("A spatial index needs at least one source")
+        _check_coordinates(self.latitudes, self.longitudes)
+        self.tree = BallTree(np.radians(np.column_stack([self.latitudes, self.longitudes])), metric="haversine")
+
+    def __len__(self):
+        return len(self.names)
+
+    def nearest(self, latitudes, longitudes, k=K_NEAREST):
+        """
+        Args:
+            latitudes: Station latitudes (degrees).
+            longitudes: Station longitudes (degrees).
+            k: Sources per station (capped at the number of sources).
+
+        Returns:
+            tuple: (source indices, great-circle distances in km), both
+            (n_stations, k) and ordered nearest first.
+        """
+        latitudes = np.atleast_1d(np.asarray(latitudes, dtype=float))
+        longitudes = np.atleast_1d(np.asarray(longitudes, dtype=float))
+        _check_coordinates(latitudes, longitudes)
+        distances, indices = self.tree.query(np.radians(np.column_stack([latitudes, longitudes])),
+                                             k=min(k, len(self)))
+        return indices, distances * EARTH_RADIUS_KM
+
+    def idw_weights(self, latitudes, longitudes, k=K_NEAREST, power=IDW_POWER):
+        """
+        Inverse-distance weights over each station's k nearest sources.
+        A station within EXACT_MATCH_KM of a source gets all its weight.
+
+        Returns:
+            tuple: (source indices, weights summing to 1), both (n_stations, k).
+        """
+        indices, distances = self.nearest(latitudes, longitudes, k)
+        weights = 1.0 / np.maximum(distances, EXACT_MATCH_KM) ** power
+        exact = distances[:, 0] < EXACT_MATCH_KM
+        weights[exact] = 0.0
+        weights[exact, 0] = 1.0
+        return indices, weights / weights.sum(axis=1, keepdims=True)
+
+def _check_coordinates(latitudes, longitudes):
+    if latitudes.shape != longitudes.shape:
+        raise ValueError("Latitudes and longitudes differ in length")
+    if not (np.all(np.abs(latitudes) <= 90) and np.all(np.abs(longitudes) <= 180)):
+        raise ValueError("Coordinates must be finite degrees within [-90, 90] x [-180, 180]")
+
+def source_key(names, latitudes, longitudes):
+    """
+    Content hash of a source set (names and coordinates, in order).
+    """
+    digest = hashlib.sha256("\0".join(str(name) for name in names).encode())
+    digest.update(np.ascontiguousarray(latitudes, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(longitudes, dtype=float).tobytes())
+    return digest.hexdigest()
+
+def get_index(locations=None):
+    """
+    Spatial index over a source set, built on first use and cached.
+
+    Args:
+        locations: Location dicts or DataFrame with name, latitude and
+            longitude (default: DEFAULT_LOCATIONS).
+
+    Returns:
+        SpatialIndex: Shared index; treat as read-only.
+    """
+    table = _coordinate_table(DEFAULT_LOCATIONS if locations is None else locations)
+    key = source_key(table["name"], table["latitude"], table["longitude"])
+    if key not in _INDEX_CACHE:
+        _INDEX_CACHE[key] = SpatialIndex(table["name"], table["latitude"], table["longitude"])
+        logger.info(f"Built spatial index over {len(table)} weather sources ({key[:12]})")
+    return _INDEX_CACHE[key]
+
+def source_coordinates(weather, locations=None):
+    """
+    Coordinates of the weather sources present in ``weather``: its own
+    latitude / longitude columns when it has them, otherwise the known
+    locations matched by normalized name. Unknown sources are skipped.
+
+    Returns:
+        pd.DataFrame: name (as spelled in ``weather``), latitude, longitude.
+    """
+    if {"latitude", "longitude"} <= set(weather.columns):
+        table = weather.groupby("location", sort=False)[["latitude", "longitude"]].first().reset_index()
+        return _coordinate_table(table.dropna())
+
+    known = _coordinate_table(DEFAULT_LOCATIONS if locations is None else locations)
+    known = known.set_index(normalized_locations(known["name"]))
+    names = pd.Series(weather["location"].dropna().unique())
+    keys = normalized_locations(names)
+    found = keys.isin(known.index)
+    if not found.all():
+        logger.warning(f"No coordinates for weather sources: {', '.join(names[~found].astype(str))}")
+    matched = known.loc[keys[found]]
+    return pd.DataFrame({"name": names[found].to_numpy(), "latitude": matched["latitude"].to_numpy(),
+                         "longitude": matched["longitude"].to_numpy()})
+
+def interpolate_weather(weather, stations, locations=None, k=K_NEAREST, power=IDW_POWER, columns=None):
+    """
+    Weather at arbitrary stations, blended from the k nearest weather
+    sources with inverse-distance weights, for every time step.
+
+    The sources are gathered into one (source, time, column) array and each
+    block of stations is a weighted sum over it. Missing source values are
+    left out and the remaining weights renormalized.
+
+    Args:
+        weather: Weather DataFrame with location, time (or timestamp) and
+            numeric weather columns, one series per source.
+        stations: Station dicts or DataFrame with name (or location /
+            station), latitude and longitude.
+        locations: Source coordinates (see source_coordinates).
+        k: Sources blended per station.
+        power: Inverse-distance weighting power.
+        columns: Weather columns to interpolate (default: all numeric
+            columns except coordinates).
+
+    Returns:
+        pd.DataFrame: time, location (station name), latitude, longitude and
+        the interpolated columns, one series per station.
+    """
+    time_column = "timestamp" if "timestamp" in weather.columns else "time"
+    sources = source_coordinates(weather, locations)
+    if sources.empty:
+        raise ValueError("None of the weather sources have known coordinates")
+    stations = _coordinate_table(stations)
+    if columns is None:
+        columns = [c for c in weather.select_dtypes(include="number").columns if c not in ("latitude", "longitude")]
+
+    # (source, time, column) cube over the union of time steps
+    weather = weather[weather["location"].isin(sources["name"])]
+    source_codes = pd.Index(sources["name"]).get_indexer(weather["location"])
+    time_codes, times = pd.factorize(weather[time_column], sort=True)
+    cube = np.full((len(sources), len(times), len(columns)), np.nan)
+    cube[source_codes, time_codes] = weather[columns].to_numpy(dtype=float)
+    present = ~np.isnan(cube)
+    cube = np.nan_to_num(cube)
+
+    index = get_index(sources)
+    indices, weights = index.idw_weights(stations["latitude"], stations["longitude"], k, power)
+    block = max(1, MAX_BLOCK_ELEMENTS // (indices.shape[1] * cube[0].size))
+    values = np.empty((len(stations), len(times), len(columns)))
+    for start in range(0, len(stations), block):
+        rows = slice(start, start + block)
+        total = np.einsum("sk,sktc->stc", weights[rows], cube[indices[rows]])
+        weight = np.einsum("sk,sktc->stc", weights[rows], present[indices[rows]])
+        values[rows] = np.divide(total, weight, out=np.full(total.shape, np.nan), where=weight > 0)
+
+    result = pd.DataFrame(values.reshape(-1, len(columns)), columns=columns)
+    result.insert(0, time_column, np.tile(np.asarray(times), len(stations)))
+    for position, column in enumerate(["location", "latitude", "longitude"], start=1):
+        result.insert(position, column, np.repeat(stations["name" if column == "location" else column].to_numpy(),
+                                                  len(times)))
+    logger.info(f"Interpolated {len(columns)} weather columns for {len(stations)} stations "
+                f"from {len(sources)} sources")
+    return result
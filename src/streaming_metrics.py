@@ -0,0 +1,247 @@
+import numpy as np
+
+# Default t-digest compression; the sketch keeps about compression / 2 centroids
+DEFAULT_COMPRESSION = 200
+
+# Size of the uniform (y_true, y_pred) sample kept for scatter plots
+DEFAULT_SAMPLE_SIZE = 20_000
+
+class TDigest:
+    """
+    Mergeable quantile sketch (merging t-digest with the k1 scale function).
+
+    Compression is fully vectorized: points are sorted, mapped onto the k1
+    scale and every unit interval of that scale becomes one centroid, which
+    keeps the tails at high resolution.
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def count(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return self
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(values.size)]))
+        return self
+
+    def merge(self, other):
+        if other.weights.size == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+        return self
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cumulative = np.cumsum(weights)
+        q = (cumulative - weights / 2) / cumulative[-1]
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        bucket = np.floor(k + self.compression / 4).astype(np.int64)
+        _, bucket = np.unique(bucket, return_inverse=True)
+        new_weights = np.bincount(bucket, weights=weights)
+        self.means = np.bincount(bucket, weights=weights * means) / new_weights
+        self.weights = new_weights
+
+    def _knots(self):
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [self.count]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return positions, values
+
+    def quantile(self, q):
+        """
+        Approximate quantile(s) of the values seen so far.
+        """
+        if self.weights.size == 0:
+            return np.full(np.shape(q), np.nan)
+        positions, values = self._knots()
+        return np.interp(np.asarray(q, dtype=float) * self.count, positions, values)
+
+    def cdf(self, x):
+        """
+        Approximate fraction of values below ``x``.
+        """
+        if self.weights.size == 0:
+            return np.full(np.shape(x), np.nan)
+        positions, values = self._knots()
+        return np.interp(x, values, positions) / self.count
+
+    def histogram(self, bins=30):
+        """
+        Approximate histogram reconstructed from the sketch.
+
+        Returns:
+            tuple: (counts, bin edges) as from np.histogram.
+        """
+        edges = np.linspace(self.min, self.max, bins + 1)
+        return np.diff(self.cdf(edges)) * self.count, edges
+
+    def to_state(self):
+        return {"compression": self.compression, "means": self.means, "weights": self.weights,
+                "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_state(cls, state):
+        digest = cls(int(state["compression"]))
+        digest.means = np.asarray(state["means"], dtype=float)
+        digest.weights = np.asarray(state["weights"], dtype=float)
+        digest.min = float(state["min"])
+        digest.max = float(state["max"])
+        return digest
+
+class StreamingMetrics:
+    """
+    Regression metrics accumulated chunk by chunk.
+
+    MAE, RMSE, R2 and bias are exact; residual quantiles come from a
+    t-digest. A bottom-k random sample of (y_true, y_pred) pairs is kept for
+    scatter plots. Partial states from parallel workers combine with merge().
+    Residuals are y_true - y_pred; Bias is mean(y_pred - y_true).
+    """
+
+    def __init__(self, compression=DEFAULT_COMPRESSION, sample_size=DEFAULT_SAMPLE_SIZE, seed=None):
+        self.n = 0
+        self.sum_abs_error = 0.0
+        self.sum_squared_error = 0.0
+        self.sum_error = 0.0
+        self.mean_y = 0.0
+        self.m2_y = 0.0
+        self.residuals = TDigest(compression)
+        self.sample_size = sample_size
+        self.sample_keys = np.empty(0)
+        self.sample_true = np.empty(0)
+        self.sample_pred = np.empty(0)
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=float).ravel()
+        y_pred = np.asarray(y_pred, dtype=float).ravel()
+        if y_true.size == 0:
+            return self
+        residual = y_true - y_pred
+
+        self.sum_abs_error += np.abs(residual).sum()
+        self.sum_squared_error += (residual ** 2).sum()
+        self.sum_error -= residual.sum()
+        self._combine_moments(y_true.size, y_true.mean(), ((y_true - y_true.mean()) ** 2).sum())
+        self.residuals.update(residual)
+        self._combine_sample(self._rng.random(y_true.size), y_true, y_pred)
+        return self
+
+    def merge(self, other):
+        self.sum_abs_error += other.sum_abs_error
+        self.sum_squared_error += other.sum_squared_error
+        self.sum_error += other.sum_error
+        self._combine_moments(other.n, other.mean_y, other.m2_y)
+        self.residuals.merge(other.residuals)
+        self._combine_sample(other.sample_keys, other.sample_true, other.sample_pred)
+        return self
+
+    def _combine_moments(self, n, mean, m2):
+        # Chan et al. parallel update of the target mean and sum of squares
+        if n == 0:
+            return
+        total = self.n + n
+        delta = mean - self.mean_y
+        self.m2_y += m2 + delta ** 2 * self.n * n / total
+        self.mean_y += delta * n / total
+        self.n = total
+
+    def _combine_sample(self, keys, y_true, y_pred):
+        keys = np.concatenate([self.sample_keys, keys])
+        y_true = np.concatenate([self.sample_true, y_true])
+        y_pred = np.concatenate([self.sample_pred, y_pred])
+        if keys.size > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            keys, y_true, y_pred = keys[keep], y_true[keep], y_pred[keep]
+        self.sample_keys, self.sample_true, self.sample_pred = keys, y_true, y_pred
+
+    def result(self):
+        """
+        Returns:
+            dict: MAE, RMSE, R2 and Bias.
+        """
+        if self.n == 0:
+            return {"MAE": np.nan, "RMSE": np.nan, "R2": np.nan, "Bias": np.nan}
+        r2 = 1 - self.sum_squared_error / self.m2_y if self.m2_y > 0 else np.nan
+        return {
+            "MAE": self.sum_abs_error / self.n,
+            "RMSE": np.sqrt(self.sum_squared_error / self.n),
+            "R2": r2,
+            "Bias": self.sum_error / self.n,
+        }
+
+    def residual_quantiles(self, quantiles=(0.05, 0.5, 0.95)):
+        return dict(zip(quantiles, self.residuals.quantile(quantiles)))
+
+    def sample(self):
+        """
+        Returns:
+            tuple: (y_true, y_pred) uniform random sample of the scored pairs.
+        """
+        return self.sample_true, self.sample_pred
+
+    def to_state(self):
+        """
+        Flat dict of numbers and arrays, suitable for np.savez or pickling.
+        """
+        state = {
+            "n": self.n, "sum_abs_error": self.sum_abs_error, "sum_squared_error": self.sum_squared_error,
+            "sum_error": self.sum_error, "mean_y": self.mean_y, "m2_y": self.m2_y,
+            "sample_size": self.sample_size, "sample_keys": self.sample_keys,
+            "sample_true": self.sample_true, "sample_pred": self.sample_pred,
+        }
+        state.update({f"digest_{k}": v for k, v in self.residuals.to_state().items()})
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        metrics = cls(int(state["digest_compression"]), int(state["sample_size"]))
+        for name in ("sum_abs_error", "sum_squared_error", "sum_error", "mean_y", "m2_y"):
+            setattr(metrics, name, float(state[name]))
+        metrics.n = int(state["n"])
+        metrics.sample_keys = np.asarray(state["sample_keys"])
+        metrics.sample_true = np.asarray(state["sample_true"])
+        metrics.sample_pred = np.asarray(state["sample_pred"])
+        metrics.residuals = TDigest.from_state(
+            {k[len("digest_"):]: v for k, v in state.items() if k.startswith("digest_")}
+        )
+        return metrics
+
+def score_in_chunks(model, X, y, chunk_size=100_000, metrics=None):
+    """
+    Predicts and scores ``X`` chunk by chunk without keeping the predictions.
+
+    Args:
+        model: Fitted estimator.
+        X: Feature matrix (DataFrame or array).
+        y: Target values.
+        chunk_size: Rows per predict call.
+        metrics: Optional StreamingMetrics to update.
+
+    Returns:
+        StreamingMetrics: Updated accumulator.
+    """
+    metrics = metrics or StreamingMetrics(seed=42)
+    y = np.asarray(y, dtype=float)
+    for start in range(0, len(y), chunk_size):
+        stop = min(start + chunk_size, len(y))
+        X_chunk = X.iloc[start:stop] if hasattr(X, "iloc") else X[start:stop]
+        metrics.update(y[start:stop], model.predict(X_chunk))
+    return metrics
@@ -0,0 +1,203 @@
+import os
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from scipy.special import ndtr, ndtri
+
+from src.utils.config import START_DATE, END_DATE
+from src.utils.logger import get_logger
+from src.utils.constants import DEFAULT_LOCATIONS, EXPECTED_COLUMNS
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_HOURS = 24 * 30
+
+# Hourly persistence of the latent AR(1) processes
+PERSISTENCE = {
+    "synoptic": 0.98,
+    "rain": 0.85,
+    "temperature": 0.95,
+    "humidity": 0.9,
+    "wind": 0.9,
+}
+LATENTS = list(PERSISTENCE)
+
+# Departures from the latitude-based climatology for known cities
+CLIMATE_OVERRIDES = {
+    "Phoenix": {"wet_fraction": 0.015, "humidity": 30, "diurnal_amplitude": 8.0, "temperature": 24.0},
+    "Cairo": {"wet_fraction": 0.005, "humidity": 45, "diurnal_amplitude": 7.0},
+    "Denver": {"humidity": 45, "diurnal_amplitude": 8.0, "temperature": 10.5},
+    "Seattle": {"wet_fraction": 0.12, "seasonal_amplitude": 7.0},
+    "San Francisco": {"seasonal_amplitude": 3.5},
+    "London": {"wet_fraction": 0.11, "seasonal_amplitude": 7.0},
+    "Reykjavik": {"wet_fraction": 0.12, "temperature": 5.0, "seasonal_amplitude": 6.0},
+    "Singapore": {"wet_fraction": 0.14, "humidity": 82},
+    "Kuala Lumpur": {"wet_fraction": 0.14, "humidity": 80},
+    "Mumbai": {"monsoon": 1.0},
+    "Bangkok": {"monsoon": 0.8},
+    "Nairobi": {"temperature": 19.0},
+}
+
+def synthetic_locations(n_sites, seed=42):
+    """
+    Default cities followed by random extra sites ("site_0001", ...) when
+    more than len(DEFAULT_LOCATIONS) sites are requested.
+
+    Returns:
+        list: Location dicts with name, latitude and longitude.
+    """
+    locations = list(DEFAULT_LOCATIONS[:n_sites])
+    extra = n_sites - len(locations)
+    if extra > 0:
+        rng = np.random.default_rng([seed, n_sites])
+        latitudes = np.degrees(np.arcsin(rng.uniform(-0.94, 0.94, extra)))
+        longitudes = rng.uniform(-180, 180, extra)
+        locations += [{"name": f"site_{i + 1:04d}", "latitude": lat, "longitude": lon}
+                      for i, (lat, lon) in enumerate(zip(latitudes, longitudes))]
+    return locations
+
+def site_climatology(locations):
+    """
+    Per-site climate parameters derived from latitude plus CLIMATE_OVERRIDES.
+
+    Returns:
+        pd.DataFrame: One row per site.
+    """
+    lat = np.array([loc["latitude"] for loc in locations], dtype=float)
+    abs_lat = np.abs(lat)
+    tropical = abs_lat < 20
+    climate = pd.DataFrame({
+        "temperature": 28.0 - 0.35 * abs_lat,
+        "seasonal_amplitude": 0.28 * abs_lat,
+        "diurnal_amplitude": np.where(tropical, 3.5, 5.0),
+        "humidity": np.where(tropical, 78.0, 68.0),
+        "wet_fraction": np.where(tropical, 0.10, 0.07),
+        "monsoon": 0.0,
+        "hemisphere": np.where(lat < 0, -1.0, 1.0),
+    }, index=[loc["name"] for loc in locations])
+    for name, values in CLIMATE_OVERRIDES.items():
+        if name in climate.index:
+            for key, value in values.items():
+                climate.loc[name, key] = value
+    return climate
+
+def _calendar(times):
+    hours = times.hour.to_numpy(dtype=float)
+    day_of_year = times.dayofyear.to_numpy(dtype=float)
+    diurnal = np.cos(2 * np.pi * (hours - 15) / 24)        # peaks mid-afternoon
+    seasonal = np.cos(2 * np.pi * (day_of_year - 200) / 365.25)  # peaks mid-July
+    return diurnal[:, None], seasonal[:, None]
+
+def _weather_block(climate, times, latents):
+    """
+    Maps latent processes of shape (hours, sites) onto weather variables.
+    """
+    diurnal, seasonal = _calendar(times)
+    season = seasonal * climate["hemisphere"].to_numpy()
+
+    # Rain: wet where a mix of rain-cell and low-pressure latents exceeds the
+    # site's (seasonally modulated) wet-fraction quantile
+    wet_fraction = climate["wet_fraction"].to_numpy() * (1 + climate["monsoon"].to_numpy() * season)
+    threshold = ndtri(1 - np.clip(wet_fraction, 1e-4, 0.5))
+    rain_latent = (0.8 * latents["rain"] - 0.6 * latents["synoptic"])
+    wet = rain_latent > threshold
+    intensity = 0.8 * np.expm1(1.2 * (rain_latent - threshold)) + 0.1
+    rain = np.where(wet, np.round(np.clip(intensity, 0.1, 100), 1), 0.0)
+
+    temperature = (
+        climate["temperature"].to_numpy()
+        + climate["seasonal_amplitude"].to_numpy() * season
+        + climate["diurnal_amplitude"].to_numpy() * diurnal
+        + 2.5 * latents["temperature"]
+        - 1.5 * wet
+    )
+    humidity = (
+        climate["humidity"].to_numpy()
+        - 0.8 * climate["diurnal_amplitude"].to_numpy() * diurnal
+        + 10 * latents["humidity"]
+        + 15 * wet
+    )
+    cloudcover = 100 * ndtr(1.5 * (0.7 * rain_latent + 0.3 * latents["humidity"] - 0.2))
+    pressure = 1013 + 7 * latents["synoptic"] - 2 * wet
+    windspeed = 9 * np.exp(0.45 * latents["wind"] - 0.3 * latents["synoptic"]) * (1 + 0.2 * diurnal)
+
+    return {
+        "temperature_2m": np.round(temperature, 1),
+        "relative_humidity_2m": np.round(np.clip(humidity, 5, 100)),
+        "pressure_msl": np.round(pressure, 1),
+        "cloudcover": np.round(np.clip(cloudcover, 0, 100)),
+        "windspeed_10m": np.round(np.clip(windspeed, 0, None), 1),
+        "rain": rain,
+    }
+
+def generate_weather(n_sites=None, locations=None, start=START_DATE, end=END_DATE, seed=42,
+                     chunk_hours=DEFAULT_CHUNK_HOURS):
+    """
+    Streams synthetic hourly weather with the EXPECTED_COLUMNS schema.
+
+    Each site follows its climatology (latitude-based seasonal cycle and
+    CLIMATE_OVERRIDES) with diurnal cycles, persistent rain events and
+    synoptic pressure systems driven by AR(1) latents filtered with
+    scipy.signal.lfilter. Filter state is carried between chunks and the
+    noise is drawn time-major from one seeded generator, so the value for
+    every (location, time) depends only on the seed, not on chunk_hours.
+
+    Args:
+        n_sites: Number of sites (see synthetic_locations). Ignored if locations is given.
+        locations: Location dicts with name and latitude.
+        start: First day (inclusive).
+        end: Last day (inclusive, hourly through 23:00).
+        seed: Random seed.
+        chunk_hours: Hours per emitted chunk.
+
+    Yields:
+        pd.DataFrame: chunk_hours x sites rows, location-major like the API frames.
+    """
+    locations = locations or synthetic_locations(n_sites or len(DEFAULT_LOCATIONS), seed)
+    climate = site_climatology(locations)
+    names = climate.index.to_numpy()
+    n = len(names)
+    times = pd.date_range(start, pd.Timestamp(end) + pd.Timedelta(hours=23), freq="h")
+
+    rng = np.random.default_rng(seed)
+    phis = np.array([PERSISTENCE[name] for name in LATENTS])
+    # Start every latent in its stationary distribution
+    state = {name: rng.standard_normal(n) * PERSISTENCE[name] for name in LATENTS}
+
+    for lo in range(0, len(times), chunk_hours):
+        chunk_times = times[lo:lo + chunk_hours]
+        noise = rng.standard_normal((len(chunk_times), len(LATENTS), n))
+        latents = {}
+        for k, name in enumerate(LATENTS):
+            innovations = noise[:, k, :] * np.sqrt(1 - phis[k] ** 2)
+            latents[name], zf = lfilter([1.0], [1.0, -phis[k]], innovations, axis=0, zi=state[name][None, :])
+            state[name] = zf[0]
+
+        block = _weather_block(climate, chunk_times, latents)
+        frame = {column: values.T.ravel() for column, values in block.items()}
+        frame["location"] = np.repeat(names, len(chunk_times))
+        frame["time"] = np.tile(chunk_times.to_numpy(), n)
+        yield pd.DataFrame(frame)[EXPECTED_COLUMNS]
+
+def synthetic_weather(n_sites=None, locations=None, start=START_DATE, end=END_DATE, seed=42,
+                      chunk_hours=DEFAULT_CHUNK_HOURS):
+    """
+    Whole synthetic weather frame; see generate_weather.
+    """
+    return pd.concat(generate_weather(n_sites, locations, start, end, seed, chunk_hours), ignore_index=True)
+
+def write_synthetic_weather(path, n_sites=None, locations=None, start=START_DATE, end=END_DATE, seed=42,
+                            chunk_hours=DEFAULT_CHUNK_HOURS):
+    """
+    Streams synthetic weather to a CSV without holding it in memory.
+
+    Returns:
+        int: Rows written.
+    """
+    rows = 0
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for i, chunk in enumerate(generate_weather(n_sites, locations, start, end, seed, chunk_hours)):
+        chunk.to_csv(path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+        rows += len(chunk)
+    logger.info(f"Wrote {rows} synthetic weather rows to {path}")
+    return rows
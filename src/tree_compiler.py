@@ -0,0 +1,383 @@
+import os
+import json
+import numpy as np
+
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Model keys whose fitted estimators can be compiled
+COMPILABLE_MODELS = ["rf", "xgb", "stack"]
+
+MAGIC = b"TREEARR1"
+
+# Array data in the file starts on this alignment so every array can be memory-mapped
+ALIGNMENT = 64
+
+# Upper bound on (tree, row) pairs traversed at once; keeps the working set in cache
+MAX_BLOCK_ELEMENTS = 500_000
+
+# Traversal steps between dropping (tree, row) pairs that reached their leaf
+COMPACT_EVERY = 4
+
+# (tree, row) pairs from which a batch is walked by the numba kernel; below
+# this the one-off compile costs more than it saves
+NUMBA_MIN_ELEMENTS = 1_000_000
+
+# Compiled traversal kernel: None until first use, False without numba
+_KERNEL = None
+
+def _forest_arrays(trees, prefix):
+    """
+    Concatenates per-tree node arrays into one flat forest.
+
+    Nodes are renumbered breadth-first with siblings adjacent, so a split
+    only needs its left child (the right child is left + 1). Leaves point to
+    themselves with an infinite threshold, so extra traversal steps keep a
+    row on its leaf.
+
+    Args:
+        trees: List of dicts with feature, threshold (float32, rows with
+            x <= threshold go left), left, right, missing_left and value
+            arrays; left == -1 marks a leaf.
+        prefix: Array name prefix.
+
+    Returns:
+        tuple: (dict of arrays, maximum depth).
+    """
+    parts = {key: [] for key in ("feature", "threshold", "child", "missing_left", "value")}
+    roots, offset, max_depth = [], 0, 0
+    for tree in trees:
+        order, position, depth = _breadth_first(tree["left"], tree["right"])
+        leaf = tree["left"][order] < 0
+        nodes = np.arange(len(order))
+        parts["child"].append(np.where(leaf, nodes, position[np.maximum(tree["left"][order], 0)]) + offset)
+        parts["feature"].append(np.where(leaf, 0, tree["feature"][order]))
+        parts["threshold"].append(np.where(leaf, np.float32(np.inf), tree["threshold"][order]))
+        parts["missing_left"].append(np.where(leaf, True, tree["missing_left"][order]))
+        parts["value"].append(tree["value"][order])
+        roots.append(offset)
+        offset += len(order)
+        max_depth = max(max_depth, depth)
+
+    arrays = {
+        f"{prefix}feature": np.concatenate(parts["feature"]).astype(np.int32),
+        f"{prefix}threshold": np.concatenate(parts["threshold"]).astype(np.float32),
+        f"{prefix}child": np.concatenate(parts["child"]).astype(np.int32),
+        f"{prefix}missing_left": np.concatenate(parts["missing_left"]).astype(bool),
+        f"{prefix}value": np.concatenate(parts["value"]),
+        f"{prefix}roots": np.asarray(roots, dtype=np.int32),
+    }
+    return arrays, max_depth
+
+def _breadth_first(left, right):
+    """
+    Returns:
+        tuple: (old node index per new position, new position per old node
+        index, tree depth).
+    """
+    order, depth = [0], {0: 0}
+    position = np.zeros(len(left), dtype=np.int64)
+    for node in order:
+        if left[node] >= 0:
+            for child in (left[node], right[node]):
+                position[child] = len(order)
+                depth[child] = depth[node] + 1
+                order.append(child)
+    return np.asarray(order), position, max(depth.values())
+
+def _float32_at_most(threshold):
+    """
+    Largest float32 not above each float64 threshold, so that for float32
+    inputs x <= threshold gives the same answer in float32 as in float64.
+    """
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+def _compile_sklearn_forest(model, prefix):
+    trees = []
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        trees.append({
+            "feature": tree.feature,
+            "threshold": _float32_at_most(tree.threshold),
+            "left": tree.children_left,
+            "right": tree.children_right,
+            "missing_left": np.asarray(tree.missing_go_to_left, dtype=bool),
+            "value": tree.value[:, 0, 0],
+        })
+    arrays, max_depth = _forest_arrays(trees, prefix)
+    # sklearn casts X to float32, averages the trees and keeps float64 leaf values
+    meta = {"type": "forest", "prefix": prefix, "max_depth": max_depth,
+            "aggregate": "mean", "dtype": "float64", "base_score": 0.0}
+    return meta, arrays
+
+def _compile_xgboost(model, prefix):
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+    objective = learner["objective"]["name"]
+    if objective not in ("reg:squarederror", "reg:absoluteerror", "reg:pseudohubererror"):
+        raise ValueError(f"Cannot compile XGBoost objective {objective}")
+    base_score = float(np.float32(learner["learner_model_param"]["base_score"].strip("[]")))
+
+    trees = []
+    for tree in learner["gradient_booster"]["model"]["trees"]:
+        if any(tree["split_type"]):
+            raise ValueError("Cannot compile XGBoost models with categorical splits")
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        conditions = np.asarray(tree["split_conditions"], dtype=np.float32)
+        trees.append({
+            "feature": np.asarray(tree["split_indices"], dtype=np.int64),
+            # x < t is x <= the float32 just below t
+            "threshold": np.nextafter(conditions, np.float32(-np.inf)),
+            "left": left,
+            "right": np.asarray(tree["right_children"], dtype=np.int64),
+            "missing_left": np.asarray(tree["default_left"], dtype=bool),
+            # Leaves store their (learning-rate scaled) weight in split_conditions
+            "value": np.where(left < 0, conditions, np.float32(0)),
+        })
+    arrays, max_depth = _forest_arrays(trees, prefix)
+    # XGBoost sums float32 leaf weights onto base_score
+    meta = {"type": "forest", "prefix": prefix, "max_depth": max_depth,
+            "aggregate": "sum", "dtype": "float32", "base_score": base_score}
+    return meta, arrays
+
+def _compile_linear(model, prefix):
+    arrays = {f"{prefix}coef": np.asarray(model.coef_, dtype=np.float64).ravel()}
+    meta = {"type": "linear", "prefix": prefix, "intercept": float(model.intercept_)}
+    return meta, arrays
+
+def _compile(model, prefix):
+    from sklearn.ensemble import RandomForestRegressor, StackingRegressor
+    from sklearn.linear_model import LinearRegression
+
+    if isinstance(model, RandomForestRegressor):
+        return _compile_sklearn_forest(model, prefix)
+    if isinstance(model, LinearRegression):
+        return _compile_linear(model, prefix)
+    if isinstance(model, StackingRegressor):
+        if model.passthrough:
+            raise ValueError("Cannot compile a StackingRegressor with passthrough=True")
+        arrays, components = {}, []
+        for i, estimator in enumerate(model.estimators_):
+            meta, component_arrays = _compile(estimator, f"{prefix}e{i}_")
+            components.append(meta)
+            arrays.update(component_arrays)
+        final_meta, final_arrays = _compile(model.final_estimator_, f"{prefix}final_")
+        arrays.update(final_arrays)
+        return {"type": "stack", "components": components, "final": final_meta}, arrays
+    if type(model).__name__ in ("XGBRegressor", "Booster"):
+        return _compile_xgboost(model, prefix)
+    raise ValueError(f"Cannot compile model of type {type(model).__name__}")
+
+def _traverse_sum(X, roots, feature, threshold, child, missing_left, value, max_depth, total):
+    """
+    Walks each tree over every row and adds the leaf value reached to
+    ``total[row]``, tree by tree like the vectorized path. A row goes right
+    unless ``x <= threshold``; NaN follows ``missing_left``.
+    """
+    for tree in range(roots.shape[0]):
+        for row in range(X.shape[0]):
+            node = roots[tree]
+            for _ in range(max_depth):
+                x = X[row, feature[node]]
+                if x != x:
+                    go_right = not missing_left[node]
+                else:
+                    go_right = not (x <= threshold[node])
+                next_node = child[node] + go_right
+                if next_node == node:
+                    break
+                node = next_node
+            total[row] += value[node]
+
+def _numba_kernel():
+    """
+    _traverse_sum compiled with numba on first use, or None when numba
+    is not installed.
+    """
+    global _KERNEL
+    if _KERNEL is None:
+        try:
+            import numba
+        except ImportError:
+            logger.info("numba not installed; large batches use the numpy traversal")
+            _KERNEL = False
+        else:
+            _KERNEL = numba.njit(nogil=True)(_traverse_sum)
+    return _KERNEL or None
+
+class CompiledModel:
+    """
+    Tree ensembles (and the linear parts of a stack) flattened into
+    contiguous arrays: per node the split feature, threshold, left/right
+    child, missing-value direction and leaf value.
+
+    predict() walks every tree of a row block at once with vectorized
+    gathers (large batches go through a numba kernel when numba is
+    installed) and reproduces the source library's arithmetic (float32 inputs,
+    split thresholds rounded so float32 comparisons decide like the
+    library, leaf values summed tree by tree), so outputs match the fitted
+    model exactly.
+    """
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.arrays = arrays
+
+    @property
+    def n_features(self):
+        return self.meta.get("n_features")
+
+    def predict(self, X):
+        X = X.to_numpy(dtype=float) if hasattr(X, "to_numpy") else np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[None, :]
+        return self._predict(self.meta["model"], X)
+
+    def _predict(self, meta, X):
+        if meta["type"] == "forest":
+            return self._predict_forest(meta, X)
+        if meta["type"] == "linear":
+            return X @ self.arrays[meta["prefix"] + "coef"] + meta["intercept"]
+        if meta["type"] == "stack":
+            features = np.column_stack([self._predict(component, X) for component in meta["components"]])
+            return self._predict(meta["final"], features)
+        raise ValueError(f"Unknown compiled model type: {meta['type']}")
+
+    def _predict_forest(self, meta, X):
+        prefix = meta["prefix"]
+        feature = np.asarray(self.arrays[prefix + "feature"])
+        threshold = np.asarray(self.arrays[prefix + "threshold"])
+        child = np.asarray(self.arrays[prefix + "child"])
+        missing_left = np.asarray(self.arrays[prefix + "missing_left"])
+        value = np.asarray(self.arrays[prefix + "value"])
+        roots = np.asarray(self.arrays[prefix + "roots"])
+        dtype = np.dtype(meta["dtype"])
+        n_trees = len(roots)
+
+        n_rows = X.shape[0]
+        kernel = _numba_kernel() if n_rows * n_trees >= NUMBA_MIN_ELEMENTS else None
+        if kernel is not None:
+            # Same float32 decisions and tree-by-tree sums as the blocked path below
+            total = np.full(n_rows, meta["base_score"], dtype=dtype)
+            kernel(np.ascontiguousarray(X, dtype=np.float32), roots, feature, threshold, child, missing_left,
+                   value.astype(dtype), meta["max_depth"], total)
+            if meta["aggregate"] == "mean":
+                total /= n_trees
+            return total
+
+        out = np.empty(n_rows, dtype=dtype)
+        block = max(1, MAX_BLOCK_ELEMENTS // n_trees)
+        offsets_width, feature_offsets = None, None
+        for start in range(0, n_rows, block):
+            stop = min(start + block, n_rows)
+            width = stop - start
+            # Feature-major block: row r of feature f sits at f * width + r
+            flat = np.ascontiguousarray(X[start:stop].T, dtype=np.float32).ravel()
+            if width != offsets_width:
+                offsets_width = width
+                feature_offsets = feature if width == 1 else feature.astype(np.int64) * width
+            has_missing = bool(np.isnan(flat).any())
+
+            # (tree, row) pairs still descending, flattened tree-major
+            node = np.repeat(roots, width)
+            pair = np.arange(n_trees * width)
+            row = np.tile(np.arange(width), n_trees)
+            final = np.empty_like(node)
+            for step in range(1, meta["max_depth"] + 1):
+                x = np.take(flat, np.take(feature_offsets, node) + row)
+                go_right = ~(x <= np.take(threshold, node))
+                if has_missing:
+                    missing = np.isnan(x)
+                    go_right[missing] = ~missing_left[node[missing]]
+                parent, node = node, np.take(child, node) + go_right
+                # Leaves loop onto themselves; pairs that stopped moving are done
+                if step % COMPACT_EVERY == 0:
+                    moving = node != parent
+                    final[pair[~moving]] = node[~moving]
+                    node, pair, row = node[moving], pair[moving], row[moving]
+                    if node.size == 0:
+                        break
+            final[pair] = node
+
+            # Trees are added one at a time, in order, like the source libraries
+            leaves = np.take(value, final).reshape(n_trees, width).astype(dtype, copy=False)
+            total = np.full(width, meta["base_score"], dtype=dtype)
+            for tree_values in leaves:
+                total += tree_values
+            if meta["aggregate"] == "mean":
+                total /= n_trees
+            out[start:stop] = total
+        return out
+
+    def save(self, path):
+        """
+        Writes one file: magic, header length, JSON header, then every array
+        at an ALIGNMENT-byte offset so load() can memory-map them.
+        """
+        entries, offset = {}, 0
+        for name, array in self.arrays.items():
+            array = np.ascontiguousarray(array)
+            offset = -(-offset // ALIGNMENT) * ALIGNMENT
+            entries[name] = {"dtype": array.dtype.str, "shape": list(array.shape), "offset": offset}
+            offset += array.nbytes
+        header = json.dumps({"meta": self.meta, "arrays": entries}).encode("utf-8")
+        data_start = -(-(len(MAGIC) + 8 + len(header)) // ALIGNMENT) * ALIGNMENT
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            for name, array in self.arrays.items():
+                f.seek(data_start + entries[name]["offset"])
+                f.write(np.ascontiguousarray(array).tobytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Loads a compiled model; with mmap the arrays are mapped read-only
+        instead of read, so loading costs the same for any model size.
+        """
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a compiled tree model")
+            header_length = int.from_bytes(f.read(8), "little")
+            header = json.loads(f.read(header_length))
+            data_start = -(-(len(MAGIC) + 8 + header_length) // ALIGNMENT) * ALIGNMENT
+            arrays = {}
+            for name, entry in header["arrays"].items():
+                dtype, shape = np.dtype(entry["dtype"]), tuple(entry["shape"])
+                if mmap and int(np.prod(shape)) > 0:
+                    arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=data_start + entry["offset"],
+                                             shape=shape)
+                else:
+                    f.seek(data_start + entry["offset"])
+                    arrays[name] = np.frombuffer(f.read(dtype.itemsize * int(np.prod(shape))), dtype=dtype).reshape(shape)
+        return cls(header["meta"], arrays)
+
+def compile_model(model, feature_names=None):
+    """
+    Flattens a fitted RandomForestRegressor, XGBRegressor or the stack
+    model (linear, forest and XGBoost members with a linear final
+    estimator) into a CompiledModel.
+
+    Args:
+        model: Fitted estimator.
+        feature_names: Optional training feature names, kept for reference.
+
+    Returns:
+        CompiledModel: Array-based predictor.
+    """
+    meta, arrays = _compile(model, "m_")
+    n_features = getattr(model, "n_features_in_", None)
+    compiled = CompiledModel({"model": meta, "n_features": n_features,
+                              "feature_names": list(feature_names) if feature_names is not None else None},
+                             arrays)
+    size = sum(array.nbytes for array in arrays.values())
+    logger.info(f"Compiled {type(model).__name__} into {len(arrays)} arrays ({size / 1e6:.1f} MB)")
+    return compiled
@@ -1,15 +1,34 @@
 import os
-from dotenv import load_dotenv
+from functools import lru_cache
 
-# Load environment variables from .env file at project root
+# .env file at project root
 env_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".env"))
-load_dotenv(dotenv_path=env_path)
 
-# Access specific variables
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY")
+@lru_cache(maxsize=None)
+def _load_env():
+    from dotenv import load_dotenv
+    load_dotenv(dotenv_path=env_path)
 
-if OPENWEATHER_API_KEY is None:
-    raise ValueError("Missing OPENWEATHER_API_KEY in .env file")
+def get_openweather_api_key():
+    """
+    Returns the OpenWeatherMap API key, loading .env on first use.
+
+    Raises:
+        ValueError: If the key is not configured.
+    """
+    _load_env()
+    key = os.getenv("OPENWEATHER_API_KEY")
+    if key is None:
+        raise ValueError("Missing OPENWEATHER_API_KEY in .env file")
+    return key
+
+def __getattr__(name):
+    # OPENWEATHER_API_KEY is resolved on access so importing this module
+    # never requires the key
+    if name == "OPENWEATHER_API_KEY":
+        _load_env()
+        return os.getenv("OPENWEATHER_API_KEY")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Time range for historical data
 START_DATE = "2023-01-01"
@@ -39,3 +58,14 @@ DROP_COLUMNS = [
     "wind_power"
 ]
 
+
+# Windowed weather features (see src/window_features.py); windows and lags
+# are counted in rows, i.e. hours for hourly data
+WINDOW_FEATURE_COLUMNS = [
+    "rain",
+    "relative_humidity_2m",
+    "windspeed_10m",
+    "pressure_msl"
+]
+WINDOW_LAGS = [1, 3]
+WINDOW_SIZES = [3, 24]
@@ -0,0 +1,39 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+# Seconds a writer waits for another process to release the database lock
+BUSY_TIMEOUT_S = 30
+
+def connect_sqlite(path):
+    """
+    Opens a SQLite database in WAL mode so readers never block writers and
+    several processes can append concurrently.
+
+    Args:
+        path: Database file path. Parent directories are created.
+
+    Returns:
+        sqlite3.Connection: Connection in autocommit mode; use write_transaction
+        to group writes.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_S, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+@contextmanager
+def write_transaction(conn):
+    """
+    Runs a block of writes in one IMMEDIATE transaction. The write lock is
+    taken up front, so concurrent writers queue instead of failing mid-way.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
@@ -0,0 +1,174 @@
+import os
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+
+from src.utils.config import START_DATE, END_DATE
+
+CONFIG_PATH = Path(__file__).resolve().parents[2] / "config.yaml"
+
+# Environment variables named SIGNAL_<FIELD> (e.g. SIGNAL_WORKERS=4) override config.yaml
+ENV_PREFIX = "SIGNAL_"
+
+STORAGE_FORMATS = {"csv": ".csv", "csv.gz": ".csv.gz", "parquet": ".parquet"}
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Pipeline settings, resolved once per process from (lowest to highest
+    precedence) the defaults below, the ``pipeline`` section of
+    config.yaml, SIGNAL_* environment variables and CLI overrides.
+
+    Directory settings are relative to project_root unless absolute; use
+    path() to resolve them.
+    """
+
+    project_root: str
+    models: tuple = ("lr", "rf", "xgb", "poly", "stack")
+    seed: int = 42
+    start_date: str = START_DATE
+    end_date: str = END_DATE
+    # Parallelism: worker count and executor backend (inline, thread, process
+    # or dask; see src/executor.py), plus a dask scheduler address for clusters
+    workers: int = 1
+    executor: str = "process"
+    executor_address: str = ""
+    # Rows per predict call when scoring, per chunk for out-of-core training
+    # and per batch when monitoring
+    scoring_chunk_size: int = 100_000
+    incremental_chunk_size: int = 100_000
+    monitor_batch_size: int = 10_000
+    # Signal simulation
+    simulation_engine: str = "legacy"
+    missing_rate: float = 0.02
+    outlier_rate: float = 0.015
+    # Simulated signal file format: csv, csv.gz or parquet
+    storage_format: str = "csv"
+    # Add per-location lag / rolling-window features (src/window_features.py)
+    # to the engineered features; changes the feature set of every model
+    window_features: bool = False
+    # Cache locations; raw API payloads are kept in the content-addressed archive
+    archive_dir: str = "data/archive"
+    predictions_dir: str = "results/predictions"
+    checkpoint_dir: str = "results/checkpoints"
+    # Compiled tree models written by `evaluate --export`
+    model_dir: str = "results/models"
+    # Cached model explanations written by `evaluate --explain`
+    explain_dir: str = "results/explanations"
+    # Hour / day / month signal rollups kept up to date by `simulate`
+    history_path: str = "results/signal_history.sqlite"
+
+    def __post_init__(self):
+        if self.storage_format not in STORAGE_FORMATS:
+            raise ValueError(f"Unknown storage_format {self.storage_format!r}; "
+                             f"expected one of {sorted(STORAGE_FORMATS)}")
+        if self.executor not in ("inline", "thread", "process", "dask"):
+            raise ValueError(f"Unknown executor {self.executor!r}")
+        if self.simulation_engine not in ("legacy", "itu"):
+            raise ValueError(f"Unknown simulation_engine {self.simulation_engine!r}")
+        for name in ("workers", "scoring_chunk_size", "incremental_chunk_size", "monitor_batch_size"):
+            if getattr(self, name) < 1:
+                raise ValueError(f"{name} must be at least 1")
+
+    def path(self, *parts):
+        """
+        Joins parts onto project_root (absolute parts are returned as is).
+        """
+        return os.path.join(self.project_root, *parts)
+
+    @property
+    def signal_path(self):
+        return self.path("data", "simulated", "signal_latest" + STORAGE_FORMATS[self.storage_format])
+
+_FIELDS = {f.name: f for f in fields(Settings)}
+
+def _coerce(name, value):
+    """
+    Converts a YAML, environment or CLI value to the type of field ``name``.
+    """
+    if name not in _FIELDS:
+        raise KeyError(f"Unknown setting: {name}")
+    kind = _FIELDS[name].type
+    if kind is tuple:
+        if isinstance(value, str):
+            value = [item for item in value.replace(",", " ").split() if item]
+        return tuple(value)
+    if kind is bool and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return kind(value)
+
+def _read_config(config_path):
+    import yaml
+
+    if not config_path.exists():
+        raise FileNotFoundError(f"Config file not found at: {config_path}")
+    try:
+        with config_path.open("r") as f:
+            return yaml.safe_load(f) or {}
+    except yaml.YAMLError as e:
+        raise yaml.YAMLError(f"Error parsing YAML file: {e}")
+
+def load_settings(config_path=None, environ=None, **overrides):
+    """
+    Builds Settings from config.yaml, the environment and explicit overrides.
+
+    A relative ``paths.project_root`` is resolved against the directory of
+    config.yaml, so the checked-in config works from any clone.
+
+    Args:
+        config_path: YAML file (defaults to $SIGNAL_CONFIG or the repo's config.yaml).
+        environ: Mapping used instead of os.environ.
+        **overrides: Highest-precedence values, e.g. from the CLI.
+
+    Returns:
+        Settings: Validated settings.
+    """
+    environ = os.environ if environ is None else environ
+    config_path = Path(config_path or environ.get(ENV_PREFIX + "CONFIG") or CONFIG_PATH)
+    config = _read_config(config_path)
+
+    values = {}
+    try:
+        values["project_root"] = config["paths"]["project_root"]
+    except KeyError as e:
+        raise KeyError(f"Missing key in config.yaml: {e}")
+    values.update(config.get("pipeline") or {})
+    for name in _FIELDS:
+        if ENV_PREFIX + name.upper() in environ:
+            values[name] = environ[ENV_PREFIX + name.upper()]
+    values.update({k: v for k, v in overrides.items() if v is not None})
+
+    values = {name: _coerce(name, value) for name, value in values.items()}
+    values["project_root"] = str((config_path.parent / os.path.expanduser(values["project_root"])).resolve())
+    return Settings(**values)
+
+_settings = None
+
+def get_settings():
+    """
+    Process-wide settings; config.yaml is read on first use only.
+    """
+    global _settings
+    if _settings is None:
+        _settings = load_settings()
+    return _settings
+
+def configure(**overrides):
+    """
+    Applies overrides (None values are ignored) to the process-wide settings.
+
+    Returns:
+        Settings: The updated settings.
+    """
+    global _settings
+    overrides = {k: _coerce(k, v) for k, v in overrides.items() if v is not None}
+    if "project_root" in overrides:
+        overrides["project_root"] = os.path.abspath(os.path.expanduser(overrides["project_root"]))
+    _settings = replace(get_settings(), **overrides)
+    return _settings
+
+def reset_settings():
+    """
+    Forgets cached settings so the next get_settings() reloads them.
+    """
+    global _settings
+    _settings = None
@@ -22,10 +22,46 @@ def validate_simulation_input(df, required_columns):
         raise ValueError(f"Missing required columns for simulation: {missing}")
     print("Input schema validated.")
 
-def get_latest_historical_file(project_root):
+def get_latest_historical_entry(project_root):
+    """
+    Newest historical weather file: the latest archived collection (an
+    indexed lookup, see src.archive), falling back to scanning
+    data/processed for files written before the archive existed.
+
+    Returns:
+        dict: path to read and the file's name (the name it was archived
+        under, not the content-addressed object name).
+    """
+    from src.archive import latest_archived_entry
+
+    archived = latest_archived_entry(project_root, "historical")
+    if archived:
+        return {"path": archived["path"], "name": archived["name"]}
     processed_dir = os.path.join(project_root, "data", "processed")
     files = [f for f in os.listdir(processed_dir) if f.startswith("weather_historical_")]
     if not files:
         raise FileNotFoundError(f"No historical weather files found in {processed_dir}")
     latest_file = max(files, key=lambda x: os.path.getctime(os.path.join(processed_dir, x)))
-    return os.path.join("data", "processed", latest_file)
\ No newline at end of file
+    return {"path": os.path.join(processed_dir, latest_file), "name": latest_file}
+
+def get_latest_historical_file(project_root):
+    return get_latest_historical_entry(project_root)["path"]
+
+def read_table(path, **kwargs):
+    """
+    Reads a CSV (optionally gzip-compressed) or Parquet file, chosen by extension.
+    """
+    import pandas as pd
+
+    if str(path).endswith(".parquet"):
+        return pd.read_parquet(path, **kwargs)
+    return pd.read_csv(path, **kwargs)
+
+def write_table(df, path):
+    """
+    Writes a DataFrame as CSV (gzip-compressed for .csv.gz) or Parquet, chosen by extension.
+    """
+    if str(path).endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
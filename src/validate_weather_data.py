@@ -13,7 +13,6 @@ from src.data_validation import (
 )
 
 logger = get_logger(__name__)
-project_root = load_project_root()
 
 def validate_weather_data(file_path):
     """
@@ -25,7 +24,7 @@ def validate_weather_data(file_path):
     Returns:
         pd.DataFrame: Cleaned DataFrame with valid rows.
     """
-    full_path = os.path.join(project_root, file_path)
+    full_path = os.path.join(load_project_root(), file_path)
     logger.info(f"Loading data from {full_path}")
     df = pd.read_csv(full_path)
 
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+from src.utils.config import WINDOW_FEATURE_COLUMNS, WINDOW_LAGS, WINDOW_SIZES
+
+def window_feature_names(columns=WINDOW_FEATURE_COLUMNS, lags=WINDOW_LAGS, windows=WINDOW_SIZES):
+    names = []
+    for column in columns:
+        names += [f"{column}_lag{k}" for k in lags]
+        for w in windows:
+            names += [f"{column}_mean{w}h", f"{column}_std{w}h", f"{column}_max{w}h"]
+        names.append(f"{column}_diff1")
+    return names
+
+def _group_layout(df, group_column, time_column):
+    """
+    Sort order by (group, time) and, for every sorted row, the sorted
+    position where its group starts.
+    """
+    codes = pd.factorize(df[group_column])[0]
+    order = np.lexsort((df[time_column].to_numpy(), codes))
+    sorted_codes = codes[order]
+    boundary = np.r_[True, sorted_codes[1:] != sorted_codes[:-1]]
+    start = np.maximum.accumulate(np.where(boundary, np.arange(len(df)), 0))
+    return order, sorted_codes, start
+
+def _rolling_mean_std(values, start, window):
+    # Cumulative-sum trick: window sums are differences of running sums.
+    # Values are centred first to limit cancellation in the sum of squares.
+    idx = np.arange(len(values))
+    lo = np.maximum(idx - window + 1, start)
+    valid = ~np.isnan(values)
+    centred = np.where(valid, values - np.nanmean(values), 0.0) if valid.any() else np.zeros(len(values))
+
+    def window_sum(x):
+        running = np.concatenate([[0.0], np.cumsum(x)])
+        return running[idx + 1] - running[lo]
+
+    count = window_sum(valid.astype(float))
+    s1 = window_sum(centred)
+    s2 = window_sum(centred ** 2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s1 / count + (np.nanmean(values) if valid.any() else 0.0)
+        var = np.where(count > 1, (s2 - s1 ** 2 / count) / (count - 1), 0.0)
+    std = np.sqrt(np.clip(var, 0.0, None))
+    std[count == 0] = np.nan
+    return mean, std
+
+def add_window_features(df, columns=WINDOW_FEATURE_COLUMNS, lags=WINDOW_LAGS, windows=WINDOW_SIZES,
+                        group_column="location", time_column="time"):
+    """
+    Adds per-location lag, rolling mean/std/max and first-difference features.
+
+    Rows are ordered by time within each location and windows count rows,
+    so hourly data gives hour-based windows. Windows and lags are truncated
+    at the start of each location's series (a lag there repeats the first
+    value), so no missing values are introduced. Columns absent from ``df``
+    are skipped.
+
+    Args:
+        df: DataFrame with the group, time and weather columns.
+        columns: Weather columns to derive features from.
+        lags: Lags in rows.
+        windows: Rolling window sizes in rows.
+        group_column: Column identifying the series (location).
+        time_column: Column used to order each series.
+
+    Returns:
+        pd.DataFrame: ``df`` with the window feature columns appended, rows
+        in their original order.
+    """
+    columns = [c for c in columns if c in df.columns]
+    if not columns or df.empty:
+        return df
+
+    order, sorted_codes, start = _group_layout(df, group_column, time_column)
+    idx = np.arange(len(df))
+    features = {}
+
+    def scatter(sorted_values):
+        # Map values computed in (group, time) order back to the original rows
+        out = np.empty(len(df))
+        out[order] = sorted_values
+        return out
+
+    for column in columns:
+        values = df[column].to_numpy(dtype=float)[order]
+        for k in lags:
+            features[f"{column}_lag{k}"] = scatter(values[np.maximum(idx - k, start)])
+        for w in windows:
+            mean, std = _rolling_mean_std(values, start, w)
+            rolling_max = (
+                pd.Series(values).groupby(sorted_codes, sort=False).rolling(w, min_periods=1).max().to_numpy()
+            )
+            features[f"{column}_mean{w}h"] = scatter(mean)
+            features[f"{column}_std{w}h"] = scatter(std)
+            features[f"{column}_max{w}h"] = scatter(rolling_max)
+        features[f"{column}_diff1"] = scatter(values - values[np.maximum(idx - 1, start)])
+
+    return pd.concat([df, pd.DataFrame(features, index=df.index)], axis=1)
+
+def update_window_features(history, new_rows, columns=WINDOW_FEATURE_COLUMNS, lags=WINDOW_LAGS,
+                           windows=WINDOW_SIZES, group_column="location", time_column="time"):
+    """
+    Window features for newly appended rows, recomputing only the tail.
+
+    Only the last rows of each location in ``history`` that can fall inside
+    a window or lag are combined with ``new_rows``; the result equals a full
+    recomputation over history + new_rows as long as ``history`` is in time
+    order within each location and the new rows are later.
+
+    Args:
+        history: Previously seen rows (raw weather columns are enough).
+        new_rows: Rows to featurize.
+        columns, lags, windows, group_column, time_column: As for add_window_features.
+
+    Returns:
+        pd.DataFrame: ``new_rows`` with the window feature columns appended.
+    """
+    span = max(max(windows, default=1), max(lags, default=0) + 1, 2)
+    keep = [c for c in (group_column, time_column, *columns) if c in history.columns]
+    tail = history[keep].groupby(group_column, sort=False).tail(span)
+    combined = pd.concat([tail, new_rows[keep]], ignore_index=True)
+    featured = add_window_features(combined, columns, lags, windows, group_column, time_column)
+    added = featured.columns[len(keep):]
+    result = featured[added].iloc[len(tail):].set_axis(new_rows.index)
+    return pd.concat([new_rows, result], axis=1)
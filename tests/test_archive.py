@@ -0,0 +1,69 @@
+import os
+import gzip
+import pandas as pd
+import pytest
+
+from src.archive import PayloadArchive, latest_archived_entry
+from src.utils.settings import get_settings
+from src.utils.utils import get_latest_historical_entry
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = PayloadArchive(str(tmp_path / "archive"))
+    yield archive
+    archive.close()
+
+def _object_files(archive):
+    return [f for _, _, files in os.walk(os.path.join(archive.root, "objects")) for f in files]
+
+def test_identical_payloads_are_stored_once(archive):
+    first = archive.put_json({"main": {"temp": 12.5}, "name": "Seattle"}, kind="current", location="Seattle")
+    # Key order does not change the canonical payload
+    second = archive.put_json({"name": "Seattle", "main": {"temp": 12.5}}, kind="current", location="Seattle")
+    archive.put_json({"main": {"temp": 30.0}}, kind="current", location="Miami")
+
+    assert first == second
+    assert len(_object_files(archive)) == 2
+    stats = archive.stats()
+    assert stats["entries"] == 3 and stats["payloads"] == 2
+    assert archive.get_json(first) == {"main": {"temp": 12.5}, "name": "Seattle"}
+
+def test_latest_is_per_kind_and_location(archive):
+    archive.put(b"a", kind="current", location="Seattle", fetched_at="2025-01-01 00:00:00.000000")
+    newest = archive.put(b"b", kind="current", location="Seattle", fetched_at="2025-01-02 00:00:00.000000")
+    archive.put(b"c", kind="current", location="Denver", fetched_at="2025-01-03 00:00:00.000000")
+
+    assert archive.latest("current", "Seattle")["hash"] == newest
+    assert archive.latest("historical") is None
+
+def test_archived_file_is_readable_in_place(archive, tmp_path):
+    path = tmp_path / "weather_historical_1.csv"
+    df = pd.DataFrame({"location": ["Seattle", "Denver"], "rain": [0.5, 0.0]})
+    df.to_csv(path, index=False)
+
+    content_hash = archive.put_file(str(path), kind="historical")
+    entry = archive.latest("historical")
+    assert entry["hash"] == content_hash
+    assert entry["name"] == "weather_historical_1.csv"
+    with gzip.open(entry["path"], "rb") as f:
+        assert f.read() == path.read_bytes()
+    pd.testing.assert_frame_equal(pd.read_csv(entry["path"]), df)
+
+def test_lookup_does_not_create_an_archive(tmp_path):
+    assert latest_archived_entry(str(tmp_path), "historical") is None
+    assert not os.listdir(tmp_path)
+
+def test_latest_historical_file_keeps_its_archived_name(tmp_path):
+    path = tmp_path / "weather_historical_20250813_0006.csv"
+    pd.DataFrame({"location": ["Seattle"], "rain": [0.5]}).to_csv(path, index=False)
+    archive = PayloadArchive(os.path.join(str(tmp_path), get_settings().archive_dir))
+    try:
+        content_hash = archive.put_file(str(path), kind="historical")
+    finally:
+        archive.close()
+
+    # The run store records the collection's name, not the content-addressed object
+    entry = get_latest_historical_entry(str(tmp_path))
+    assert entry["name"] == "weather_historical_20250813_0006.csv"
+    assert os.path.basename(entry["path"]).startswith(content_hash)
@@ -0,0 +1,95 @@
+import os
+import sys
+import subprocess
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+HEAVY_MODULES = ["numpy", "pandas", "sklearn", "xgboost", "matplotlib", "seaborn", "yaml", "dotenv", "debugpy"]
+
+
+def _run(code):
+    return subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+
+def test_importing_main_is_lightweight():
+    """
+    Heavy libraries and config.yaml must only load inside a subcommand.
+    """
+    result = _run(
+        "import sys, main; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert result.stdout.strip() == ""
+
+def test_subcommand_help():
+    for command in ("collect", "simulate", "evaluate", "report"):
+        result = subprocess.run([sys.executable, "main.py", command, "--help"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True)
+        assert result.returncode == 0
+        assert command in result.stdout
+
+def test_parse_args_defaults_to_full_run():
+    import main
+    from src.utils.settings import reset_settings
+
+    args = main.parse_args([])
+    assert args.func is main.cmd_run
+    try:
+        settings = main.apply_settings(args)
+    finally:
+        reset_settings()
+    assert args.models == list(settings.models)
+
+def test_cli_options_override_settings():
+    import main
+    from src.utils.settings import reset_settings
+
+    args = main.parse_args(["--set", "scoring_chunk_size=5000", "--set", "models=lr,rf",
+                            "evaluate", "--workers", "3"])
+    try:
+        settings = main.apply_settings(args)
+    finally:
+        reset_settings()
+    assert settings.scoring_chunk_size == 5000
+    assert settings.workers == 3
+    assert args.models == ["lr", "rf"]
+
+def test_signals_query_without_range_covers_all_history(tmp_path, monkeypatch, capsys):
+    import main
+    import pandas as pd
+    from src.signal_history import SignalHistory
+    from src.utils.settings import reset_settings
+
+    # Outside the default start_date / end_date settings
+    times = pd.date_range("2024-03-01", periods=72, freq="h").strftime("%Y-%m-%d %H:%M:%S")
+    history = SignalHistory(str(tmp_path / "results" / "signal_history.sqlite"))
+    history.ingest(pd.DataFrame({"time": times, "location": "Seattle", "signal_dbm": -70.0}))
+    history.close()
+
+    monkeypatch.setenv("SIGNAL_PROJECT_ROOT", str(tmp_path))
+    reset_settings()
+    try:
+        args = main.parse_args(["signals", "query", "--level", "day", "--quantiles"])
+        main.apply_settings(args)
+        assert args.range_start is None and args.range_end is None
+        args.func(args)
+    finally:
+        reset_settings()
+    output = capsys.readouterr().out
+    assert "2024-03-01" in output and "2024-03-03" in output
+
+def test_incremental_evaluate_uses_its_own_models(capsys):
+    import main
+    from src.incremental import INCREMENTAL_MODELS
+    from src.utils.settings import reset_settings
+
+    args = main.parse_args(["evaluate", "--incremental"])
+    try:
+        main.apply_settings(args)
+    finally:
+        reset_settings()
+    assert args.models == list(INCREMENTAL_MODELS)
+    assert main.parse_args(["evaluate", "--incremental", "--models", "xgb"]).models == ["xgb"]
+
+    with pytest.raises(SystemExit):
+        main.parse_args(["evaluate", "--incremental", "--models", "sgd", "lr"])
+    assert "--incremental supports sgd, xgb; got lr" in capsys.readouterr().err
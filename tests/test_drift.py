@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.drift import POOLED, DriftMonitor, DriftReference, SignalAnomalyDetector, build_reference
+
+
+def _weather(n, seed, rain_scale=1.0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "time": pd.date_range("2023-01-01", periods=n, freq="h"),
+        "location": rng.choice(["Seattle", "Denver"], n),
+        "rain": rng.exponential(0.5 * rain_scale, n),
+        "windspeed_10m": rng.uniform(0, 15, n),
+        "signal_dbm": rng.normal(-70, 1, n),
+    })
+
+
+@pytest.fixture
+def reference(tmp_path):
+    path = tmp_path / "reference.npz"
+    build_reference(_weather(20000, seed=0)).save(path)
+    return DriftReference.load(path)
+
+
+def test_shifted_feature_is_flagged(reference):
+    monitor = DriftMonitor(reference)
+    assert not monitor.update(_weather(5000, seed=1))["drift"].any()
+
+    shifted = _weather(5000, seed=2, rain_scale=2.0)
+    shifted.loc[:99, "location"] = "Tokyo"
+    report = monitor.update(shifted).set_index(["location", "feature"])
+    assert report.loc[("seattle", "rain"), "drift"] and report.loc[("denver", "rain"), "drift"]
+    assert not report.loc[("seattle", "windspeed_10m"), "drift"]
+    assert report.loc[(POOLED, "rain"), "n"] == 100
+
+
+def test_signal_anomalies():
+    detector = SignalAnomalyDetector(window=48, min_history=24)
+    detector.update(_weather(400, seed=3))
+
+    batch = _weather(400, seed=4)
+    batch["time"] += pd.Timedelta(days=30)
+    denver = batch.index[batch["location"] == "Denver"]
+    batch.loc[denver[3], "signal_dbm"] = -90.0
+    batch.loc[denver[5], "signal_dbm"] = np.nan
+    batch.loc[batch["location"] == "Seattle", "signal_dbm"] = -71.25
+
+    scored = detector.update(batch)
+    assert scored.loc[denver[3], "flag"] == "spike"
+    assert scored.loc[denver[5], "flag"] == "outage"
+    seattle = scored[scored["location"] == "seattle"]
+    assert (seattle["flag"].iloc[-10:] == "flatline").all()
+    assert all(len(buffer) == 48 for buffer in detector.buffers.values())
@@ -0,0 +1,100 @@
+import time
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.executor import DaskExecutor, Executor, InlineExecutor, ProcessExecutor, ThreadExecutor, attach, get_executor
+from src.signal_simulation import simulate_legacy_sharded
+from src.utils.settings import configure, reset_settings
+
+
+def _column_sum(shared, column, scale):
+    return float(attach(shared)[column].sum() * scale)
+
+def _fail(x):
+    raise ValueError(f"bad task {x}")
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"a": rng.normal(size=1000), "b": rng.integers(0, 9, 1000),
+                         "location": rng.choice(["Seattle", "Tokyo", "Miami"], 1000)})
+
+def _dask_available():
+    try:
+        import dask.distributed  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+BACKENDS = ["inline", "thread", "process",
+            pytest.param("dask", marks=pytest.mark.skipif(not _dask_available(), reason="needs dask[distributed]"))]
+EXECUTOR_CLASSES = {"inline": InlineExecutor, "thread": ThreadExecutor, "process": ProcessExecutor,
+                    "dask": DaskExecutor}
+
+def test_executor_requires_submit():
+    with pytest.raises(TypeError):
+        Executor()
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_backends_agree_and_keep_task_order(frame, backend):
+    executor_class = EXECUTOR_CLASSES[backend]
+    tasks_args = [("a", 1.0), ("b", 2.0), ("a", -1.0)]
+    expected = [frame["a"].sum(), frame["b"].sum() * 2, -frame["a"].sum()]
+
+    with executor_class(2) as executor:
+        for scatter, data in ((executor.scatter_frame, frame), (executor.scatter, {"a": frame["a"].to_numpy(),
+                                                                                   "b": frame["b"].to_numpy()})):
+            shared = scatter(data)
+            try:
+                tasks = [(shared, column, scale) for column, scale in tasks_args]
+                assert np.allclose(list(executor.map(_column_sum, tasks)), expected)
+                completed = dict(executor.as_completed(_column_sum, tasks))
+                assert np.allclose([completed[i] for i in range(len(tasks))], expected)
+            finally:
+                executor.release(shared)
+
+@pytest.mark.parametrize("backend", BACKENDS[1:])
+def test_task_errors_reach_the_caller(backend):
+    with EXECUTOR_CLASSES[backend](2) as executor:
+        with pytest.raises(ValueError, match="bad task 1"):
+            list(executor.map(_fail, [(1,)]))
+
+def test_get_executor_falls_back_to_inline():
+    configure(executor="thread")
+    try:
+        assert isinstance(get_executor(1), InlineExecutor)
+        assert isinstance(get_executor(3), ThreadExecutor)
+        assert isinstance(get_executor(3, backend="inline"), InlineExecutor)
+        with pytest.raises(ValueError):
+            get_executor(2, backend="spark")
+    finally:
+        reset_settings()
+
+@pytest.mark.parametrize("backend", BACKENDS[1:])
+def test_legacy_simulation_does_not_depend_on_workers_or_backend(frame, backend):
+    weather = frame.assign(rain=np.abs(frame["a"]), relative_humidity_2m=60.0, windspeed_10m=5.0,
+                           temperature_2m=15.0, cloudcover=50.0, pressure_msl=1013.0)
+    serial = simulate_legacy_sharded(weather, seed=7, n_workers=1)
+
+    configure(executor=backend)
+    try:
+        assert np.array_equal(simulate_legacy_sharded(weather, seed=7, n_workers=2), serial)
+    finally:
+        reset_settings()
+    assert not np.array_equal(simulate_legacy_sharded(weather, seed=8), serial)
+
+def test_dask_local_cluster_runs_in_process(frame):
+    pytest.importorskip("dask.distributed")
+    with DaskExecutor(2) as executor:
+        assert executor.n_workers == 2
+        assert executor.client.cluster.scheduler_address.startswith("inproc://")
+        # Scattered data stays on the cluster and is released explicitly
+        shared = executor.scatter_frame(frame)
+        assert dict(executor.as_completed(_column_sum, [(shared, "a", 1.0), (shared, "b", 1.0)])) == pytest.approx(
+            {0: frame["a"].sum(), 1: float(frame["b"].sum())})
+        executor.release(shared)
+        deadline = time.monotonic() + 5
+        while shared.key in executor.client.who_has() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert shared.key not in executor.client.who_has()
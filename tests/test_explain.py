@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor, StackingRegressor
+from sklearn.linear_model import LinearRegression
+from xgboost import XGBRegressor
+
+from src.explain import explain_model, forget_explanations, load_explanation, path_attributions, permutation_importance
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    n = 600
+    X = pd.DataFrame(rng.normal(size=(n, 4)), columns=["rain", "humidity", "wind", "noise"])
+    y = 3 * X["rain"] + X["humidity"] * X["wind"] + rng.normal(0, 0.1, n)
+    return X, y
+
+@pytest.mark.parametrize("model", [
+    LinearRegression(),
+    RandomForestRegressor(n_estimators=10, random_state=0),
+    XGBRegressor(n_estimators=20),
+    StackingRegressor([("lr", LinearRegression()), ("rf", RandomForestRegressor(n_estimators=5, random_state=0))],
+                      final_estimator=LinearRegression()),
+])
+def test_attributions_add_up_to_predictions(data, model):
+    X, y = data
+    model.fit(X, y)
+    contributions, bias = path_attributions(model, X)
+
+    assert contributions.shape == X.shape
+    assert np.allclose(contributions.sum(axis=1) + bias, model.predict(X), atol=1e-4)
+    # The dominant driver gets the largest attribution
+    assert np.abs(contributions).mean(axis=0).argmax() == 0
+
+def test_permutation_importance_is_worker_independent(data):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+
+    baseline, serial = permutation_importance(model, X, y, n_repeats=2)
+    _, parallel = permutation_importance(model, X, y, n_repeats=2, n_workers=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert baseline > 0
+    ranked = serial.sort_values("importance_mean", ascending=False)["feature"].tolist()
+    assert ranked[0] == "rain" and ranked[-1] == "noise"
+
+def test_explanations_are_cached_per_model_and_data(data, tmp_path, monkeypatch):
+    X, y = data
+    model = LinearRegression().fit(X, y)
+    first = explain_model(model, "lr", X, y, str(tmp_path), n_repeats=2)
+    assert load_explanation(str(tmp_path), "lr") == first
+
+    real = permutation_importance
+    calls = []
+
+    def counting(*args, **kwargs):
+        calls.append(1)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr("src.explain.permutation_importance", counting)
+    assert explain_model(model, "lr", X, y, str(tmp_path), n_repeats=2) == first
+    assert not calls
+
+    # Other data is a different key
+    other = explain_model(model, "lr", X.iloc[:100], y.iloc[:100], str(tmp_path), n_repeats=2)
+    assert calls and other["key"] != first["key"]
+    assert load_explanation(str(tmp_path), "lr") == other
+
+    forget_explanations(str(tmp_path), ["lr"])
+    assert load_explanation(str(tmp_path), "lr") is None
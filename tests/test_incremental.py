@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src import incremental
+from src.incremental import evaluate_incremental, load_checkpoint, train_sgd
+
+
+@pytest.fixture
+def signal_csv(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        "time": pd.date_range("2023-01-01", periods=n, freq="h").astype(str),
+        "location": rng.choice(["Seattle", "Denver"], n),
+        "temperature_2m": rng.normal(15, 8, n),
+        "relative_humidity_2m": rng.uniform(20, 100, n),
+        "windspeed_10m": rng.uniform(0, 15, n),
+        "rain": rng.exponential(0.5, n),
+    })
+    df["signal_dbm"] = -70 - 3 * df["rain"] + rng.normal(0, 0.2, n)
+    path = tmp_path / "signal.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def test_sgd_resumes_after_interruption(signal_csv, tmp_path, monkeypatch):
+    original = incremental.SGDChunkModel.partial_fit
+    calls = []
+
+    def interrupted(self, X, y):
+        calls.append(len(X))
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return original(self, X, y)
+
+    monkeypatch.setattr(incremental.SGDChunkModel, "partial_fit", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        train_sgd(signal_csv, str(tmp_path / "resumed"), chunk_size=1000)
+    assert load_checkpoint(str(tmp_path / "resumed"))["chunks_done"] == 2
+
+    monkeypatch.setattr(incremental.SGDChunkModel, "partial_fit", original)
+    resumed, state = train_sgd(signal_csv, str(tmp_path / "resumed"), chunk_size=1000)
+    uninterrupted, _ = train_sgd(signal_csv, str(tmp_path / "fresh"), chunk_size=1000)
+
+    assert state["complete"] and state["chunks_done"] == 5
+    assert "signal_dbm" not in state["feature_names"]
+    np.testing.assert_allclose(resumed.model.coef_, uninterrupted.model.coef_)
+
+
+def test_incremental_models_learn(signal_csv, tmp_path):
+    for model_name in ("sgd", "xgb"):
+        kwargs = {"num_boost_round": 20} if model_name == "xgb" else {}
+        metrics, scores = evaluate_incremental(signal_csv, model_name, str(tmp_path / model_name),
+                                               chunk_size=1000, **kwargs)
+        assert metrics["R2"] > 0.9
+        assert 800 < scores.n < 1200
+
+
+def test_checkpoint_of_rewritten_source_is_discarded(signal_csv, tmp_path):
+    checkpoint = str(tmp_path / "sgd")
+    _, state = train_sgd(signal_csv, checkpoint, chunk_size=1000)
+    assert state["complete"]
+
+    # simulate rewrites the signal file at the same path
+    df = pd.read_csv(signal_csv)
+    df["signal_dbm"] = -90 + 3 * df["rain"]
+    df.to_csv(signal_csv, index=False)
+    rewritten, state = train_sgd(signal_csv, checkpoint, chunk_size=1000)
+    fresh, _ = train_sgd(signal_csv, str(tmp_path / "fresh"), chunk_size=1000)
+
+    assert state["fingerprint"] == incremental.source_fingerprint(signal_csv)
+    np.testing.assert_allclose(rewritten.model.coef_, fresh.model.coef_)
+    assert rewritten.y_offset == pytest.approx(fresh.y_offset)
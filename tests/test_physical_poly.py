@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.evaluation import evaluate
+from src.physical_poly import PhysicalPolyRegressor
+
+
+@pytest.fixture
+def weather():
+    rng = np.random.default_rng(0)
+    n = 2000
+    X = pd.DataFrame({
+        "rain": rng.exponential(1.0, n),
+        "windspeed_10m": rng.uniform(0, 20, n),
+        "relative_humidity_2m": rng.uniform(20, 100, n),
+        "temperature_celsius": rng.normal(15, 8, n),
+        "pressure_msl": rng.normal(1013, 10, n),
+        "hour": rng.integers(0, 24, n),
+    })
+    y = -70 - 0.02 * X["rain"] * X["windspeed_10m"] - 0.01 * (X["pressure_msl"] - 1013) ** 2 + rng.normal(0, 0.1, n)
+    return X, y
+
+def test_matches_least_squares_on_explicit_design(weather):
+    X, y = weather
+    model = PhysicalPolyRegressor(chunk_size=300).fit(X, y)
+
+    pairs = [(a, b) for a, b in model.interactions if a in X and b in X]
+    design = np.column_stack([X.to_numpy()] + [X[a] * X[b] for a, b in pairs])
+    reference = LinearRegression().fit(design, y)
+
+    assert len(model.terms_) == 1 + X.shape[1] + len(pairs)
+    assert np.allclose(model.predict(X), reference.predict(design), atol=1e-8)
+    assert model.score(X, y) > 0.99
+
+def test_chunk_size_does_not_change_fit(weather):
+    X, y = weather
+    one = PhysicalPolyRegressor(chunk_size=len(X)).fit(X, y)
+    many = PhysicalPolyRegressor(chunk_size=7).fit(X, y)
+    assert np.allclose(one.coef_, many.coef_, rtol=1e-6, atol=1e-9)
+
+def test_fills_missing_values_and_reorders_columns(weather):
+    X, y = weather
+    X = X.copy()
+    X.loc[::10, "rain"] = np.nan
+    model = PhysicalPolyRegressor().fit(X, y)
+
+    predictions = model.predict(X[X.columns[::-1]])
+    assert np.isfinite(predictions).all()
+    assert np.allclose(predictions, model.predict(X))
+
+def test_evaluate_does_not_train_on_the_target():
+    rng = np.random.default_rng(1)
+    n = 400
+    df = pd.DataFrame({
+        "time": pd.date_range("2023-01-01", periods=n, freq="h").astype(str),
+        "location": "Seattle",
+        "temperature_2m": rng.normal(15, 8, n),
+        "relative_humidity_2m": rng.uniform(20, 100, n),
+        "windspeed_10m": rng.uniform(0, 15, n),
+        "rain": rng.exponential(0.5, n),
+        # Pure noise: no feature can explain it
+        "signal_dbm": rng.normal(-70, 3, n),
+    })
+    metrics, _ = evaluate(df, "poly_phys")
+    assert metrics["R2"] < 0.2
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+from src.propagation import rain_coefficients, rain_path_attenuation, link_attenuation
+from src.signal_simulation import extract_weather_arrays
+
+
+def test_rain_coefficients_match_p838_table():
+    """
+    Horizontal/vertical coefficients at 10, 20 and 30 GHz from ITU-R P.838-3 Table 5.
+    """
+    k_h, alpha_h = rain_coefficients([10, 20, 30], elevation_deg=0, polarization="horizontal")
+    k_v, alpha_v = rain_coefficients([10, 20, 30], elevation_deg=0, polarization="vertical")
+    assert np.allclose(k_h, [0.01217, 0.09164, 0.2403], rtol=1e-3)
+    assert np.allclose(alpha_h, [1.2571, 1.0568, 0.9485], rtol=1e-3)
+    assert np.allclose(k_v, [0.01129, 0.09611, 0.2291], rtol=1e-3)
+    assert np.allclose(alpha_v, [1.2156, 0.9847, 0.9129], rtol=1e-3)
+
+def test_rain_attenuation_grows_with_rate_and_frequency():
+    rates = np.array([0.0, 1.0, 10.0, 50.0])
+    ku = rain_path_attenuation(rates, 12, 40)
+    ka = rain_path_attenuation(rates, 30, 40)
+    assert ku[0] == 0
+    assert np.all(np.diff(ku) > 0)
+    assert np.all(ka[1:] > ku[1:])
+
+def test_link_attenuation_shape():
+    weather = extract_weather_arrays(pd.DataFrame({"rain": [0.0, 5.0, 20.0]}))
+    links = [
+        {"frequency_ghz": 12, "elevation_deg": 40},
+        {"frequency_ghz": 20, "elevation_deg": 30, "polarization": "vertical"},
+    ]
+    attenuation = link_attenuation(weather, links)
+    assert attenuation.shape == (2, 3)
+    assert np.all(attenuation > 0)
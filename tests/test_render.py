@@ -0,0 +1,109 @@
+import os
+import numpy as np
+import pytest
+
+from src.reporting import plots, render
+from src.reporting.render import CACHE_FILENAME, cached_hashes, figure_job, job_hash, render_figures
+
+
+@pytest.fixture
+def jobs():
+    rng = np.random.default_rng(0)
+    y_true = rng.normal(-80, 5, 200)
+    y_pred = y_true + rng.normal(0, 1, 200)
+    return [figure_job("predictions", "rf", y_true=y_true, y_pred=y_pred),
+            figure_job("residuals", "rf", y_true=y_true, y_pred=y_pred),
+            figure_job("importances", "rf", importances=[0.7, 0.3], feature_names=["rain_rate", "cloudcover"])]
+
+@pytest.fixture
+def rendered(monkeypatch):
+    calls = []
+    real_render = render._render
+
+    def counting_render(job, project_root):
+        calls.append((job["kind"], job["model_name"]))
+        return real_render(job, project_root)
+
+    monkeypatch.setattr(render, "_render", counting_render)
+    return calls
+
+def test_unchanged_jobs_are_not_rerendered(jobs, tmp_path, rendered):
+    paths = render_figures(jobs, str(tmp_path))
+    assert len(rendered) == 3 and all(os.path.exists(path) for path in paths)
+    assert set(cached_hashes(str(tmp_path))) == {os.path.basename(path) for path in paths}
+    mtimes = [os.path.getmtime(path) for path in paths]
+
+    rendered.clear()
+    assert render_figures(jobs, str(tmp_path)) == paths
+    assert rendered == [] and [os.path.getmtime(path) for path in paths] == mtimes
+
+    render_figures(jobs, str(tmp_path), force=True)
+    assert len(rendered) == 3
+
+def test_changed_or_missing_figures_are_rerendered(jobs, tmp_path, rendered):
+    paths = render_figures(jobs, str(tmp_path))
+    rendered.clear()
+
+    changed = dict(jobs[0], inputs=dict(jobs[0]["inputs"], y_pred=jobs[0]["inputs"]["y_pred"] + 0.5))
+    assert job_hash(changed) != job_hash(jobs[0])
+    os.remove(paths[2])
+    render_figures([changed, jobs[1], jobs[2]], str(tmp_path))
+    assert rendered == [("predictions", "rf"), ("importances", "rf")]
+    assert cached_hashes(str(tmp_path))[os.path.basename(paths[0])] == job_hash(changed)
+
+    # A damaged cache file only costs a re-render
+    with open(tmp_path / "results" / "figures" / CACHE_FILENAME, "w") as f:
+        f.write("{not json")
+    rendered.clear()
+    render_figures(jobs, str(tmp_path))
+    assert len(rendered) == 3
+
+def test_job_hash_depends_on_inputs_and_version(jobs, monkeypatch):
+    job = jobs[0]
+    assert job_hash(job) == job_hash(figure_job("predictions", "rf", **{k: np.array(v) for k, v in job["inputs"].items()}))
+    assert job_hash(job) != job_hash(dict(job, model_name="xgb"))
+    assert job_hash(job) != job_hash(dict(job, inputs=dict(job["inputs"], y_true=job["inputs"]["y_true"][:-1])))
+    before = job_hash(job)
+    monkeypatch.setattr(render, "RENDER_VERSION", render.RENDER_VERSION + 1)
+    assert job_hash(job) != before
+    with pytest.raises(ValueError):
+        figure_job("heatmap", "rf")
+
+@pytest.fixture
+def drawn(monkeypatch):
+    """Records what the plot functions draw instead of drawing it."""
+    calls = {}
+
+    def recorder(name):
+        def record(*args, **kwargs):
+            points = kwargs.get("x", args[0] if args else None)
+            calls[name] = {"points": len(points), "kde": kwargs.get("kde")}
+        return record
+
+    monkeypatch.setattr(plots.plt, "hexbin", recorder("hexbin"))
+    monkeypatch.setattr(plots.plt, "colorbar", lambda *args, **kwargs: None)
+    monkeypatch.setattr(plots.sns, "scatterplot", recorder("scatter"))
+    monkeypatch.setattr(plots.sns, "histplot", recorder("histogram"))
+    return calls
+
+@pytest.mark.parametrize("n_points, kind, plotted", [
+    (plots.MAX_SCATTER_POINTS, "scatter", plots.MAX_SCATTER_POINTS),
+    (plots.MAX_SCATTER_POINTS + 1, "scatter", plots.MAX_SCATTER_POINTS),
+    (plots.HEXBIN_THRESHOLD, "scatter", plots.MAX_SCATTER_POINTS),
+    (plots.HEXBIN_THRESHOLD + 1, "hexbin", plots.HEXBIN_THRESHOLD + 1),
+])
+def test_prediction_plot_thresholds(n_points, kind, plotted, tmp_path, drawn):
+    y = np.linspace(-100, -60, n_points)
+    plots.plot_predictions(y, y + 1, "rf", str(tmp_path))
+    assert list(drawn) == [kind] and drawn[kind]["points"] == plotted
+
+def test_downsample_keeps_pairs_in_order():
+    y_true = np.arange(50_000, dtype=float)
+    sample_true, sample_pred = plots._downsample(y_true, -y_true, 1000)
+    assert len(sample_true) == 1000 and np.all(np.diff(sample_true) > 0)
+    assert np.array_equal(sample_pred, -sample_true)
+
+@pytest.mark.parametrize("n_points, kde", [(plots.KDE_MAX_POINTS, True), (plots.KDE_MAX_POINTS + 1, False)])
+def test_residual_plot_skips_kde_above_threshold(n_points, kde, tmp_path, drawn):
+    plots.plot_residuals(np.zeros(n_points), np.linspace(-1, 1, n_points), "rf", str(tmp_path))
+    assert drawn["histogram"] == {"points": n_points, "kde": kde}
@@ -0,0 +1,129 @@
+import os
+import tempfile
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+
+from src import run_store
+
+
+@pytest.fixture
+def store_path():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield os.path.join(tmpdir, "history.sqlite")
+
+def _record_run(args):
+    store_path, rmse = args
+    conn = run_store.connect(store_path)
+    run_id = run_store.start_run(conn, "weather.csv", "signal.csv")
+    for model_name in ("lr", "rf"):
+        run_store.record_model(conn, run_id, model_name, {"MAE": 1.0, "RMSE": rmse + (model_name == "rf"), "R2": 0.9})
+    run_store.finish_run(conn, run_id)
+    return run_id
+
+def test_concurrent_writers(store_path):
+    run_store.connect(store_path).close()
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        run_ids = list(pool.map(_record_run, [(store_path, float(i)) for i in range(12)]))
+    assert sorted(run_ids) == list(range(1, 13))
+
+    conn = run_store.connect(store_path)
+    assert conn.execute("SELECT COUNT(*) FROM metrics").fetchone()[0] == 12 * 2 * 3
+
+def test_best_metric_over_recent_runs(store_path):
+    conn = run_store.connect(store_path)
+    for rmse in (0.5, 0.2, 0.9, 0.4):
+        _record_run((store_path, rmse))
+
+    best = run_store.best_metric_per_model(conn, "rmse", last_n_runs=2).set_index("model")
+    assert best.loc["lr", "value"] == pytest.approx(0.4)
+    assert best.loc["lr", "run_id"] == 4
+    assert best.loc["rf", "value"] == pytest.approx(1.4)
+
+def test_import_legacy_manifests(store_path):
+    with tempfile.TemporaryDirectory() as tmpdir:
+        run_log = os.path.join(tmpdir, "run_log.csv")
+        manifest = os.path.join(tmpdir, "report_manifest.csv")
+        with open(run_log, "w") as f:
+            f.write("timestamp,engineered_file,signal_file\n"
+                    "2025-08-13 01:48:21,weather_engineered_latest.csv,signal_latest.csv\n"
+                    "2025-08-14 06:12:03,weather_historical_1.csv,signal_latest.csv,lr,0.1,0.2,0.9\n"
+                    "2025-08-14 06:13:34,weather_historical_1.csv,signal_latest.csv,rf,0.0,0.1,1.0\n"
+                    "2025-08-14 06:33:03,weather_historical_1.csv,signal_latest.csv,lr,0.1,0.3,0.9\n")
+        with open(manifest, "w") as f:
+            f.write("timestamp,model,report_file,mae,rmse,r2\n"
+                    "2025-08-14_06-12-04,lr,lr_report.md,0.1,0.2,0.9\n")
+        with open(os.path.join(tmpdir, "lr_report.md"), "w") as f:
+            f.write("# LR Model Report\n\n## Plots\n![Predictions](results/figures/lr_predictions.png)\n"
+                    "![Residuals](results/figures/lr_residuals.png)\n")
+
+        conn = run_store.connect(store_path)
+        assert run_store.import_csv_manifests(conn, run_log, manifest) == 3
+        assert run_store.import_csv_manifests(conn, run_log, manifest) == 0
+
+    metrics = run_store.run_metrics(conn, 2).set_index("model")
+    assert metrics.loc["rf", "rmse"] == pytest.approx(0.1)
+    report = conn.execute("SELECT report_file FROM models WHERE run_id = 2 AND model = 'lr'").fetchone()
+    assert report == ("lr_report.md",)
+    assert run_store.run_summary(conn, 2)["figures"] == {
+        "lr": {"Predictions": ("results/figures/lr_predictions.png", None),
+               "Residuals": ("results/figures/lr_residuals.png", None)}}
+
+def test_run_summary_renders_report(store_path):
+    from src.reporting.report_writer import render_run_report
+
+    conn = run_store.connect(store_path)
+    run_id = _record_run((store_path, 0.5))
+    for name in ("collect", "simulate", "evaluate"):
+        run_store.record_stage(conn, run_id, name, 1.0, started_at="2025-08-14 06:00:00")
+    run_store.record_figures(conn, run_id, {"lr": {"Scatter": ("results/figures/lr_scatter.png", None)}})
+
+    summary = run_store.run_summary(conn, run_id)
+    assert list(summary["stages"]) == ["collect", "simulate", "evaluate"]
+
+    report = render_run_report(summary, os.path.dirname(store_path))
+    assert "| LR | **1.0000** | **0.5000** | **0.9000** |" in report
+    # MAE and R2 tie, so both models are bolded
+    assert "| RF | **1.0000** | 1.5000 | **0.9000** |" in report
+    assert "| **total** | **3.00** |" in report
+    assert "![Scatter](results/figures/lr_scatter.png)" in report
+
+def test_report_of_a_past_run_is_regenerated_from_the_store(tmp_path, monkeypatch, capsys):
+    import main
+    from src.utils.settings import reset_settings
+
+    store_path = run_store.default_store_path(str(tmp_path))
+    os.makedirs(os.path.dirname(store_path))
+    conn = run_store.connect(store_path)
+    old_run = _record_run((store_path, 0.5))
+    run_store.record_stage(conn, old_run, "evaluate", 2.5, started_at="2025-08-14 06:00:00")
+    figure = str(tmp_path / "results" / "figures" / "rf_predictions.png")
+    run_store.record_figures(conn, old_run, {"rf": {"Predictions": (figure, "old-hash")}})
+    _record_run((store_path, 0.1))
+
+    output = tmp_path / "old_report.md"
+    monkeypatch.setenv("SIGNAL_PROJECT_ROOT", str(tmp_path))
+    reset_settings()
+    try:
+        main.main(["report", "--run", str(old_run), "--output", str(output)])
+    finally:
+        reset_settings()
+
+    report = output.read_text()
+    assert report.startswith(f"# Run {old_run} — Model Comparison")
+    assert "| LR | **1.0000** | **0.5000** | **0.9000** |" in report
+    # MAE and R2 tie, so both models are bolded
+    assert "| RF | **1.0000** | 1.5000 | **0.9000** |" in report
+    assert "| evaluate | 2.50 |" in report
+    # Figure links are relative to the project root; no cache entry matches the recorded hash
+    assert "### RF\n![Predictions](results/figures/rf_predictions.png)" in report
+    assert "_Predictions has been re-rendered by a later run._" in report
+    assert not os.path.exists(tmp_path / "results" / "reports" / "run_report.md")
+
+def test_metrics_table_bolds_every_tied_model():
+    from src.reporting.report_writer import render_run_report
+
+    metrics = {"lr": {"rmse": 0.5, "bias": -0.2}, "rf": {"rmse": 0.5, "bias": 0.2}, "xgb": {"rmse": 0.7, "bias": 0.3}}
+    report = render_run_report({"run_id": 1, "metrics": metrics}, "/")
+    assert "| LR | **0.5000** | **-0.2000** |" in report
+    assert "| RF | **0.5000** | **0.2000** |" in report
+    assert "| XGB | 0.7000 | 0.3000 |" in report
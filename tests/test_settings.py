@@ -0,0 +1,46 @@
+import os
+import pytest
+
+from src.utils.settings import STORAGE_FORMATS, Settings, load_settings
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text("paths:\n  project_root: project\n"
+                    "pipeline:\n  workers: 2\n  models: [lr, xgb]\n  storage_format: csv.gz\n")
+    return path
+
+def test_relative_project_root_and_yaml_values(config_path):
+    settings = load_settings(config_path, environ={})
+    assert settings.project_root == os.path.join(str(config_path.parent), "project")
+    assert settings.workers == 2
+    assert settings.models == ("lr", "xgb")
+    assert settings.signal_path.endswith(os.path.join("data", "simulated", "signal_latest.csv.gz"))
+    assert settings.seed == Settings.seed
+
+def test_precedence_environment_then_overrides(config_path):
+    environ = {"SIGNAL_WORKERS": "4", "SIGNAL_MODELS": "rf,poly", "SIGNAL_MISSING_RATE": "0.1"}
+    settings = load_settings(config_path, environ=environ, workers=8)
+    assert settings.workers == 8
+    assert settings.models == ("rf", "poly")
+    assert settings.missing_rate == pytest.approx(0.1)
+
+def test_invalid_settings_are_rejected(config_path):
+    with pytest.raises(KeyError):
+        load_settings(config_path, environ={}, chunk=10)
+    with pytest.raises(ValueError):
+        load_settings(config_path, environ={"SIGNAL_STORAGE_FORMAT": "xlsx"})
+    with pytest.raises(ValueError):
+        load_settings(config_path, environ={}, workers=0)
+
+@pytest.mark.parametrize("storage_format", sorted(STORAGE_FORMATS))
+def test_every_storage_format_round_trips(tmp_path, config_path, storage_format):
+    import pandas as pd
+    from src.utils.utils import read_table, write_table
+
+    settings = load_settings(config_path, environ={}, storage_format=storage_format)
+    path = tmp_path / os.path.basename(settings.signal_path)
+    df = pd.DataFrame({"location": ["Seattle", "Denver"], "signal_dbm": [-71.5, -88.0]})
+    write_table(df, str(path))
+    pd.testing.assert_frame_equal(read_table(str(path)), df)
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.sharding import FALLBACK, evaluate_sharded, train_sharded
+
+
+@pytest.fixture
+def signal_df():
+    rng = np.random.default_rng(0)
+    n = 3000
+    locations = rng.choice(["Seattle", "Denver", "Miami"], n)
+    df = pd.DataFrame({
+        "time": pd.date_range("2023-01-01", periods=n, freq="h").astype(str),
+        "location": locations,
+        "temperature_2m": rng.normal(15, 8, n),
+        "relative_humidity_2m": rng.uniform(20, 100, n),
+        "cloudcover": rng.uniform(0, 100, n),
+        "windspeed_10m": rng.uniform(0, 15, n),
+        "rain": rng.exponential(0.5, n),
+    })
+    # Each site reacts to rain differently, which a global linear model cannot capture
+    slope = pd.Series(locations).map({"Seattle": -0.5, "Denver": -2.0, "Miami": -4.0}).to_numpy()
+    df["signal_dbm"] = -70 + slope * df["rain"] + rng.normal(0, 0.3, n)
+    return df
+
+
+def test_location_shards_beat_global_model(signal_df):
+    sharded, _, per_shard = evaluate_sharded(signal_df, "lr", shard_by="location")
+    assert set(per_shard) == {"seattle", "denver", "miami"}
+
+    # A single cluster is equivalent to one global model
+    global_metrics, _, _ = evaluate_sharded(signal_df, "lr", shard_by="cluster", n_clusters=1)
+    assert sharded["RMSE"] < global_metrics["RMSE"]
+
+
+def test_unseen_locations_use_fallback():
+    rng = np.random.default_rng(1)
+    X = pd.DataFrame({"a": rng.normal(size=200), "b": rng.normal(size=200)})
+    y = 2 * X["a"] - X["b"]
+    locations = np.where(np.arange(200) < 190, "seattle", "denver")
+
+    model = train_sharded(X, y, locations, "lr", {"seattle": "seattle", "denver": "denver"}, min_rows=50)
+    assert list(model.models) == ["seattle"]
+
+    query = X.head(3).assign(location=["seattle", "denver", "tokyo"])
+    assert list(model.route(query["location"])) == ["seattle", FALLBACK, FALLBACK]
+    np.testing.assert_allclose(model.predict(query), y.head(3), atol=1e-8)
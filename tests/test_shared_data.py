@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from src.shared_data import share_frame, attach_frame, release
+
+
+def _is_memory_mapped(values):
+    while values is not None:
+        if isinstance(values, np.memmap):
+            return True
+        values = values.base
+    return False
+
+def test_shared_frame_round_trip():
+    df = pd.DataFrame({
+        "location": ["Seattle", "Miami", None],
+        "time": pd.date_range("2023-01-01", periods=3, freq="h"),
+        "rain": [0.0, 1.5, np.nan],
+        "hour": [0, 1, 2],
+    })
+    handle = share_frame(df)
+    try:
+        attached = attach_frame(handle)
+        pd.testing.assert_frame_equal(attached[df.columns], df)
+        assert _is_memory_mapped(attached["rain"].to_numpy())
+        assert _is_memory_mapped(attached["hour"].to_numpy())
+    finally:
+        release(handle)
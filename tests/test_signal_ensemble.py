@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src.signal_ensemble import simulate_signal_ensemble, summarize_signal_ensemble
+from src.signal_simulation import simulate_legacy_sharded
+
+
+@pytest.fixture
+def weather_df():
+    rng = np.random.default_rng(0)
+    n = 240
+    return pd.DataFrame({
+        "time": pd.date_range("2023-01-01", periods=n, freq="h"),
+        "rain": rng.exponential(1.0, n),
+        "relative_humidity_2m": rng.uniform(20, 100, n),
+        "cloudcover": rng.uniform(0, 100, n),
+        "windspeed_10m": rng.uniform(0, 20, n),
+        "pressure_msl": rng.uniform(990, 1030, n),
+        "temperature_2m": rng.uniform(0, 35, n),
+        "location": rng.choice(["Seattle", "Miami"], n),
+    })
+
+def test_ensemble_shape_and_columns(weather_df):
+    result = simulate_signal_ensemble(weather_df, n_realizations=50, quantiles=(0.01, 0.5))
+    assert list(result.columns) == ["signal_mean", "signal_std", "signal_q1", "signal_q50", "outage_prob"]
+    assert result.index.equals(weather_df.index)
+    assert (result["signal_q1"] <= result["signal_q50"]).all()
+    assert result["outage_prob"].between(0, 1).all()
+
+def test_ensemble_chunking_preserves_distribution(weather_df):
+    """
+    Chunking changes the draw order but not the distribution being sampled.
+    """
+    small = simulate_signal_ensemble(weather_df, n_realizations=400, chunk_size=7)
+    large = simulate_signal_ensemble(weather_df, n_realizations=400)
+    standard_error = large["signal_std"] / np.sqrt(400)
+    assert (np.abs(small["signal_mean"] - large["signal_mean"]) < 6 * standard_error).all()
+
+def test_summary_groups_and_counts(weather_df):
+    summary = summarize_signal_ensemble(weather_df, by=("location", "month"), n_realizations=20)
+    assert {"location", "month"} <= set(summary.columns)
+    assert summary["n_samples"].sum() == len(weather_df) * 20
+    values = summary[["signal_q1", "signal_q5", "signal_q50"]].to_numpy()
+    assert np.all(np.diff(values, axis=1) >= 0)
+    assert np.all(values % 0.5 == 0)
+
+def test_ensemble_matches_the_legacy_row_model():
+    """
+    The ensemble batches simulate_realistic_signal_strength: per row, its
+    mean and std match many seeded draws of the row model, including rows
+    whose rain_rate is missing and falls back to rain.
+    """
+    rng = np.random.default_rng(1)
+    n, draws = 12, 2000
+    weather = pd.DataFrame({
+        "time": pd.date_range("2023-03-01 05:00", periods=n, freq="7h").strftime("%Y-%m-%dT%H:%M"),
+        "rain": rng.uniform(2, 8, n),
+        "rain_rate": np.where(np.arange(n) % 3 == 0, 12.0, np.nan),
+        "relative_humidity_2m": rng.uniform(60, 100, n),
+        "cloudcover": rng.uniform(0, 100, n),
+        "windspeed_10m": rng.uniform(0, 15, n),
+        "pressure_msl": rng.uniform(990, 1030, n),
+        "temperature_2m": np.where(np.arange(n) % 4 == 1, 0.0, rng.uniform(5, 35, n)),
+    })
+    ensemble = simulate_signal_ensemble(weather, n_realizations=draws, seed=3)
+
+    repeated = weather.loc[weather.index.repeat(draws)].reset_index(drop=True)
+    legacy = pd.Series(simulate_legacy_sharded(repeated, seed=3)).groupby(np.repeat(np.arange(n), draws))
+    standard_error = ensemble["signal_std"] / np.sqrt(draws)
+    assert (np.abs(legacy.mean() - ensemble["signal_mean"]) < 5 * standard_error).all()
+    assert np.allclose(legacy.std(), ensemble["signal_std"], rtol=0.1)
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.signal_history import BIN_WIDTH_DB, SignalHistory
+
+
+@pytest.fixture
+def signals():
+    rng = np.random.default_rng(0)
+    # Two readings per hour, so hour rollups merge several rows
+    times = pd.date_range("2023-06-20", "2023-10-05", freq="30min", inclusive="left")
+    frames = []
+    for location, level in (("Seattle", -72.0), ("Phoenix", -88.0)):
+        values = rng.normal(level, 4.0, len(times))
+        values[rng.random(len(times)) < 0.02] = np.nan
+        frames.append(pd.DataFrame({"time": times.strftime("%Y-%m-%d %H:%M:%S"), "location": location,
+                                    "signal_dbm": values}))
+    return pd.concat(frames, ignore_index=True)
+
+@pytest.fixture
+def history(tmp_path):
+    history = SignalHistory(str(tmp_path / "history.sqlite"))
+    yield history
+    history.close()
+
+def _raw(signals, start, end):
+    times = pd.to_datetime(signals["time"])
+    return signals[(times >= start) & (times < end)]
+
+def test_daily_rollups_match_raw_rows(signals, history):
+    history.ingest(signals)
+    daily = history.query("day", "2023-07-01", "2023-10-01", locations=["Seattle"], quantiles=[0.05])
+
+    raw = _raw(signals, "2023-07-01", "2023-10-01")
+    raw = raw[raw["location"] == "Seattle"]
+    expected = raw.groupby(pd.to_datetime(raw["time"]).dt.floor("D"))["signal_dbm"]
+    assert len(daily) == 92 and daily["count"].min() >= 40
+    assert np.allclose(daily["mean"], expected.mean())
+    assert np.allclose(daily["std"], expected.std())
+    assert np.array_equal(daily["min"], expected.min()) and np.array_equal(daily["count"], expected.count())
+    assert np.abs(daily["signal_q5"].to_numpy() - expected.quantile(0.05).to_numpy()).max() <= 2 * BIN_WIDTH_DB
+
+def test_range_aggregate_matches_raw_rows(signals, history):
+    history.ingest(signals)
+    # Partial days and months on both ends exercise every rollup level
+    start, end = "2023-06-28 05:00", "2023-09-03 17:00"
+    result = history.aggregate(start, end, quantiles=[0.5, 0.95]).set_index("location")
+
+    expected = _raw(signals, start, end).groupby("location")["signal_dbm"]
+    assert np.array_equal(result["count"], expected.count()[result.index])
+    assert np.allclose(result["mean"], expected.mean()[result.index])
+    assert np.allclose(result["max"], expected.max()[result.index])
+    assert np.allclose(result["signal_q50"], expected.median()[result.index], atol=BIN_WIDTH_DB)
+    raw = _raw(signals, start, end)
+    hourly = raw.groupby(["location", pd.to_datetime(raw["time"]).dt.floor("h")])["signal_dbm"].mean()
+    outage = (hourly < -90).groupby(level="location").sum()
+    assert np.array_equal(result["outage_hours"], outage[result.index])
+
+    overall = history.aggregate(start, end, by_location=False)
+    assert overall["count"].item() == result["count"].sum()
+
+def test_incremental_ingest_equals_bulk_ingest(signals, tmp_path, history):
+    history.ingest(signals)
+
+    # Batches arrive out of order and split hours between them, as streamed measurements do
+    incremental = SignalHistory(str(tmp_path / "incremental.sqlite"))
+    try:
+        shuffled = signals.sample(frac=1.0, random_state=0)
+        for start in range(0, len(shuffled), 2000):
+            incremental.ingest(shuffled.iloc[start:start + 2000], source="measured")
+        for level in ("hour", "day", "month"):
+            pd.testing.assert_frame_equal(incremental.query(level, source="measured"), history.query(level),
+                                          check_exact=False)
+        assert incremental.sources() == ["measured"]
+    finally:
+        incremental.close()
+
+def test_replace_supersedes_a_source(signals, history, tmp_path):
+    history.ingest(signals)
+    history.ingest(signals.assign(signal_dbm=signals["signal_dbm"] - 10), replace=True)
+    monthly = history.query("month", locations=["Seattle"], quantiles=[])
+    assert monthly["mean"].between(-84, -80).all()
+    assert history.locations() == ["Phoenix", "Seattle"]
+
+    path = tmp_path / "signals.csv"
+    signals.to_csv(path, index=False)
+    history.ingest_file(str(path), replace=True, chunk_size=1000)
+    assert history.aggregate()["count"].sum() == signals["signal_dbm"].notna().sum()
+    assert history.aggregate()["missing"].sum() == signals["signal_dbm"].isna().sum()
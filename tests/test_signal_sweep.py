@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import pandas as pd
+
+from src import signal_sweep
+from src.signal_sweep import parameter_grid, prepare_sweep, run_sweep, simulate_counts, _draw_faults, _faulted_rows
+
+
+@pytest.fixture
+def weather_df():
+    rng = np.random.default_rng(0)
+    n = 480
+    return pd.DataFrame({
+        "time": pd.date_range("2023-01-01", periods=n, freq="h"),
+        "rain": rng.exponential(1.0, n),
+        "relative_humidity_2m": rng.uniform(20, 100, n),
+        "cloudcover": rng.uniform(0, 100, n),
+        "windspeed_10m": rng.uniform(0, 20, n),
+        "pressure_msl": rng.uniform(990, 1030, n),
+        "temperature_2m": rng.uniform(0, 35, n),
+        "location": rng.choice(["Seattle", "Miami", "Tokyo"], n),
+    })
+
+def test_tidy_table_per_parameter_set_and_group(weather_df):
+    grid = parameter_grid(base_dbm=[-75, -70], noise_profile=["quiet", "harsh"], seed=[1, 2])
+    result = run_sweep(weather_df, grid, by=("location",))
+
+    assert len(result) == len(grid) * 3
+    assert result.groupby("sweep_id")["n_samples"].sum().eq(len(weather_df)).all()
+    assert {"base_dbm", "noise_profile", "seed", "location", "signal_q50", "outage_prob"} <= set(result.columns)
+
+    # Common random numbers: a 5 dB higher base level shifts the signal by 5 dB
+    mean = result.set_index(["base_dbm", "noise_profile", "seed", "location"])["signal_mean"]
+    shift = mean.xs(-70, level="base_dbm") - mean.xs(-75, level="base_dbm")
+    assert np.allclose(shift, 5.0, atol=0.1)
+    std = result.groupby("noise_profile")["signal_std"].mean()
+    assert std["harsh"] > std["quiet"]
+
+def test_workers_do_not_change_results(weather_df):
+    base = prepare_sweep(weather_df)
+    grid = parameter_grid(missing_rate=[0.0, 0.1], outlier_rate=[0.0, 0.05], seed=[3, 4])
+    pd.testing.assert_frame_equal(run_sweep(base, grid), run_sweep(base, grid, n_workers=2))
+
+def test_faults_recompute_only_touched_rows(weather_df, monkeypatch):
+    # rain_rate readings that drop out fall back to rain, as for the ensemble
+    weather_df["rain_rate"] = weather_df["rain"] * 3
+    base = prepare_sweep(weather_df)
+    params = dict(signal_sweep.DEFAULT_PARAMETERS, missing_rate=0.05, outlier_rate=0.05, seed=5)
+    rows, attenuation, _ = _faulted_rows(base, np.random.default_rng(5), 0.05, 0.05)
+    assert 0 < rows.size < len(weather_df)
+    assert not np.allclose(attenuation, base.attenuation[rows])
+
+    # The same draws applied to the DataFrame, simulated from scratch
+    faulted_df = weather_df.copy()
+    for column, fault_rows, values in _draw_faults(len(weather_df), np.random.default_rng(5), 0.05, 0.05):
+        faulted_df.loc[fault_rows, column] = np.nan if values is None else values
+    full = prepare_sweep(faulted_df)
+    n_groups = len(base.groups)
+
+    def recompute_all_rows(sweep_base, rng, missing_rate, outlier_rate):
+        _draw_faults(len(sweep_base), rng, missing_rate, outlier_rate)
+        return np.arange(len(full)), full.attenuation, full.noise_std
+
+    expected_counts = simulate_counts(base, params, n_groups)
+    monkeypatch.setattr(signal_sweep, "_faulted_rows", recompute_all_rows)
+    assert np.array_equal(simulate_counts(base, params, n_groups), expected_counts)
+
+def test_unknown_noise_profile_is_rejected():
+    with pytest.raises(ValueError):
+        parameter_grid(noise_profile="loud")
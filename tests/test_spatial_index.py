@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.signal_simulation import LOCATION_BIAS, location_bias_offsets
+from src.spatial_index import EARTH_RADIUS_KM, get_index, interpolate_weather
+
+
+SOURCES = [
+    {"name": "Seattle", "latitude": 47.6062, "longitude": -122.3321},
+    {"name": "Denver", "latitude": 39.7392, "longitude": -104.9903},
+    {"name": "Phoenix", "latitude": 33.4484, "longitude": -112.0740},
+    {"name": "Tokyo", "latitude": 35.6895, "longitude": 139.6917},
+]
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+@pytest.fixture
+def weather():
+    times = pd.date_range("2023-01-01", periods=48, freq="h").strftime("%Y-%m-%d %H:%M:%S")
+    frames = [pd.DataFrame({"temperature_2m": 10.0 * i + np.arange(48) / 10, "rain": float(i),
+                            "location": source["name"], "time": times})
+              for i, source in enumerate(SOURCES)]
+    return pd.concat(frames, ignore_index=True)
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(0)
+    latitudes, longitudes = rng.uniform(-60, 60, 2000), rng.uniform(-180, 180, 2000)
+    indices, distances = get_index(SOURCES).nearest(latitudes, longitudes, k=2)
+
+    source_lat = np.array([s["latitude"] for s in SOURCES])
+    source_lon = np.array([s["longitude"] for s in SOURCES])
+    brute = _haversine_km(latitudes[:, None], longitudes[:, None], source_lat, source_lon)
+    assert np.array_equal(indices, np.argsort(brute, axis=1)[:, :2])
+    assert np.allclose(distances, np.sort(brute, axis=1)[:, :2])
+
+def test_index_is_built_once_per_source_set():
+    assert get_index(SOURCES) is get_index(pd.DataFrame(SOURCES))
+    assert get_index(SOURCES[:3]) is not get_index(SOURCES)
+
+def test_interpolation_weights_by_inverse_distance(weather):
+    stations = pd.DataFrame({"station": ["at_denver", "between"],
+                             "latitude": [39.7392, 36.6], "longitude": [-104.9903, -108.5]})
+    result = interpolate_weather(weather, stations, locations=SOURCES, k=2)
+
+    assert len(result) == 2 * 48 and list(result.columns[:4]) == ["time", "location", "latitude", "longitude"]
+    at_denver = result[result["location"] == "at_denver"]
+    assert np.allclose(at_denver["temperature_2m"], weather.loc[weather["location"] == "Denver", "temperature_2m"])
+
+    # Between Denver (index 1) and Phoenix (index 2), closer to Denver
+    d_denver = _haversine_km(36.6, -108.5, 39.7392, -104.9903)
+    d_phoenix = _haversine_km(36.6, -108.5, 33.4484, -112.0740)
+    w = np.array([1 / d_denver ** 2, 1 / d_phoenix ** 2])
+    expected_rain = (w @ [1.0, 2.0]) / w.sum()
+    assert np.allclose(result.loc[result["location"] == "between", "rain"], expected_rain)
+
+def test_missing_source_values_renormalize_weights(weather):
+    weather.loc[(weather["location"] == "Phoenix") & (weather["time"] == weather["time"].iloc[0]), "rain"] = np.nan
+    stations = [{"name": "between", "latitude": 36.6, "longitude": -108.5}]
+    result = interpolate_weather(weather, stations, locations=SOURCES, k=2)
+    assert result["rain"].iloc[0] == pytest.approx(1.0)
+    assert result["rain"].notna().all()
+
+def test_location_bias_matches_whole_names():
+    df = pd.DataFrame({"location": ["Seattle", " seattle ", "Seattle Ground Station", "Denverton", None]})
+    offsets = location_bias_offsets(df)
+    assert offsets.tolist() == [LOCATION_BIAS["seattle"], LOCATION_BIAS["seattle"], 0.0, 0.0, 0.0]
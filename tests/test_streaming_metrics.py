@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from src.streaming_metrics import StreamingMetrics, TDigest
+
+
+@pytest.fixture
+def predictions():
+    rng = np.random.default_rng(0)
+    y_true = rng.normal(-75, 4, 200_000)
+    y_pred = y_true + rng.normal(0.2, 1.0, y_true.size)
+    return y_true, y_pred
+
+
+def test_merged_chunks_match_exact_metrics(predictions):
+    y_true, y_pred = predictions
+    parts = [StreamingMetrics(seed=i) for i in range(3)]
+    for i, (t, p) in enumerate(zip(np.array_split(y_true, 12), np.array_split(y_pred, 12))):
+        parts[i % 3].update(t, p)
+    scores = parts[0].merge(parts[1]).merge(parts[2])
+
+    result = scores.result()
+    assert scores.n == y_true.size
+    assert result["MAE"] == pytest.approx(mean_absolute_error(y_true, y_pred))
+    assert result["RMSE"] == pytest.approx(np.sqrt(mean_squared_error(y_true, y_pred)))
+    assert result["R2"] == pytest.approx(r2_score(y_true, y_pred))
+    assert result["Bias"] == pytest.approx(np.mean(y_pred - y_true))
+    assert scores.sample()[0].size == scores.sample_size
+
+
+def test_tdigest_quantiles_and_state_roundtrip(predictions):
+    y_true, y_pred = predictions
+    residuals = y_true - y_pred
+    digest = TDigest()
+    for chunk in np.array_split(residuals, 20):
+        digest.update(chunk)
+
+    q = [0.01, 0.05, 0.5, 0.95, 0.99]
+    np.testing.assert_allclose(digest.quantile(q), np.quantile(residuals, q), atol=0.02)
+    assert digest.weights.size <= digest.compression // 2 + 1
+
+    restored = TDigest.from_state(digest.to_state())
+    np.testing.assert_array_equal(restored.quantile(q), digest.quantile(q))
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from src.data_validation import check_value_ranges
+from src.synthetic_weather import synthetic_weather
+from src.utils.constants import EXPECTED_COLUMNS
+
+
+@pytest.fixture(scope="module")
+def weather():
+    return synthetic_weather(n_sites=25, start="2023-01-01", end="2023-12-31", seed=7)
+
+
+def test_schema_and_ranges(weather):
+    assert list(weather.columns) == EXPECTED_COLUMNS
+    assert weather["location"].nunique() == 25
+    assert len(weather) == 25 * 365 * 24
+    assert all(outliers.empty for outliers in check_value_ranges(weather).values())
+
+
+def test_seeded_and_independent_of_chunking(weather):
+    keys = ["location", "time"]
+    rechunked = synthetic_weather(n_sites=25, start="2023-01-01", end="2023-12-31", seed=7, chunk_hours=101)
+    pd.testing.assert_frame_equal(weather.sort_values(keys, ignore_index=True),
+                                  rechunked.sort_values(keys, ignore_index=True))
+
+
+def test_climatology(weather):
+    by_site = weather.groupby("location")
+    wet_hours = by_site["rain"].apply(lambda rain: (rain > 0).mean())
+    assert wet_hours["Phoenix"] < wet_hours["Seattle"]
+
+    moscow = weather[weather["location"] == "Moscow"]
+    monthly = moscow.groupby(moscow["time"].dt.month)["temperature_2m"].mean()
+    assert monthly[7] - monthly[1] > 15
+    hourly = moscow.groupby(moscow["time"].dt.hour)["temperature_2m"].mean()
+    assert 12 <= hourly.idxmax() <= 17
+
+    sydney = weather[weather["location"] == "Sydney"]
+    assert sydney.loc[sydney["time"].dt.month == 1, "temperature_2m"].mean() > \
+        sydney.loc[sydney["time"].dt.month == 7, "temperature_2m"].mean()
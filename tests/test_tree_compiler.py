@@ -0,0 +1,121 @@
+import pytest
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor, StackingRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+from xgboost import XGBRegressor
+
+from src.tree_compiler import CompiledModel, compile_model
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 5))
+    y = 3 * X[:, 0] + np.sin(X[:, 1]) + X[:, 2] * X[:, 3] + rng.normal(scale=0.1, size=600)
+    return X, y
+
+def with_missing(X, seed=1):
+    X = X.copy()
+    X[np.random.default_rng(seed).random(X.shape) < 0.05] = np.nan
+    return X
+
+def test_random_forest_is_identical(data):
+    X, y = data
+    X = with_missing(X)
+    model = RandomForestRegressor(n_estimators=20, random_state=0).fit(X[:400], y[:400])
+
+    compiled = compile_model(model)
+    assert np.array_equal(compiled.predict(X[400:]), model.predict(X[400:]))
+    assert np.array_equal(compiled.predict(X[400]), model.predict(X[400:401]))
+
+def test_xgboost_is_identical(data):
+    X, y = data
+    X = with_missing(X)
+    model = XGBRegressor(n_estimators=30, max_depth=4, random_state=0).fit(X[:400], y[:400])
+
+    assert np.array_equal(compile_model(model).predict(X[400:]), model.predict(X[400:]))
+
+def test_stack_is_identical(data):
+    X, y = data
+    model = StackingRegressor(
+        estimators=[("lr", LinearRegression()),
+                    ("rf", RandomForestRegressor(n_estimators=10, random_state=0)),
+                    ("xgb", XGBRegressor(n_estimators=10))],
+        final_estimator=LinearRegression(),
+    ).fit(X[:400], y[:400])
+
+    assert np.array_equal(compile_model(model).predict(X[400:]), model.predict(X[400:]))
+
+def test_small_blocks_match_one_block(data, monkeypatch):
+    X, y = data
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+    compiled = compile_model(model)
+    expected = compiled.predict(X)
+
+    monkeypatch.setattr("src.tree_compiler.MAX_BLOCK_ELEMENTS", 70)
+    assert np.array_equal(compiled.predict(X), expected)
+
+@pytest.mark.parametrize("estimator", [RandomForestRegressor(n_estimators=20, random_state=0),
+                                       XGBRegressor(n_estimators=30, max_depth=4, random_state=0)])
+def test_numba_kernel_matches_the_library(data, monkeypatch, tmp_path, estimator):
+    pytest.importorskip("numba")
+    X, y = data
+    X = with_missing(X)
+    model = estimator.fit(X[:400], y[:400])
+    path = str(tmp_path / "model.tree")
+    compile_model(model).save(path)
+
+    # Every batch takes the kernel, reading the memory-mapped arrays
+    monkeypatch.setattr("src.tree_compiler.NUMBA_MIN_ELEMENTS", 1)
+    assert np.array_equal(CompiledModel.load(path).predict(X[400:]), model.predict(X[400:]))
+
+def test_save_and_memory_mapped_load(data, tmp_path):
+    X, y = data
+    model = XGBRegressor(n_estimators=10).fit(X, y)
+    path = str(tmp_path / "xgb.tree")
+    compile_model(model, feature_names=list("abcde")).save(path)
+
+    for mmap in (True, False):
+        loaded = CompiledModel.load(path, mmap=mmap)
+        assert loaded.meta["feature_names"] == list("abcde")
+        assert np.array_equal(loaded.predict(X), model.predict(X))
+    assert isinstance(CompiledModel.load(path).arrays["m_threshold"], np.memmap)
+
+def test_rejects_unsupported_models(data, tmp_path):
+    X, y = data
+    with pytest.raises(ValueError):
+        compile_model(Ridge().fit(X, y))
+
+    path = tmp_path / "not_a_model.tree"
+    path.write_bytes(b"garbage")
+    with pytest.raises(ValueError):
+        CompiledModel.load(str(path))
+
+def test_predict_scores_a_weather_only_file(tmp_path, monkeypatch):
+    import pandas as pd
+    import main
+    from src.preprocessing import preprocess
+    from src.synthetic_weather import write_synthetic_weather
+    from src.utils.settings import reset_settings
+
+    weather_path = str(tmp_path / "weather.csv")
+    write_synthetic_weather(weather_path, n_sites=2, start="2023-01-01", end="2023-01-05", seed=1)
+    weather = pd.read_csv(weather_path)
+
+    # Trained on simulated data, which also has rain_rate and the target
+    signal = weather.assign(rain_rate=np.nan, signal_dbm=-70 - weather["rain"])
+    features = preprocess(signal.copy(), save=False, preserve_nulls=True).select_dtypes("number")
+    X = features.drop(columns="signal_dbm")
+    model = RandomForestRegressor(n_estimators=5, random_state=0).fit(X.fillna(0), features["signal_dbm"])
+    compile_model(model, list(X.columns)).save(str(tmp_path / "rf.tree"))
+
+    output_path = str(tmp_path / "predictions.csv")
+    monkeypatch.setenv("SIGNAL_PROJECT_ROOT", str(tmp_path))
+    reset_settings()
+    try:
+        main.main(["predict", "--model", str(tmp_path / "rf.tree"), "--input", weather_path, "--output", output_path])
+    finally:
+        reset_settings()
+    predictions = pd.read_csv(output_path)
+    assert len(predictions) == len(weather) and "signal_dbm" not in predictions
+    assert predictions["prediction"].notna().all()
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.window_features import add_window_features, update_window_features
+
+
+@pytest.fixture
+def weather():
+    rng = np.random.default_rng(0)
+    n = 600
+    df = pd.DataFrame({
+        "time": np.tile(pd.date_range("2023-01-01", periods=n // 2, freq="h"), 2),
+        "location": np.repeat(["seattle", "denver"], n // 2),
+        "rain": rng.exponential(0.5, n),
+        "pressure_msl": rng.normal(1013, 5, n),
+    })
+    return df.sample(frac=1, random_state=0)
+
+
+def test_matches_grouped_pandas_rolling(weather):
+    features = add_window_features(weather, columns=["rain", "pressure_msl"], lags=[2], windows=[6])
+    ordered = weather.sort_values(["location", "time"])
+    grouped = ordered.groupby("location")
+
+    for column in ("rain", "pressure_msl"):
+        rolling = grouped[column].rolling(6, min_periods=1)
+        for stat in ("mean", "std", "max"):
+            expected = getattr(rolling, stat)().reset_index(level=0, drop=True).fillna(0.0)
+            np.testing.assert_allclose(features.loc[expected.index, f"{column}_{stat}6h"], expected, atol=1e-9)
+
+        lag = grouped[column].shift(2).dropna()
+        np.testing.assert_allclose(features.loc[lag.index, f"{column}_lag2"], lag)
+        diff = grouped[column].diff().dropna()
+        np.testing.assert_allclose(features.loc[diff.index, f"{column}_diff1"], diff, atol=1e-9)
+
+
+def test_incremental_update_matches_full_recompute(weather):
+    ordered = weather.sort_values("time")
+    history, new_rows = ordered.iloc[:-10], ordered.iloc[-10:]
+
+    updated = update_window_features(history, new_rows)
+    full = add_window_features(ordered).loc[new_rows.index]
+
+    feature_columns = updated.columns[len(new_rows.columns):]
+    assert len(feature_columns) > 0
+    pd.testing.assert_frame_equal(updated[feature_columns], full[feature_columns])
+
+
+def test_engineered_features_include_windows_only_when_enabled(weather):
+    from src.feature_engineering import engineer_features
+    from src.utils.settings import configure, reset_settings
+
+    weather = weather.assign(relative_humidity_2m=60.0, windspeed_10m=3.0, temperature_2m=15.0,
+                             signal_dbm=-70.0)
+    assert "rain_lag1" not in engineer_features(weather).columns
+    assert "rain_lag1" in engineer_features(weather, window_features=True).columns
+
+    configure(window_features="true")
+    try:
+        assert "rain_mean24h" in engineer_features(weather).columns
+    finally:
+        reset_settings()